@@ -5,6 +5,8 @@
 - DB_PATH: ruta al archivo SQLite (persistente, fuera del bundle)
 - RESOURCES_DIR: recursos de UI (QSS, iconos)
 - LOG_DIR: carpeta para logs diarios
+- STORAGE_PROFILES / STORAGE_PROFILE: PRAGMA de almacenamiento SQLite por perfil
+- PLANNING_WEEKS: semanas futuras en las que se puede registrar (las pasadas son de solo lectura)
 """
 
 import sys
@@ -29,6 +31,40 @@ RESOURCES_DIR = BASE_DIR / "ui" / "resources"
 LOG_DIR = APP_DIR / "logs"
 LOG_DIR.mkdir(parents=True, exist_ok=True)
 
+# Perfiles de almacenamiento SQLite: se aplican una vez al abrir cada conexión.
+# - desktop-safe: disco local, WAL con sincronización completa (por defecto)
+# - fast-local: disco local rápido; WAL + synchronous NORMAL (puede perder la última
+#   transacción ante un corte de energía, nunca corrompe), más caché y mmap
+# - shared-readers: carpeta compartida/red o discos lentos; journal clásico (WAL
+#   no funciona sobre sistemas de archivos de red) y espera larga ante bloqueos
+STORAGE_PROFILES = {
+    "desktop-safe": {
+        "journal_mode": "WAL",
+        "synchronous": "FULL",
+        "cache_size_kib": 8 * 1024,
+        "mmap_size_mib": 0,
+        "busy_timeout_ms": 5000,
+    },
+    "fast-local": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size_kib": 32 * 1024,
+        "mmap_size_mib": 256,
+        "busy_timeout_ms": 5000,
+    },
+    "shared-readers": {
+        "journal_mode": "DELETE",
+        "synchronous": "FULL",
+        "cache_size_kib": 4 * 1024,
+        "mmap_size_mib": 0,
+        "busy_timeout_ms": 30000,
+    },
+}
+STORAGE_PROFILE = os.getenv("TRABAJO_REMOTO_STORAGE_PROFILE", "desktop-safe")
+
+# Semanas siguientes a la actual que admiten registros (planificación); 0 = solo la actual
+PLANNING_WEEKS = int(os.getenv("TRABAJO_REMOTO_PLANNING_WEEKS", "4"))
+
 APP_NAME = "Trabajo Remoto"
 VERSION = "1.0"
 
@@ -1,10 +1,44 @@
+import json
+import datetime
+
+from data.bulk import BulkInsertResult, insert_many
 from data.db_utils import get_connection
-from exceptions import ErrorDeBaseDeDatos, RegistroDuplicado
+from data.schema import week_key
+from exceptions import ErrorDeBaseDeDatos, RegistroDuplicado, YaRegistradoEstaSemana
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+def _describe_record_conflict(e) -> str:
+    """Motivo legible de una violación de restricción al insertar en records."""
+    msg = str(e)
+    if "records.week_key" in msg:
+        return "El empleado ya tiene un registro esa semana."
+    if "UNIQUE constraint failed" in msg:
+        return "Ya existe un registro para ese día."
+    if "FOREIGN KEY constraint failed" in msg:
+        return "El usuario no existe."
+    return msg
+
+
+# Usuario + registro de la semana (?), de la semana anterior (?) y el último; ver get_employee_summary
+_SUMMARY_SQL = """
+    SELECT u.id, u.name, u.docket,
+           cur.record_id, cur.date, cur.week_day,
+           prev.record_id, prev.date, prev.week_day,
+           last.id, last.date, last.week_day,
+           next.record_id, next.date, next.week_day
+    FROM users AS u
+    LEFT JOIN week_assignments AS cur ON cur.week_key = ? AND cur.user_id = u.id
+    LEFT JOIN week_assignments AS prev ON prev.week_key = ? AND prev.user_id = u.id
+    LEFT JOIN week_assignments AS next ON next.week_key = ? AND next.user_id = u.id
+    LEFT JOIN records AS last ON last.id = (
+        SELECT r.id FROM records AS r WHERE r.user_id = u.id ORDER BY r.date DESC LIMIT 1
+    )
+"""
+
+
 class RecordRespository():
     @staticmethod
     def create_record(user_id, date, week_day):
@@ -29,19 +63,44 @@ class RecordRespository():
             logger.exception("Error al crear registro user_id=%s date=%s week_day=%s", user_id, date, week_day)
             # Si la base de datos lanza un error de restricción única, ya existe el registro
             if "UNIQUE constraint failed" in str(e):
+                if "records.week_key" in str(e):
+                    raise YaRegistradoEstaSemana("El empleado ya tiene un registro esta semana.")
                 raise RegistroDuplicado("Ya existe un registro para ese día.")
             raise ErrorDeBaseDeDatos(f"Error al crear registro: {e}")
 
     @staticmethod
-    def exists_in_week(user_id, start_iso, end_iso):
-        """Devuelve True si el usuario tiene al menos un registro entre start_iso y end_iso (incluidos)."""
-        logger.debug("Verificando existencia en semana user_id=%s inicio=%s fin=%s", user_id, start_iso, end_iso)
+    def create_many(rows, chunk_size=None) -> BulkInsertResult:
+        """
+        Crea registros en bloque desde un iterable de (user_id, date, week_day), en una transacción.
+        Devuelve BulkInsertResult con el id de cada fila (None si rechazada) y los
+        rechazos por fila (mismo día, misma semana o usuario inexistente) sin abortar el lote.
+        Lanza ErrorDeBaseDeDatos para otros errores de base de datos.
+        """
+        logger.debug("Creando registros en bloque")
+        try:
+            kwargs = {"chunk_size": chunk_size} if chunk_size else {}
+            result = insert_many(
+                "INSERT INTO records (user_id, date, week_day) VALUES (?, ?, ?)",
+                rows,
+                _describe_record_conflict,
+                **kwargs,
+            )
+            logger.info("Registros creados en bloque: %s (rechazados %s)", result.inserted, len(result.rejected))
+            return result
+        except Exception as e:
+            logger.exception("Error al crear registros en bloque")
+            raise ErrorDeBaseDeDatos(f"Error al crear registros: {e}")
+
+    @staticmethod
+    def exists_in_week(user_id, week_key):
+        """Devuelve True si el usuario tiene un registro en la semana `week_key` (búsqueda puntual por índice)."""
+        logger.debug("Verificando existencia en semana user_id=%s week_key=%s", user_id, week_key)
         try:
             with get_connection() as conn:
                 cursor = conn.cursor()
                 cursor.execute(
-                    "SELECT EXISTS(SELECT 1 FROM records WHERE user_id = ? AND date BETWEEN ? AND ?)",
-                    (user_id, start_iso, end_iso),
+                    "SELECT EXISTS(SELECT 1 FROM week_assignments WHERE week_key = ? AND user_id = ?)",
+                    (week_key, user_id),
                 )
                 flag = bool(cursor.fetchone()[0])
                 logger.info("Existe registro en semana user_id=%s -> %s", user_id, flag)
@@ -51,21 +110,15 @@ class RecordRespository():
             raise ErrorDeBaseDeDatos(f"Error al verificar registros de la semana: {e}")
 
     @staticmethod
-    def get_record_in_week(user_id, start_iso, end_iso):
-        """Obtiene el registro más reciente del usuario entre start_iso y end_iso; None si no hay."""
-        logger.debug("Obteniendo registro de la semana user_id=%s inicio=%s fin=%s", user_id, start_iso, end_iso)
+    def get_record_in_week(user_id, week_key):
+        """Obtiene el registro (id, date, week_day) del usuario en la semana `week_key`; None si no hay."""
+        logger.debug("Obteniendo registro de la semana user_id=%s week_key=%s", user_id, week_key)
         try:
             with get_connection() as conn:
                 cursor = conn.cursor()
                 cursor.execute(
-                    """
-                    SELECT id, date, week_day
-                    FROM records
-                    WHERE user_id = ? AND date BETWEEN ? AND ?
-                    ORDER BY date DESC
-                    LIMIT 1
-                    """,
-                    (user_id, start_iso, end_iso),
+                    "SELECT record_id, date, week_day FROM week_assignments WHERE week_key = ? AND user_id = ?",
+                    (week_key, user_id),
                 )
                 row = cursor.fetchone()
                 logger.info("Registro de la semana encontrado user_id=%s -> %s", user_id, bool(row))
@@ -74,6 +127,97 @@ class RecordRespository():
             logger.exception("Error al obtener registro de la semana user_id=%s", user_id)
             raise ErrorDeBaseDeDatos(f"Error al obtener registro de la semana: {e}")
 
+    @staticmethod
+    def registered_user_ids_in_week(week_key):
+        """Devuelve el set de user_id con registro en la semana `week_key` (una sola consulta)."""
+        logger.debug("Obteniendo usuarios registrados en semana week_key=%s", week_key)
+        try:
+            with get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("SELECT user_id FROM week_assignments WHERE week_key = ?", (week_key,))
+                ids = {row[0] for row in cursor.fetchall()}
+                logger.info("Usuarios registrados en semana week_key=%s: %s", week_key, len(ids))
+                return ids
+        except Exception as e:
+            logger.exception("Error al obtener usuarios registrados en semana week_key=%s", week_key)
+            raise ErrorDeBaseDeDatos(f"Error al obtener registros de la semana: {e}")
+
+    @staticmethod
+    def records_in_week(week_key):
+        """Devuelve {user_id: (id, date, week_day)} con el registro de cada usuario en la semana `week_key`."""
+        logger.debug("Obteniendo registros por usuario en semana week_key=%s", week_key)
+        try:
+            with get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    "SELECT user_id, record_id, date, week_day FROM week_assignments WHERE week_key = ?",
+                    (week_key,),
+                )
+                result = {uid: (rec_id, d, wd) for uid, rec_id, d, wd in cursor.fetchall()}
+                logger.info("Registros por usuario en semana week_key=%s: %s", week_key, len(result))
+                return result
+        except Exception as e:
+            logger.exception("Error al obtener registros por usuario en semana week_key=%s", week_key)
+            raise ErrorDeBaseDeDatos(f"Error al obtener registros de la semana: {e}")
+
+    @staticmethod
+    def records_in_weeks(first_week_key, last_week_key):
+        """Devuelve [(week_key, user_id, date, week_day)] de las semanas entre `first_week_key` y `last_week_key`."""
+        logger.debug("Obteniendo registros de semanas %s..%s", first_week_key, last_week_key)
+        try:
+            with get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    "SELECT week_key, user_id, date, week_day FROM week_assignments WHERE week_key BETWEEN ? AND ?",
+                    (first_week_key, last_week_key),
+                )
+                rows = cursor.fetchall()
+                logger.info("Registros de semanas %s..%s: %s", first_week_key, last_week_key, len(rows))
+                return rows
+        except Exception as e:
+            logger.exception("Error al obtener registros de semanas %s..%s", first_week_key, last_week_key)
+            raise ErrorDeBaseDeDatos(f"Error al obtener registros de las semanas: {e}")
+
+    @staticmethod
+    def iter_with_users(start_iso, end_iso, user_ids=None, batch_size=1000):
+        """
+        Recorre en streaming (fetchmany) los registros entre start_iso y end_iso unidos con su usuario.
+        Produce filas (date, week_day, docket, name) ordenadas por fecha y nombre; nunca
+        materializa el resultado completo. `user_ids` (opcional) restringe a esos empleados.
+        Lanza ErrorDeBaseDeDatos si ocurre un error en la consulta.
+        """
+        logger.debug("Recorriendo registros con usuarios inicio=%s fin=%s", start_iso, end_iso)
+        sql = """
+            SELECT wa.date, wa.week_day, u.docket, u.name
+            FROM week_assignments AS wa
+            JOIN users AS u ON u.id = wa.user_id
+            WHERE wa.week_key BETWEEN ? AND ? AND wa.date BETWEEN ? AND ?
+        """
+        # El rango por week_key recorre la clave primaria de week_assignments
+        start_wk = week_key(datetime.date.fromisoformat(start_iso))
+        end_wk = week_key(datetime.date.fromisoformat(end_iso))
+        params = [start_wk, end_wk, start_iso, end_iso]
+        if user_ids is not None:
+            # Un único parámetro JSON evita el límite de variables de SQLite con miles de ids
+            sql += " AND wa.user_id IN (SELECT value FROM json_each(?))"
+            params.append(json.dumps(sorted(set(user_ids))))
+        sql += " ORDER BY wa.date, u.name"
+        try:
+            with get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(sql, params)
+                total = 0
+                while True:
+                    rows = cursor.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    total += len(rows)
+                    yield from rows
+                logger.info("Registros recorridos inicio=%s fin=%s: %s", start_iso, end_iso, total)
+        except Exception as e:
+            logger.exception("Error al recorrer registros inicio=%s fin=%s", start_iso, end_iso)
+            raise ErrorDeBaseDeDatos(f"Error al recorrer registros: {e}")
+
     @staticmethod
     def list_by_user(user_id):
         """
@@ -116,6 +260,117 @@ class RecordRespository():
             logger.exception("Error al obtener el último registro para user_id=%s", user_id)
             raise ErrorDeBaseDeDatos(f"Error al obtener el último registro: {e}")
             
+    @staticmethod
+    def get_employee_summary(user_id, week_key):
+        """
+        Devuelve en una sola consulta el usuario y sus registros de la semana `week_key`,
+        de la semana anterior, el último y el de la semana siguiente: (id, name, docket,
+        cur_id, cur_date, cur_day, prev_id, prev_date, prev_day, last_id, last_date,
+        last_day, next_id, next_date, next_day). Los registros
+        ausentes vienen en NULL; devuelve None si el usuario no existe.
+        Lanza ErrorDeBaseDeDatos si ocurre un error en la consulta.
+        """
+        logger.debug("Obteniendo resumen de empleado user_id=%s week_key=%s", user_id, week_key)
+        try:
+            with get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(_SUMMARY_SQL + " WHERE u.id = ?", (week_key, week_key - 1, week_key + 1, user_id))
+                row = cursor.fetchone()
+                logger.info("Resumen de empleado user_id=%s encontrado=%s", user_id, bool(row))
+                return row
+        except Exception as e:
+            logger.exception("Error al obtener resumen de empleado user_id=%s", user_id)
+            raise ErrorDeBaseDeDatos(f"Error al obtener resumen del empleado: {e}")
+
+    @staticmethod
+    def get_employee_summaries(user_ids, week_key):
+        """
+        Como `get_employee_summary` para varios usuarios en una sola consulta.
+        Devuelve las filas de los usuarios existentes (sin orden garantizado).
+        Lanza ErrorDeBaseDeDatos si ocurre un error en la consulta.
+        """
+        ids = sorted(set(user_ids))
+        if not ids:
+            return []
+        logger.debug("Obteniendo resúmenes de empleados n=%s week_key=%s", len(ids), week_key)
+        try:
+            with get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    _SUMMARY_SQL + " WHERE u.id IN (SELECT value FROM json_each(?))",
+                    (week_key, week_key - 1, week_key + 1, json.dumps(ids)),
+                )
+                rows = cursor.fetchall()
+                logger.info("Resúmenes de empleados obtenidos: %s", len(rows))
+                return rows
+        except Exception as e:
+            logger.exception("Error al obtener resúmenes de empleados")
+            raise ErrorDeBaseDeDatos(f"Error al obtener resúmenes de empleados: {e}")
+
+    @staticmethod
+    def week_status_for_users(user_ids, week_key):
+        """
+        Devuelve {user_id: (fecha en la semana `week_key`, día de la semana anterior,
+        día de la semana siguiente)} de los usuarios existentes entre `user_ids`
+        (None donde no hay registro), en una consulta.
+        Lanza ErrorDeBaseDeDatos si ocurre un error en la consulta.
+        """
+        ids = sorted(set(user_ids))
+        if not ids:
+            return {}
+        logger.debug("Obteniendo estado semanal de usuarios n=%s week_key=%s", len(ids), week_key)
+        try:
+            with get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    """
+                    SELECT u.id, cur.date, prev.week_day, next.week_day
+                    FROM users AS u
+                    LEFT JOIN week_assignments AS cur ON cur.week_key = ? AND cur.user_id = u.id
+                    LEFT JOIN week_assignments AS prev ON prev.week_key = ? AND prev.user_id = u.id
+                    LEFT JOIN week_assignments AS next ON next.week_key = ? AND next.user_id = u.id
+                    WHERE u.id IN (SELECT value FROM json_each(?))
+                    """,
+                    (week_key, week_key - 1, week_key + 1, json.dumps(ids)),
+                )
+                result = {uid: (cur_date, prev_day, next_day) for uid, cur_date, prev_day, next_day in cursor.fetchall()}
+                logger.info("Estado semanal de usuarios obtenido: %s", len(result))
+                return result
+        except Exception as e:
+            logger.exception("Error al obtener estado semanal de usuarios")
+            raise ErrorDeBaseDeDatos(f"Error al obtener estado semanal de usuarios: {e}")
+
+    @staticmethod
+    def week_matrix(week_key):
+        """
+        Nómina completa con su registro de la semana `week_key` y los días de la semana
+        anterior y de la siguiente, en una consulta, ordenada por nombre:
+        [(id, name, docket, record_id, date, week_day, prev_week_day, next_week_day)].
+        Lanza ErrorDeBaseDeDatos si ocurre un error en la consulta.
+        """
+        logger.debug("Obteniendo matriz semanal week_key=%s", week_key)
+        try:
+            with get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    """
+                    SELECT u.id, u.name, u.docket, cur.record_id, cur.date, cur.week_day,
+                           prev.week_day, next.week_day
+                    FROM users AS u
+                    LEFT JOIN week_assignments AS cur ON cur.week_key = ? AND cur.user_id = u.id
+                    LEFT JOIN week_assignments AS prev ON prev.week_key = ? AND prev.user_id = u.id
+                    LEFT JOIN week_assignments AS next ON next.week_key = ? AND next.user_id = u.id
+                    ORDER BY u.name
+                    """,
+                    (week_key, week_key - 1, week_key + 1),
+                )
+                rows = cursor.fetchall()
+                logger.info("Matriz semanal week_key=%s: %s filas", week_key, len(rows))
+                return rows
+        except Exception as e:
+            logger.exception("Error al obtener matriz semanal week_key=%s", week_key)
+            raise ErrorDeBaseDeDatos(f"Error al obtener la matriz semanal: {e}")
+
     @staticmethod
     def update_record_date_and_day(record_id, date, week_day):
         """
@@ -135,6 +390,8 @@ class RecordRespository():
         except Exception as e:
             logger.exception("Error al actualizar registro id=%s", record_id)
             if "UNIQUE constraint failed" in str(e):
+                if "records.week_key" in str(e):
+                    raise YaRegistradoEstaSemana("El empleado ya tiene un registro esta semana.")
                 raise RegistroDuplicado("Ya existe un registro para ese día.")
             raise ErrorDeBaseDeDatos(f"Error al actualizar registro: {e}")
     
@@ -0,0 +1,93 @@
+"""Inserciones masivas con `executemany` en una sola transacción.
+
+Las filas se consumen de forma perezosa en bloques (`chunk_size`): cada bloque va en
+un `executemany` dentro de un SAVEPOINT. Si el bloque viola una restricción, se
+revierte solo ese bloque y se reintenta fila por fila, de modo que las filas
+duplicadas se reportan individualmente sin abortar el lote.
+"""
+
+import logging
+import sqlite3
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Callable, Iterable, Optional, Sequence
+
+from data.db_utils import transaction
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 2000
+
+
+@dataclass
+class BulkInsertResult:
+    """Resultado de una inserción masiva.
+
+    ids[i] es el id asignado a la fila i de la entrada, o None si fue rechazada.
+    rejected contiene (i, motivo) por cada fila rechazada.
+    """
+    ids: list[Optional[int]] = field(default_factory=list)
+    rejected: list[tuple[int, str]] = field(default_factory=list)
+
+    @property
+    def inserted(self) -> int:
+        return len(self.ids) - len(self.rejected)
+
+
+def insert_many(
+    sql: str,
+    rows: Iterable[Sequence],
+    describe_error: Callable[[sqlite3.IntegrityError], str],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    offset: int = 0,
+) -> BulkInsertResult:
+    """Inserta `rows` con `sql` (INSERT parametrizado) en una transacción.
+
+    `describe_error` traduce la violación de restricción de una fila a un motivo
+    legible. `offset` desplaza los índices reportados (útil al procesar por tandas).
+    Si ya hay una unidad de trabajo abierta, se suma a ella.
+    """
+    result = BulkInsertResult()
+    it = iter(rows)
+    index = offset
+    with transaction() as conn:
+        cursor = conn.cursor()
+        while True:
+            chunk = list(islice(it, chunk_size))
+            if not chunk:
+                break
+            cursor.execute("SAVEPOINT bulk_chunk")
+            try:
+                cursor.executemany(sql, chunk)
+            except sqlite3.IntegrityError:
+                cursor.execute("ROLLBACK TO bulk_chunk")
+                cursor.execute("RELEASE bulk_chunk")
+                _insert_rows_one_by_one(cursor, sql, chunk, index, result, describe_error)
+            else:
+                cursor.execute("RELEASE bulk_chunk")
+                # Con la escritura reservada (BEGIN IMMEDIATE) los ids AUTOINCREMENT son consecutivos
+                last_id = cursor.execute("SELECT last_insert_rowid()").fetchone()[0]
+                first_id = last_id - len(chunk) + 1
+                result.ids.extend(range(first_id, last_id + 1))
+            index += len(chunk)
+    logger.info("Inserción masiva: %s insertadas, %s rechazadas", result.inserted, len(result.rejected))
+    return result
+
+
+def _insert_rows_one_by_one(
+    cursor: sqlite3.Cursor,
+    sql: str,
+    chunk: list[Sequence],
+    index: int,
+    result: BulkInsertResult,
+    describe_error: Callable[[sqlite3.IntegrityError], str],
+) -> None:
+    """Reintento fila por fila de un bloque con conflictos (cada INSERT es atómico)."""
+    for i, row in enumerate(chunk, start=index):
+        try:
+            cursor.execute(sql, row)
+        except sqlite3.IntegrityError as e:
+            result.ids.append(None)
+            result.rejected.append((i, describe_error(e)))
+        else:
+            result.ids.append(cursor.lastrowid)
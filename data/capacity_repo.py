@@ -0,0 +1,98 @@
+from data.db_utils import get_connection
+from exceptions import ErrorDeBaseDeDatos
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+# Repositorio de cupos por día de semana (day_capacity) y contadores por fecha (day_counts)
+class CapacityRepository:
+    @staticmethod
+    def get_limits():
+        """
+        Devuelve {weekday: max_remote} con los cupos configurados (0=Lunes ... 6=Domingo).
+        Lanza ErrorDeBaseDeDatos si ocurre un error en la consulta.
+        """
+        logger.debug("Obteniendo cupos por día")
+        try:
+            with get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("SELECT weekday, max_remote FROM day_capacity")
+                limits = dict(cursor.fetchall())
+                logger.info("Cupos por día configurados: %s", len(limits))
+                return limits
+        except Exception as e:
+            logger.exception("Error al obtener cupos por día")
+            raise ErrorDeBaseDeDatos(f"Error al obtener cupos: {e}")
+
+    @staticmethod
+    def get_limit(weekday):
+        """Cupo de remotos para el día de semana `weekday`, o None si no tiene."""
+        logger.debug("Obteniendo cupo weekday=%s", weekday)
+        try:
+            with get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("SELECT max_remote FROM day_capacity WHERE weekday = ?", (weekday,))
+                row = cursor.fetchone()
+                return row[0] if row else None
+        except Exception as e:
+            logger.exception("Error al obtener cupo weekday=%s", weekday)
+            raise ErrorDeBaseDeDatos(f"Error al obtener cupo: {e}")
+
+    @staticmethod
+    def set_limit(weekday, max_remote):
+        """
+        Configura el cupo de remotos de `weekday`; con max_remote None lo quita.
+        Lanza ErrorDeBaseDeDatos si ocurre un error en la operación.
+        """
+        logger.debug("Configurando cupo weekday=%s max_remote=%s", weekday, max_remote)
+        try:
+            with get_connection() as conn:
+                cursor = conn.cursor()
+                if max_remote is None:
+                    cursor.execute("DELETE FROM day_capacity WHERE weekday = ?", (weekday,))
+                else:
+                    cursor.execute(
+                        """
+                        INSERT INTO day_capacity(weekday, max_remote) VALUES (?, ?)
+                        ON CONFLICT(weekday) DO UPDATE SET max_remote = excluded.max_remote
+                        """,
+                        (weekday, max_remote),
+                    )
+                conn.commit()
+                logger.info("Cupo configurado weekday=%s max_remote=%s", weekday, max_remote)
+        except Exception as e:
+            logger.exception("Error al configurar cupo weekday=%s", weekday)
+            raise ErrorDeBaseDeDatos(f"Error al configurar cupo: {e}")
+
+    @staticmethod
+    def remote_count(date):
+        """Cantidad de remotos registrados en `date` (YYYY-MM-DD), leída del contador."""
+        logger.debug("Obteniendo remotos del día date=%s", date)
+        try:
+            with get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("SELECT remote FROM day_counts WHERE date = ?", (date,))
+                row = cursor.fetchone()
+                return row[0] if row else 0
+        except Exception as e:
+            logger.exception("Error al obtener remotos del día date=%s", date)
+            raise ErrorDeBaseDeDatos(f"Error al obtener remotos del día: {e}")
+
+    @staticmethod
+    def remote_counts(start_iso, end_iso):
+        """Devuelve {date: remotos} para las fechas con registros entre start_iso y end_iso."""
+        logger.debug("Obteniendo remotos por día inicio=%s fin=%s", start_iso, end_iso)
+        try:
+            with get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    "SELECT date, remote FROM day_counts WHERE date BETWEEN ? AND ?",
+                    (start_iso, end_iso),
+                )
+                counts = dict(cursor.fetchall())
+                logger.info("Remotos por día inicio=%s fin=%s: %s fechas", start_iso, end_iso, len(counts))
+                return counts
+        except Exception as e:
+            logger.exception("Error al obtener remotos por día inicio=%s fin=%s", start_iso, end_iso)
+            raise ErrorDeBaseDeDatos(f"Error al obtener remotos por día: {e}")
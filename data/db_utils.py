@@ -1,13 +1,296 @@
-from config import DB_PATH
+"""Conexión centralizada a SQLite (usa la ruta de config).
 
-"""Conexión centralizada a SQLite (usa la ruta de config)."""
+Las conexiones se mantienen vivas por hilo: la primera llamada a `get_connection()`
+en un hilo abre la conexión y aplica los PRAGMA (foreign_keys y el perfil de
+almacenamiento de `config.STORAGE_PROFILES`); las siguientes la reutilizan.
+`close_all_connections()` cierra todo (cierre de la app, tests) y
+`connection_stats()` expone cuántas conexiones se abrieron y el costo de obtenerlas.
 
-def get_connection():
-    """Devuelve una conexión sqlite3 a DB_PATH con foreign_keys activado."""
-    import sqlite3
-    conn = sqlite3.connect(DB_PATH)
+`transaction()` agrupa varias llamadas a repositorios en una unidad de trabajo:
+una única transacción `BEGIN IMMEDIATE` sobre la conexión del hilo.
+"""
+
+import logging
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator
+
+from config import DB_PATH, STORAGE_PROFILE, STORAGE_PROFILES
+from exceptions import ErrorDeBaseDeDatos
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ConnectionStats:
+    """Métricas acumuladas del gestor de conexiones."""
+    opened: int             # conexiones físicas abiertas (sqlite3.connect)
+    acquisitions: int       # llamadas a get_connection()
+    open_seconds: float     # tiempo total abriendo conexiones + PRAGMA
+    acquire_seconds: float  # tiempo total dentro de get_connection()
+    alive: int              # conexiones abiertas en este momento
+
+
+class ManagedConnection:
+    """Envoltorio de sqlite3.Connection consciente de la unidad de trabajo.
+
+    Fuera de `transaction()` se comporta igual que la conexión original. Dentro,
+    `commit()`/`rollback()` y la salida de `with conn:` se difieren: la transacción
+    la cierra `transaction()` al terminar (commit) o ante una excepción (rollback).
+    """
+
+    __slots__ = ("_raw", "_depth")
+
+    def __init__(self, raw: sqlite3.Connection) -> None:
+        self._raw = raw
+        self._depth = 0
+
+    def __getattr__(self, name):
+        return getattr(self._raw, name)
+
+    @property
+    def raw(self) -> sqlite3.Connection:
+        return self._raw
+
+    @property
+    def in_unit_of_work(self) -> bool:
+        return self._depth > 0
+
+    def commit(self) -> None:
+        if not self._depth:
+            self._raw.commit()
+
+    def rollback(self) -> None:
+        if not self._depth:
+            self._raw.rollback()
+
+    def __enter__(self) -> "ManagedConnection":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        if not self._depth:
+            return self._raw.__exit__(exc_type, exc, tb)
+        return False
+
+
+class ConnectionManager:
+    """Mantiene una conexión sqlite3 por hilo hacia `db_path`.
+
+    Cada conexión se abre una sola vez y recibe los PRAGMA al abrirse. Se registran
+    todas para poder cerrarlas desde cualquier hilo (por eso `check_same_thread=False`;
+    igualmente cada conexión solo se usa desde el hilo que la abrió).
+    """
+
+    def __init__(self, db_path: Path | str, profile: str = STORAGE_PROFILE) -> None:
+        self._db_path = Path(db_path)
+        self._profile = _resolve_profile(profile)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections: dict[int, ManagedConnection] = {}
+        self._generation = 0
+        self._opened = 0
+        self._acquisitions = 0
+        self._open_seconds = 0.0
+        self._acquire_seconds = 0.0
+
+    @property
+    def db_path(self) -> Path:
+        return self._db_path
+
+    @property
+    def profile(self) -> str:
+        return self._profile
+
+    def get(self) -> ManagedConnection:
+        """Devuelve la conexión del hilo actual, abriéndola si hace falta."""
+        t0 = time.perf_counter()
+        conn = getattr(self._local, "conn", None)
+        if conn is None or getattr(self._local, "generation", -1) != self._generation:
+            conn = self._open()
+        elapsed = time.perf_counter() - t0
+        with self._lock:
+            self._acquisitions += 1
+            self._acquire_seconds += elapsed
+        return conn
+
+    def _open(self) -> ManagedConnection:
+        t0 = time.perf_counter()
+        settings = STORAGE_PROFILES[self._profile]
+        raw = sqlite3.connect(
+            self._db_path,
+            timeout=settings["busy_timeout_ms"] / 1000,
+            check_same_thread=False,
+        )
+        self._apply_pragmas(raw)
+        conn = ManagedConnection(raw)
+        elapsed = time.perf_counter() - t0
+        self._local.conn = conn
+        self._local.generation = self._generation
+        with self._lock:
+            # Un ident reutilizado pertenece a un hilo ya terminado: cerrar su conexión
+            stale = self._connections.get(threading.get_ident())
+            self._connections[threading.get_ident()] = conn
+            self._opened += 1
+            self._open_seconds += elapsed
+        if stale is not None:
+            try:
+                stale.close()
+            except Exception:
+                pass
+        logger.debug("Conexión SQLite abierta hilo=%s en %.2f ms", threading.get_ident(), elapsed * 1000)
+        return conn
+
+    def _apply_pragmas(self, conn: sqlite3.Connection) -> None:
+        """PRAGMA por conexión; se ejecutan una única vez al abrirla."""
+        try:
+            conn.execute("PRAGMA foreign_keys = ON;")
+        except Exception:
+            pass
+        settings = STORAGE_PROFILES[self._profile]
+        try:
+            conn.execute(f"PRAGMA busy_timeout = {int(settings['busy_timeout_ms'])}")
+            mode = conn.execute(f"PRAGMA journal_mode = {settings['journal_mode']}").fetchone()[0]
+            if mode.upper() != settings["journal_mode"].upper():
+                # p. ej. WAL no disponible en el sistema de archivos: SQLite conserva el modo previo
+                logger.warning("journal_mode=%s no aplicado (queda %s)", settings["journal_mode"], mode)
+            conn.execute(f"PRAGMA synchronous = {settings['synchronous']}")
+            # Valor negativo = tamaño en KiB (independiente del tamaño de página)
+            conn.execute(f"PRAGMA cache_size = {-int(settings['cache_size_kib'])}")
+            conn.execute(f"PRAGMA mmap_size = {int(settings['mmap_size_mib']) * 1024 * 1024}")
+        except sqlite3.Error:
+            logger.exception("No se pudo aplicar el perfil de almacenamiento %s", self._profile)
+
+    def close_all(self) -> None:
+        """Cierra todas las conexiones vivas; la próxima llamada abrirá nuevas."""
+        with self._lock:
+            conns = list(self._connections.values())
+            self._connections.clear()
+            # Invalida las conexiones cacheadas en los threading.local de otros hilos
+            self._generation += 1
+        for conn in conns:
+            try:
+                conn.close()
+            except Exception:
+                logger.exception("Error al cerrar conexión SQLite")
+        self._local.conn = None
+        if conns:
+            logger.info("Conexiones SQLite cerradas: %s", len(conns))
+
+    def set_db_path(self, db_path: Path | str, profile: str | None = None) -> None:
+        """Cambia la base de datos destino y/o el perfil (cierra las conexiones actuales)."""
+        self.close_all()
+        self._db_path = Path(db_path)
+        if profile is not None:
+            self._profile = _resolve_profile(profile)
+
+    def stats(self) -> ConnectionStats:
+        with self._lock:
+            return ConnectionStats(
+                opened=self._opened,
+                acquisitions=self._acquisitions,
+                open_seconds=self._open_seconds,
+                acquire_seconds=self._acquire_seconds,
+                alive=len(self._connections),
+            )
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self._opened = 0
+            self._acquisitions = 0
+            self._open_seconds = 0.0
+            self._acquire_seconds = 0.0
+
+
+def _resolve_profile(name: str) -> str:
+    """Valida el nombre de perfil; ante uno desconocido usa 'desktop-safe'."""
+    if name in STORAGE_PROFILES:
+        return name
+    logger.warning("Perfil de almacenamiento desconocido %r; se usa 'desktop-safe'", name)
+    return "desktop-safe"
+
+
+_manager = ConnectionManager(DB_PATH)
+
+
+def get_connection() -> ManagedConnection:
+    """Devuelve la conexión sqlite3 del hilo actual (foreign_keys activado).
+
+    Compatible con `with get_connection() as conn:`: el bloque hace commit/rollback
+    pero no cierra la conexión, que queda viva para la siguiente llamada.
+    """
+    return _manager.get()
+
+
+@contextmanager
+def transaction(immediate: bool = True) -> Iterator[ManagedConnection]:
+    """Unidad de trabajo sobre la conexión del hilo actual.
+
+    Abre `BEGIN IMMEDIATE` (reserva la escritura antes de validar, evitando carreras
+    chequeo-luego-inserción entre procesos), hace commit al salir y rollback ante
+    cualquier excepción, que se propaga sin cambios. Es reentrante: un bloque anidado
+    se suma a la transacción exterior.
+    """
+    conn = get_connection()
+    if conn._depth:
+        conn._depth += 1
+        try:
+            yield conn
+        finally:
+            conn._depth -= 1
+        return
+
+    raw = conn.raw
     try:
-        conn.execute("PRAGMA foreign_keys = ON;")
-    except Exception:
-        pass
-    return conn
\ No newline at end of file
+        raw.execute("BEGIN IMMEDIATE" if immediate else "BEGIN")
+    except sqlite3.Error as e:
+        logger.exception("No se pudo iniciar la transacción")
+        raise ErrorDeBaseDeDatos(f"No se pudo iniciar la transacción: {e}")
+    conn._depth = 1
+    try:
+        yield conn
+    except BaseException:
+        conn._depth = 0
+        raw.rollback()
+        raise
+    conn._depth = 0
+    try:
+        raw.commit()
+    except sqlite3.Error as e:
+        logger.exception("Error al confirmar la transacción")
+        raw.rollback()
+        raise ErrorDeBaseDeDatos(f"Error al confirmar la transacción: {e}")
+
+
+def close_all_connections() -> None:
+    """Cierra todas las conexiones (llamar al cerrar la app o entre tests)."""
+    stats = _manager.stats()
+    logger.info(
+        "Estadísticas de conexión: abiertas=%s obtenidas=%s apertura=%.2f ms obtención=%.2f ms",
+        stats.opened, stats.acquisitions, stats.open_seconds * 1000, stats.acquire_seconds * 1000,
+    )
+    _manager.close_all()
+
+
+def configure_database(db_path: Path | str, profile: str | None = None) -> None:
+    """Apunta el gestor a otra base de datos y/o perfil (tests, benchmarks, scripts)."""
+    _manager.set_db_path(db_path, profile)
+
+
+def storage_profile() -> str:
+    """Nombre del perfil de almacenamiento activo."""
+    return _manager.profile
+
+
+def connection_stats() -> ConnectionStats:
+    """Métricas de conexiones abiertas y tiempo de obtención."""
+    return _manager.stats()
+
+
+def reset_connection_stats() -> None:
+    """Pone a cero los contadores de `connection_stats()`."""
+    _manager.reset_stats()
+
@@ -0,0 +1,271 @@
+"""Migraciones de esquema versionadas (PRAGMA user_version).
+
+`create_tables()` deja el esquema base (versión 0) y luego `migrate()` aplica, en
+orden y una sola vez, cada migración cuya versión supere `PRAGMA user_version`.
+Cada migración corre en su propia transacción junto con el cambio de versión: si
+falla, la base queda intacta en la versión anterior.
+
+Para agregar una migración: definir `_mNNN_descripcion(conn)` y sumarla al final
+de MIGRATIONS con la versión siguiente. Nunca modificar una migración ya publicada.
+"""
+
+import logging
+import sqlite3
+from typing import Callable
+
+from data.db_utils import get_connection, transaction
+from data.schema import WEEK_KEY_SQL, fts5_available, rebuild_day_counts, rebuild_week_assignments
+from exceptions import ErrorDeBaseDeDatos
+
+logger = logging.getLogger(__name__)
+
+
+def _m001_records_week_key(conn: sqlite3.Connection) -> None:
+    """Semana ISO como columna indexada y una asignación por (usuario, semana) a nivel DB."""
+    cursor = conn.cursor()
+    cursor.execute(
+        f"""
+        SELECT COUNT(*) FROM (
+            SELECT user_id FROM records
+            GROUP BY user_id, {WEEK_KEY_SQL}
+            HAVING COUNT(*) > 1
+        )
+        """
+    )
+    duplicated = cursor.fetchone()[0]
+    if duplicated:
+        raise ErrorDeBaseDeDatos(
+            f"Hay {duplicated} semanas con más de un registro para el mismo empleado; "
+            "corríjalas antes de actualizar la base (scripts/db/duplicate_weeks.py)."
+        )
+    # Columna virtual: SQLite la calcula a partir de `date`, no requiere mantenimiento
+    cursor.execute(
+        f"ALTER TABLE records ADD COLUMN week_key INTEGER GENERATED ALWAYS AS ({WEEK_KEY_SQL}) VIRTUAL"
+    )
+    cursor.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_records_user_week ON records(user_id, week_key)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_records_week_user ON records(week_key, user_id)")
+    # Reemplazado por idx_records_week_user
+    cursor.execute("DROP INDEX IF EXISTS idx_records_date_user")
+
+
+def _m002_week_assignments(conn: sqlite3.Connection) -> None:
+    """Tabla materializada (week_key, user_id) -> registro, sincronizada por triggers."""
+    cursor = conn.cursor()
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS week_assignments (
+            week_key INTEGER NOT NULL,
+            user_id INTEGER NOT NULL,
+            record_id INTEGER NOT NULL,
+            date DATE NOT NULL,
+            week_day TEXT NOT NULL,
+            PRIMARY KEY (week_key, user_id)
+        ) WITHOUT ROWID
+        """
+    )
+    cursor.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_records_week_ai AFTER INSERT ON records
+        WHEN NEW.week_key IS NOT NULL
+        BEGIN
+            INSERT OR REPLACE INTO week_assignments(week_key, user_id, record_id, date, week_day)
+            VALUES (NEW.week_key, NEW.user_id, NEW.id, NEW.date, NEW.week_day);
+        END
+        """
+    )
+    cursor.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_records_week_au AFTER UPDATE ON records
+        BEGIN
+            DELETE FROM week_assignments
+            WHERE week_key = OLD.week_key AND user_id = OLD.user_id AND record_id = OLD.id;
+            INSERT OR REPLACE INTO week_assignments(week_key, user_id, record_id, date, week_day)
+            SELECT NEW.week_key, NEW.user_id, NEW.id, NEW.date, NEW.week_day
+            WHERE NEW.week_key IS NOT NULL;
+        END
+        """
+    )
+    cursor.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_records_week_ad AFTER DELETE ON records
+        BEGIN
+            DELETE FROM week_assignments
+            WHERE week_key = OLD.week_key AND user_id = OLD.user_id AND record_id = OLD.id;
+        END
+        """
+    )
+    rebuild_week_assignments(conn)
+    # Las lecturas por semana pasan a week_assignments; records conserva solo el índice único
+    cursor.execute("DROP INDEX IF EXISTS idx_records_week_user")
+
+
+def _m003_users_fts(conn: sqlite3.Connection) -> None:
+    """Índice de texto completo (FTS5) sobre users.name y users.docket, sincronizado por triggers.
+
+    Tabla de contenido externo: no duplica los datos de `users`, solo el índice. Si el
+    SQLite del sistema no trae FTS5, se omite y `UserRepository.search` usa LIKE.
+    """
+    if not fts5_available(conn):
+        logger.warning("SQLite sin FTS5: se omite users_fts (la búsqueda usará LIKE)")
+        return
+    cursor = conn.cursor()
+    cursor.execute(
+        """
+        CREATE VIRTUAL TABLE IF NOT EXISTS users_fts USING fts5(
+            name, docket,
+            content='users', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2',
+            prefix='2 3'
+        )
+        """
+    )
+    cursor.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_users_fts_ai AFTER INSERT ON users
+        BEGIN
+            INSERT INTO users_fts(rowid, name, docket) VALUES (NEW.id, NEW.name, NEW.docket);
+        END
+        """
+    )
+    cursor.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_users_fts_ad AFTER DELETE ON users
+        BEGIN
+            INSERT INTO users_fts(users_fts, rowid, name, docket) VALUES ('delete', OLD.id, OLD.name, OLD.docket);
+        END
+        """
+    )
+    cursor.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_users_fts_au AFTER UPDATE OF name, docket ON users
+        BEGIN
+            INSERT INTO users_fts(users_fts, rowid, name, docket) VALUES ('delete', OLD.id, OLD.name, OLD.docket);
+            INSERT INTO users_fts(rowid, name, docket) VALUES (NEW.id, NEW.name, NEW.docket);
+        END
+        """
+    )
+    # Indexar la nómina existente
+    cursor.execute("INSERT INTO users_fts(users_fts) VALUES ('rebuild')")
+
+
+def _m004_day_capacity(conn: sqlite3.Connection) -> None:
+    """Cupo de remotos por día de semana y contador por fecha mantenido por triggers.
+
+    `day_counts` evita un COUNT(*) sobre records en cada asignación: validar el
+    cupo de una fecha es una búsqueda por clave primaria.
+    """
+    cursor = conn.cursor()
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS day_capacity (
+            weekday INTEGER PRIMARY KEY CHECK (weekday BETWEEN 0 AND 6),
+            max_remote INTEGER NOT NULL CHECK (max_remote >= 0)
+        )
+        """
+    )
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS day_counts (
+            date DATE PRIMARY KEY,
+            remote INTEGER NOT NULL
+        ) WITHOUT ROWID
+        """
+    )
+    cursor.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_records_count_ai AFTER INSERT ON records
+        BEGIN
+            INSERT INTO day_counts(date, remote) VALUES (NEW.date, 1)
+            ON CONFLICT(date) DO UPDATE SET remote = remote + 1;
+        END
+        """
+    )
+    cursor.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_records_count_au AFTER UPDATE OF date ON records
+        WHEN OLD.date IS NOT NEW.date
+        BEGIN
+            UPDATE day_counts SET remote = remote - 1 WHERE date = OLD.date;
+            INSERT INTO day_counts(date, remote) VALUES (NEW.date, 1)
+            ON CONFLICT(date) DO UPDATE SET remote = remote + 1;
+        END
+        """
+    )
+    cursor.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_records_count_ad AFTER DELETE ON records
+        BEGIN
+            UPDATE day_counts SET remote = remote - 1 WHERE date = OLD.date;
+        END
+        """
+    )
+    rebuild_day_counts(conn)
+
+
+def _m005_teams(conn: sqlite3.Connection) -> None:
+    """Equipos (anidables por `parent_id`) y el equipo de cada empleado.
+
+    `idx_users_team` resuelve los miembros de un equipo sin recorrer la nómina;
+    las consultas por equipo recorren el árbol con un CTE recursivo sobre
+    `idx_teams_parent`.
+    """
+    cursor = conn.cursor()
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS teams (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL UNIQUE,
+            parent_id INTEGER REFERENCES teams(id)
+        )
+        """
+    )
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_teams_parent ON teams(parent_id)")
+    cursor.execute("ALTER TABLE users ADD COLUMN team_id INTEGER REFERENCES teams(id) ON DELETE SET NULL")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_users_team ON users(team_id)")
+
+
+# (versión, descripción, función). Versiones consecutivas desde 1.
+MIGRATIONS: list[tuple[int, str, Callable[[sqlite3.Connection], None]]] = [
+    (1, "records.week_key + índice único (user_id, week_key)", _m001_records_week_key),
+    (2, "week_assignments materializada con triggers", _m002_week_assignments),
+    (3, "users_fts (FTS5) para buscar por nombre y legajo", _m003_users_fts),
+    (4, "day_capacity y contador day_counts con triggers", _m004_day_capacity),
+    (5, "teams (anidables) y users.team_id", _m005_teams),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def current_version() -> int:
+    """Versión de esquema de la base (PRAGMA user_version)."""
+    with get_connection() as conn:
+        return int(conn.execute("PRAGMA user_version").fetchone()[0])
+
+
+def migrate() -> int:
+    """Aplica las migraciones pendientes y devuelve la versión final.
+
+    Lanza ErrorDeBaseDeDatos si una migración falla (la base queda en la versión previa).
+    """
+    version = current_version()
+    if version > LATEST_VERSION:
+        logger.warning("Base en versión %s, más nueva que la app (%s)", version, LATEST_VERSION)
+        return version
+    for target, description, apply in MIGRATIONS:
+        if target <= version:
+            continue
+        logger.info("Aplicando migración %s: %s", target, description)
+        try:
+            with transaction() as conn:
+                apply(conn)
+                # user_version es transaccional: se confirma junto con la migración
+                conn.execute(f"PRAGMA user_version = {int(target)}")
+        except ErrorDeBaseDeDatos:
+            logger.exception("Migración %s fallida", target)
+            raise
+        except Exception as e:
+            logger.exception("Migración %s fallida", target)
+            raise ErrorDeBaseDeDatos(f"Error al aplicar la migración {target}: {e}")
+        version = target
+    logger.info("Esquema en versión %s", version)
+    return version
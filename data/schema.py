@@ -1,12 +1,118 @@
+from datetime import date
+
 from data.db_utils import get_connection
 import logging
 
 logger = logging.getLogger(__name__)
 
-"""Creación/verificación de tablas principales de la base de datos."""
+"""Creación/verificación de tablas principales de la base de datos.
+
+El esquema base se crea con `CREATE ... IF NOT EXISTS`; los cambios posteriores
+viven en `data.migrations` y se aplican al final de `create_tables()`.
+
+`week_assignments` es una vista materializada de records por (week_key, user_id),
+mantenida por triggers; `week_assignments_drift` y `rebuild_week_assignments`
+permiten verificarla y repararla.
+
+`users_fts` es un índice FTS5 de contenido externo sobre users(name, docket),
+también mantenido por triggers (si el SQLite del sistema incluye FTS5).
+
+`day_counts` lleva la cantidad de remotos por fecha (triggers sobre records) para
+validar `day_capacity` sin contar filas; `day_counts_drift` y `rebuild_day_counts`
+la verifican y reparan.
+"""
+
+# Semana como ordinal entero: semanas completas (lunes..domingo) desde el lunes
+# 0001-01-01. Misma cuenta en SQL (columna records.week_key) y en Python (week_key).
+WEEK_KEY_SQL = "CAST((julianday(date) - 1721425.5) / 7 AS INTEGER)"
+
+
+def week_key(d: date) -> int:
+    """Ordinal de la semana ISO (lunes..domingo) que contiene `d`; igual a records.week_key."""
+    return (d.toordinal() - 1) // 7
+
+
+def week_assignments_drift(conn) -> tuple[int, int]:
+    """Compara week_assignments contra records.
+
+    Devuelve (faltantes, sobrantes): filas que deberían existir y no están, y filas
+    presentes que no corresponden a ningún registro (o con datos desactualizados).
+    """
+    expected = """
+        SELECT week_key, user_id, id, date, week_day FROM records WHERE week_key IS NOT NULL
+    """
+    actual = "SELECT week_key, user_id, record_id, date, week_day FROM week_assignments"
+    cursor = conn.cursor()
+    cursor.execute(f"SELECT COUNT(*) FROM ({expected} EXCEPT {actual})")
+    missing = cursor.fetchone()[0]
+    cursor.execute(f"SELECT COUNT(*) FROM ({actual} EXCEPT {expected})")
+    extra = cursor.fetchone()[0]
+    return missing, extra
+
+
+def fts5_available(conn) -> bool:
+    """True si el SQLite en uso fue compilado con FTS5."""
+    try:
+        return bool(conn.execute("SELECT sqlite_compileoption_used('ENABLE_FTS5')").fetchone()[0])
+    except Exception:
+        return False
+
+
+def users_fts_exists(conn) -> bool:
+    """True si existe el índice de texto completo users_fts (migración 3 con FTS5)."""
+    row = conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'users_fts'").fetchone()
+    return row is not None
+
+
+def rebuild_week_assignments(conn) -> int:
+    """Reconstruye week_assignments desde records; devuelve la cantidad de filas.
+
+    Debe ejecutarse dentro de una transacción (ver `data.db_utils.transaction`).
+    """
+    cursor = conn.cursor()
+    cursor.execute("DELETE FROM week_assignments")
+    cursor.execute(
+        """
+        INSERT INTO week_assignments(week_key, user_id, record_id, date, week_day)
+        SELECT week_key, user_id, id, date, week_day FROM records WHERE week_key IS NOT NULL
+        """
+    )
+    return cursor.rowcount
+
+
+def day_counts_drift(conn) -> int:
+    """Cantidad de fechas cuyo contador en day_counts no coincide con records."""
+    cursor = conn.cursor()
+    cursor.execute(
+        """
+        WITH actual AS (SELECT date, COUNT(*) AS remote FROM records GROUP BY date)
+        SELECT COUNT(*) FROM (
+            SELECT a.date FROM actual AS a
+            LEFT JOIN day_counts AS c ON c.date = a.date
+            WHERE c.remote IS NOT a.remote
+            UNION
+            SELECT c.date FROM day_counts AS c
+            LEFT JOIN actual AS a ON a.date = c.date
+            WHERE c.remote <> COALESCE(a.remote, 0)
+        )
+        """
+    )
+    return cursor.fetchone()[0]
+
+
+def rebuild_day_counts(conn) -> int:
+    """Reconstruye day_counts desde records; devuelve la cantidad de fechas.
+
+    Debe ejecutarse dentro de una transacción (ver `data.db_utils.transaction`).
+    """
+    cursor = conn.cursor()
+    cursor.execute("DELETE FROM day_counts")
+    cursor.execute("INSERT INTO day_counts(date, remote) SELECT date, COUNT(*) FROM records GROUP BY date")
+    return cursor.rowcount
+
 
 def create_tables():
-    """Crea o verifica 'users' y 'records', e índice de consultas por usuario/fecha."""
+    """Crea o verifica 'users' y 'records' y aplica las migraciones pendientes."""
     logger.debug("Creando/verificando tablas 'users' y 'records'")
     with get_connection() as conn:
         cursor = conn.cursor()
@@ -35,4 +141,41 @@ def create_tables():
             ON records(user_id, date DESC)
         """)
         conn.commit()
-    logger.info("Tablas listas: users, records")
\ No newline at end of file
+    logger.info("Tablas listas: users, records")
+
+    from data.migrations import migrate
+    migrate()
+
+
+# Registros que sobran por (usuario, semana): se conserva el de fecha más reciente
+_SUPERSEDED_WEEK_RECORDS_SQL = f"""
+    SELECT id, user_id, date FROM (
+        SELECT id, user_id, date, ROW_NUMBER() OVER (
+            PARTITION BY user_id, {WEEK_KEY_SQL} ORDER BY date DESC, id DESC
+        ) AS rank_in_week
+        FROM records
+    )
+    WHERE rank_in_week > 1
+    ORDER BY user_id, date
+"""
+
+
+def duplicate_week_records(conn) -> list[tuple[int, int, str]]:
+    """Registros (id, user_id, date) que repiten semana para el mismo empleado.
+
+    Por cada (usuario, semana) con más de un registro devuelve todos menos el de
+    fecha más reciente. Son los que impiden aplicar la migración 1.
+    """
+    cursor = conn.cursor()
+    cursor.execute(_SUPERSEDED_WEEK_RECORDS_SQL)
+    return cursor.fetchall()
+
+
+def delete_duplicate_week_records(conn) -> int:
+    """Elimina los registros de `duplicate_week_records`; devuelve cuántos borró.
+
+    Debe ejecutarse dentro de una transacción (ver `data.db_utils.transaction`).
+    """
+    cursor = conn.cursor()
+    cursor.execute(f"DELETE FROM records WHERE id IN (SELECT id FROM ({_SUPERSEDED_WEEK_RECORDS_SQL}))")
+    return cursor.rowcount
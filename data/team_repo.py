@@ -0,0 +1,181 @@
+import json
+
+from data.db_utils import get_connection
+from exceptions import AppError, EquipoYaExiste, ErrorDeBaseDeDatos
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+# (root, id): cada equipo (o solo el indicado) con todos sus descendientes, incluido él mismo
+_TREE_CTE = """
+    WITH RECURSIVE tree(root, id) AS (
+        SELECT id, id FROM teams {where}
+        UNION ALL
+        SELECT tree.root, t.id FROM teams AS t JOIN tree ON t.parent_id = tree.id
+    )
+"""
+
+
+def _describe_team_conflict(e) -> AppError:
+    msg = str(e)
+    if "UNIQUE constraint failed" in msg:
+        return EquipoYaExiste("Ya existe un equipo con ese nombre.")
+    if "FOREIGN KEY constraint failed" in msg:
+        return AppError("El equipo superior no existe o el equipo todavía tiene subequipos.")
+    return ErrorDeBaseDeDatos(f"Error en la operación sobre equipos: {e}")
+
+
+# Repositorio de equipos (tabla teams) y de la pertenencia users.team_id
+class TeamRepository:
+    @staticmethod
+    def create(name, parent_id=None):
+        """
+        Crea un equipo (dentro de `parent_id` si se indica) y devuelve su id.
+        Lanza EquipoYaExiste si el nombre está en uso y ErrorDeBaseDeDatos ante otros errores.
+        """
+        logger.debug("Creando equipo name=%s parent_id=%s", name, parent_id)
+        try:
+            with get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("INSERT INTO teams(name, parent_id) VALUES (?, ?)", (name, parent_id))
+                conn.commit()
+                logger.info("Equipo creado id=%s name=%s", cursor.lastrowid, name)
+                return cursor.lastrowid
+        except Exception as e:
+            logger.exception("Error al crear equipo name=%s", name)
+            raise _describe_team_conflict(e)
+
+    @staticmethod
+    def list_all():
+        """Devuelve [(id, name, parent_id)] de todos los equipos ordenados por nombre."""
+        logger.debug("Listando equipos")
+        try:
+            with get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("SELECT id, name, parent_id FROM teams ORDER BY name")
+                rows = cursor.fetchall()
+                logger.info("Equipos obtenidos: %s", len(rows))
+                return rows
+        except Exception as e:
+            logger.exception("Error al listar equipos")
+            raise ErrorDeBaseDeDatos(f"Error al listar equipos: {e}")
+
+    @staticmethod
+    def rename(team_id, name):
+        """Renombra un equipo. Lanza EquipoYaExiste si el nombre está en uso."""
+        logger.debug("Renombrando equipo id=%s name=%s", team_id, name)
+        try:
+            with get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("UPDATE teams SET name = ? WHERE id = ?", (name, team_id))
+                conn.commit()
+                logger.info("Equipo renombrado id=%s", team_id)
+        except Exception as e:
+            logger.exception("Error al renombrar equipo id=%s", team_id)
+            raise _describe_team_conflict(e)
+
+    @staticmethod
+    def delete(team_id):
+        """
+        Elimina un equipo; sus miembros quedan sin equipo (ON DELETE SET NULL).
+        Lanza AppError si todavía tiene subequipos.
+        """
+        logger.debug("Eliminando equipo id=%s", team_id)
+        try:
+            with get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("DELETE FROM teams WHERE id = ?", (team_id,))
+                conn.commit()
+                logger.info("Equipo eliminado id=%s", team_id)
+        except Exception as e:
+            logger.exception("Error al eliminar equipo id=%s", team_id)
+            raise _describe_team_conflict(e)
+
+    @staticmethod
+    def set_members(user_ids, team_id):
+        """
+        Asigna los usuarios `user_ids` al equipo `team_id` (None los deja sin equipo)
+        en una sola sentencia. Devuelve la cantidad de usuarios actualizados.
+        """
+        ids = sorted(set(user_ids))
+        if not ids:
+            return 0
+        logger.debug("Asignando usuarios a equipo n=%s team_id=%s", len(ids), team_id)
+        try:
+            with get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    "UPDATE users SET team_id = ? WHERE id IN (SELECT value FROM json_each(?))",
+                    (team_id, json.dumps(ids)),
+                )
+                conn.commit()
+                logger.info("Usuarios asignados a equipo team_id=%s: %s", team_id, cursor.rowcount)
+                return cursor.rowcount
+        except Exception as e:
+            logger.exception("Error al asignar usuarios a equipo team_id=%s", team_id)
+            raise _describe_team_conflict(e)
+
+    @staticmethod
+    def member_ids(team_id, include_subteams=True):
+        """Devuelve el set de user_id del equipo (y de sus subequipos), en una consulta."""
+        logger.debug("Obteniendo miembros team_id=%s subequipos=%s", team_id, include_subteams)
+        try:
+            with get_connection() as conn:
+                cursor = conn.cursor()
+                if include_subteams:
+                    cursor.execute(
+                        _TREE_CTE.format(where="WHERE id = ?")
+                        + "SELECT u.id FROM tree JOIN users AS u ON u.team_id = tree.id",
+                        (team_id,),
+                    )
+                else:
+                    cursor.execute("SELECT id FROM users WHERE team_id = ?", (team_id,))
+                ids = {row[0] for row in cursor.fetchall()}
+                logger.info("Miembros team_id=%s: %s", team_id, len(ids))
+                return ids
+        except Exception as e:
+            logger.exception("Error al obtener miembros team_id=%s", team_id)
+            raise ErrorDeBaseDeDatos(f"Error al obtener miembros del equipo: {e}")
+
+    @staticmethod
+    def week_stats(week_key, team_id=None):
+        """
+        Registrados por día en la semana `week_key`, agrupados por equipo (sumando sus
+        subequipos), en una sola consulta: [(team_id, week_day, cantidad)].
+        week_day None cuenta a los miembros sin registro. Sin `team_id` incluye todos
+        los equipos y a los empleados sin equipo (team_id None); con `team_id`, solo ese.
+        """
+        logger.debug("Obteniendo estado semanal por equipo week_key=%s team_id=%s", week_key, team_id)
+        grouped = """
+            SELECT tree.root, wa.week_day, COUNT(*)
+            FROM tree
+            JOIN users AS u ON u.team_id = tree.id
+            LEFT JOIN week_assignments AS wa ON wa.week_key = ? AND wa.user_id = u.id
+            GROUP BY tree.root, wa.week_day
+        """
+        try:
+            with get_connection() as conn:
+                cursor = conn.cursor()
+                if team_id is not None:
+                    cursor.execute(_TREE_CTE.format(where="WHERE id = ?") + grouped, (team_id, week_key))
+                else:
+                    cursor.execute(
+                        _TREE_CTE.format(where="")
+                        + grouped
+                        + """
+                        UNION ALL
+                        SELECT NULL, wa.week_day, COUNT(*)
+                        FROM users AS u
+                        LEFT JOIN week_assignments AS wa ON wa.week_key = ? AND wa.user_id = u.id
+                        WHERE u.team_id IS NULL
+                        GROUP BY wa.week_day
+                        """,
+                        (week_key, week_key),
+                    )
+                rows = cursor.fetchall()
+                logger.info("Estado semanal por equipo week_key=%s: %s grupos", week_key, len(rows))
+                return rows
+        except Exception as e:
+            logger.exception("Error al obtener estado semanal por equipo week_key=%s", week_key)
+            raise ErrorDeBaseDeDatos(f"Error al obtener estado semanal por equipo: {e}")
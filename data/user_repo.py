@@ -1,9 +1,37 @@
+from data.bulk import BulkInsertResult, insert_many
 from data.db_utils import get_connection
+from data.schema import users_fts_exists
 from exceptions import ErrorDeBaseDeDatos, UsuarioYaExiste, RegistroDuplicado
 import logging
+import re
 
 logger = logging.getLogger(__name__)
 
+# Tokens de la consulta: mismos separadores que el tokenizador unicode61 de users_fts
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def _fts_match_expr(words):
+    """Expresión MATCH: cada palabra como frase con prefijo ("L-0012" -> "l 0012"*).
+
+    Solo se usan tokens alfanuméricos, así que los operadores FTS5 del usuario no se
+    interpretan. Como frase, un legajo con separadores no obliga a recorrer el token
+    "l" de toda la nómina.
+    """
+    phrases = []
+    for word in words:
+        tokens = _TOKEN_RE.findall(word)
+        if tokens:
+            phrases.append('"' + " ".join(tokens) + '"*')
+    return " ".join(phrases)
+
+
+def _like_contains(word):
+    """Patrón LIKE "contiene `word`" con %, _ y \\ escapados (usar con ESCAPE '\\')."""
+    escaped = word.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
 # Repositorio para operaciones sobre la tabla de usuarios
 class UserRepository:
     @staticmethod
@@ -30,6 +58,29 @@ class UserRepository:
             # Para cualquier otro error, lanzamos una excepción genérica de base de datos
             raise ErrorDeBaseDeDatos(f"Error al crear usuario: {e}")
 
+    @staticmethod
+    def create_many(rows, chunk_size=None) -> BulkInsertResult:
+        """
+        Crea usuarios en bloque desde un iterable de (name, docket), en una transacción.
+        Devuelve BulkInsertResult con el id de cada fila (None si rechazada) y los
+        rechazos por fila (p. ej. nombre o legajo duplicado) sin abortar el lote.
+        Lanza ErrorDeBaseDeDatos para otros errores de base de datos.
+        """
+        logger.debug("Creando usuarios en bloque")
+        try:
+            kwargs = {"chunk_size": chunk_size} if chunk_size else {}
+            result = insert_many(
+                "INSERT INTO users(name, docket) VALUES(?,?)",
+                rows,
+                lambda e: "El usuario ya existe." if "UNIQUE constraint failed" in str(e) else str(e),
+                **kwargs,
+            )
+            logger.info("Usuarios creados en bloque: %s (rechazados %s)", result.inserted, len(result.rejected))
+            return result
+        except Exception as e:
+            logger.exception("Error al crear usuarios en bloque")
+            raise ErrorDeBaseDeDatos(f"Error al crear usuarios: {e}")
+
     @staticmethod
     def list_all():
         """
@@ -48,6 +99,49 @@ class UserRepository:
             logger.exception("Error al listar usuarios")
             raise ErrorDeBaseDeDatos(f"Error al listar usuarios: {e}")
 
+    @staticmethod
+    def search(query, limit=50):
+        """
+        Busca usuarios cuyo nombre o legajo contenga palabras que empiecen con cada
+        palabra de `query` (sin distinguir mayúsculas ni acentos). Devuelve hasta
+        `limit` filas (id, name, docket) ordenadas por relevancia (bm25; el legajo pesa más).
+        Usa el índice users_fts; si no existe (SQLite sin FTS5) recurre a LIKE.
+        Lanza ErrorDeBaseDeDatos si ocurre un error en la consulta.
+        """
+        # Palabras sin letras ni dígitos ("-", "&") no filtran: FTS las ignora y LIKE también
+        words = [w for w in (query or "").split() if _TOKEN_RE.search(w)]
+        if not words:
+            return []
+        logger.debug("Buscando usuarios query=%r limit=%s", query, limit)
+        try:
+            with get_connection() as conn:
+                cursor = conn.cursor()
+                if users_fts_exists(conn):
+                    cursor.execute(
+                        """
+                        SELECT u.id, u.name, u.docket
+                        FROM users_fts
+                        JOIN users u ON u.id = users_fts.rowid
+                        WHERE users_fts MATCH ?
+                        ORDER BY bm25(users_fts, 1.0, 2.0), u.name
+                        LIMIT ?
+                        """,
+                        (_fts_match_expr(words), int(limit)),
+                    )
+                else:
+                    where = " AND ".join("(name LIKE ? ESCAPE '\\' OR docket LIKE ? ESCAPE '\\')" for _ in words)
+                    params = [p for w in words for p in (_like_contains(w),) * 2]
+                    cursor.execute(
+                        f"SELECT id, name, docket FROM users WHERE {where} ORDER BY name LIMIT ?",
+                        (*params, int(limit)),
+                    )
+                rows = cursor.fetchall()
+                logger.info("Usuarios encontrados: %s", len(rows))
+                return rows
+        except Exception as e:
+            logger.exception("Error al buscar usuarios query=%r", query)
+            raise ErrorDeBaseDeDatos(f"Error al buscar usuarios: {e}")
+
     @staticmethod
     def delete_user(id):
         """
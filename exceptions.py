@@ -12,6 +12,10 @@ class UsuarioYaExiste(AppError):
     """Restricción de unicidad al crear usuario (docket duplicado)."""
     pass
 
+class EquipoYaExiste(AppError):
+    """Restricción de unicidad al crear o renombrar un equipo (nombre duplicado)."""
+    pass
+
 class RegistroDuplicado(AppError):
     """Restricción de unicidad al crear registro (mismo usuario y fecha)."""
     pass
@@ -32,4 +36,12 @@ class NoHayRegistroEstaSemana(AppError):
 
 class FechaFueraDeSemanaActual(AppError):
     """La fecha no corresponde a la semana actual."""
-    pass
\ No newline at end of file
+    pass
+
+class CupoDiarioCompleto(AppError):
+    """El día elegido alcanzó el cupo máximo de personas remotas."""
+    pass
+
+class ExportacionCancelada(AppError):
+    """El usuario canceló una exportación en curso (el archivo no se genera)."""
+    pass
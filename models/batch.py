@@ -0,0 +1,45 @@
+from dataclasses import dataclass, field
+from typing import Optional
+
+from exceptions import AppError
+from models.record import Record
+
+"""Modelo de resultado: validación y alta de varias asignaciones a la vez."""
+
+
+@dataclass(frozen=True)
+class AssignmentCheck:
+    index: int                       # posición en la entrada
+    user_id: int
+    date: str                        # YYYY-MM-DD tal como se pidió
+    week_day: Optional[str]          # None si la fecha no es válida
+    error: Optional[AppError] = None # regla violada (rechazo)
+    repeats_adjacent_week: bool = False  # mismo día que la semana anterior o la siguiente
+    override: bool = False           # se autorizó repetir el día
+
+    @property
+    def needs_override(self) -> bool:
+        """Cumple todo salvo repetir el día de una semana contigua sin autorización."""
+        return self.error is None and self.repeats_adjacent_week and not self.override
+
+    @property
+    def accepted(self) -> bool:
+        return self.error is None and not self.needs_override
+
+
+@dataclass(frozen=True)
+class BatchResult:
+    checks: list[AssignmentCheck]
+    records: list[Record] = field(default_factory=list)  # altas realizadas (solo assign_many)
+
+    @property
+    def accepted(self) -> list[AssignmentCheck]:
+        return [c for c in self.checks if c.accepted]
+
+    @property
+    def rejected(self) -> list[AssignmentCheck]:
+        return [c for c in self.checks if c.error is not None]
+
+    @property
+    def needs_override(self) -> list[AssignmentCheck]:
+        return [c for c in self.checks if c.needs_override]
@@ -0,0 +1,22 @@
+from dataclasses import dataclass
+from typing import Optional
+
+"""Modelo de lectura: ocupación remota de una fecha frente a su cupo."""
+
+
+@dataclass(frozen=True)
+class DayCapacity:
+    date: str                   # YYYY-MM-DD
+    remote: int                 # remotos registrados
+    max_remote: Optional[int]   # cupo del día de semana; None = sin cupo
+
+    @property
+    def remaining(self) -> Optional[int]:
+        """Lugares libres (nunca negativo) o None si el día no tiene cupo."""
+        if self.max_remote is None:
+            return None
+        return max(0, self.max_remote - self.remote)
+
+    @property
+    def is_full(self) -> bool:
+        return self.max_remote is not None and self.remote >= self.max_remote
@@ -0,0 +1,49 @@
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+from models.record import Record
+from models.user import User
+
+"""Modelo de lectura: resumen de un empleado para el encabezado y el calendario."""
+
+
+@dataclass(frozen=True)
+class EmployeeSummary:
+    user: User
+    current_week: Optional[Record]  # registro de la semana de referencia
+    latest: Optional[Record]        # último registro (cualquier semana)
+    prev_week: Optional[Record]     # registro de la semana anterior
+    next_week: Optional[Record] = None  # registro de la semana siguiente (ya planificada)
+
+    @property
+    def user_id(self) -> int:
+        return int(self.user.id)
+
+    @property
+    def registered(self) -> bool:
+        return self.current_week is not None
+
+    @staticmethod
+    def from_row(row: Tuple) -> "EmployeeSummary":
+        """Crea el resumen desde la fila de `RecordRespository.get_employee_summary`:
+        (id, name, docket) seguido de (id, date, week_day) de la semana, la anterior,
+        el último y la siguiente.
+        """
+        user = User.from_full_row(row[0:3])
+
+        def record(offset: int) -> Optional[Record]:
+            rec_id, rec_date, week_day = row[offset:offset + 3]
+            if rec_id is None:
+                return None
+            return Record(id=rec_id, user_id=user.id, date=rec_date, week_day=week_day)
+
+        return EmployeeSummary(
+            user=user, current_week=record(3), prev_week=record(6), latest=record(9), next_week=record(12)
+        )
+
+    def adjacent_week_repeating(self, week_day: str) -> Optional[Record]:
+        """Registro de la semana anterior o siguiente en el mismo día `week_day`, si lo hay."""
+        for rec in (self.prev_week, self.next_week):
+            if rec is not None and rec.week_day == week_day:
+                return rec
+        return None
@@ -0,0 +1,29 @@
+from dataclasses import dataclass, field
+from typing import Optional, Tuple
+
+"""Modelos de equipos (tabla 'teams') y su estado semanal agregado."""
+
+
+@dataclass(frozen=True)
+class Team:
+    id: Optional[int]
+    name: str
+    parent_id: Optional[int] = None  # None = equipo de primer nivel
+
+    @staticmethod
+    def from_full_row(row: Tuple[int, str, Optional[int]]) -> "Team":
+        """Crea Team desde fila (id, name, parent_id)."""
+        team_id, name, parent_id = row
+        return Team(id=team_id, name=name, parent_id=parent_id)
+
+
+@dataclass(frozen=True)
+class TeamWeekStats:
+    team_id: Optional[int]          # None = empleados sin equipo
+    members: int = 0                # incluye los de sus subequipos
+    registered: int = 0             # con registro en la semana
+    by_day: dict[str, int] = field(default_factory=dict)  # {week_day: registrados}
+
+    @property
+    def pending(self) -> int:
+        return self.members - self.registered
@@ -0,0 +1,33 @@
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+from models.record import Record
+from models.user import User
+
+"""Modelo de lectura: fila de la matriz semana × empleado."""
+
+
+@dataclass(frozen=True)
+class WeekMatrixRow:
+    user: User
+    current_week: Optional[Record]  # registro de la semana mostrada
+    prev_week_day: Optional[str]    # día registrado la semana anterior
+    next_week_day: Optional[str] = None  # día registrado la semana siguiente
+
+    @property
+    def user_id(self) -> int:
+        return int(self.user.id)
+
+    @staticmethod
+    def from_row(row: Tuple) -> "WeekMatrixRow":
+        """Crea la fila desde `RecordRespository.week_matrix`:
+        (id, name, docket, record_id, date, week_day, prev_week_day, next_week_day).
+        """
+        user = User.from_full_row(row[0:3])
+        rec_id, rec_date, week_day, prev_week_day, next_week_day = row[3:8]
+        current = None
+        if rec_id is not None:
+            current = Record(id=rec_id, user_id=user.id, date=rec_date, week_day=week_day)
+        return WeekMatrixRow(
+            user=user, current_week=current, prev_week_day=prev_week_day, next_week_day=next_week_day
+        )
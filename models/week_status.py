@@ -0,0 +1,14 @@
+from dataclasses import dataclass
+from datetime import date
+
+from models.capacity import DayCapacity
+
+"""Modelo de lectura: estado de una semana para el calendario y el sidebar."""
+
+
+@dataclass(frozen=True)
+class WeekStatus:
+    week_start: date                   # lunes de la semana
+    registered: frozenset[int]         # user_id con registro en la semana
+    capacity: dict[str, DayCapacity]   # {fecha ISO: ocupación y cupo}
+    editable: bool                     # False en semanas pasadas o fuera de planificación
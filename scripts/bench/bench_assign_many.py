@@ -0,0 +1,93 @@
+"""Benchmark: asignación por lote (`AsignacionService.assign_many`) frente a
+`assign_day` pedido por pedido.
+
+Siembra `--users` empleados en una base temporal, con un registro la semana
+anterior para parte de ellos (así algunos pedidos repiten día y quedan a la
+espera de autorización) y un cupo en el Miércoles. Mide `validate_many`,
+`assign_many` y, sobre una base nueva con los mismos datos, el bucle de
+`assign_day`; verifica que ambos caminos registren lo mismo.
+
+Uso:
+    python scripts/bench/bench_assign_many.py [--users 5000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+import sys
+
+# Habilitar imports del proyecto (raíz del repo)
+ROOT_DIR = Path(__file__).resolve().parents[2]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from data.assignament_repo import RecordRespository
+from data.db_utils import close_all_connections, configure_database
+from data.schema import create_tables, week_key
+from data.user_repo import UserRepository
+from exceptions import AppError
+from services.assignment_service import AsignacionService, _WEEKDAY_MAP
+
+
+def _seed(path: Path, users: int, start: date) -> list[tuple[int, str]]:
+    """Crea la base y devuelve los pedidos (user_id, fecha) de la semana actual."""
+    configure_database(path)
+    create_tables()
+    UserRepository.create_many((f"Empleado {i}", f"L-{i:05d}") for i in range(users))
+    RecordRespository.create_many(
+        (uid, (start - timedelta(days=7 - 1 - uid % 4)).isoformat(), _WEEKDAY_MAP[1 + uid % 4])
+        for uid in range(1, users + 1, 3)
+    )
+    service = AsignacionService()
+    service.set_day_capacity("Miércoles", users // 8)
+    return [(uid, (start + timedelta(days=1 + uid % 4)).isoformat()) for uid in range(1, users + 1)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=5_000)
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    today = date.today()
+    start = today - timedelta(days=today.weekday())
+
+    with tempfile.TemporaryDirectory() as tmp:
+        items = _seed(Path(tmp) / "batch.db", args.users, start)
+        service = AsignacionService()
+        t0 = time.perf_counter()
+        checked = service.validate_many(items)
+        t_validate = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        result = service.assign_many(items)
+        t_batch = time.perf_counter() - t0
+        batch_ids = RecordRespository.registered_user_ids_in_week(week_key(today))
+        close_all_connections()
+
+        items = _seed(Path(tmp) / "loop.db", args.users, start)
+        service = AsignacionService()
+        t0 = time.perf_counter()
+        for uid, date_iso in items:
+            try:
+                service.assign_day(uid, date_iso)
+            except AppError:
+                pass
+        t_loop = time.perf_counter() - t0
+        loop_ids = RecordRespository.registered_user_ids_in_week(week_key(today))
+        close_all_connections()
+
+    assert batch_ids == loop_ids, "el lote y el bucle registraron empleados distintos"
+    print(f"{args.users} pedidos: {len(result.records)} registrados, {len(result.rejected)} rechazados, "
+          f"{len(result.needs_override)} requieren autorización")
+    print(f"validate_many  {t_validate * 1000:>9.1f} ms  ({len(checked.accepted)} aceptados)")
+    print(f"assign_many    {t_batch * 1000:>9.1f} ms")
+    print(f"assign_day x N {t_loop * 1000:>9.1f} ms  ({t_loop / t_batch:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
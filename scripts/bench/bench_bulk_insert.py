@@ -0,0 +1,95 @@
+"""Benchmark: carga de historial con `create_many` vs altas de a una.
+
+Genera `--records` registros históricos (una fecha por empleado y semana hacia
+atrás) y los inserta con `RecordRespository.create_many` en una transacción. Para
+comparar, mide `create_record` (una transacción y un commit por fila) sobre una
+muestra y extrapola. También incluye filas duplicadas para verificar que se
+reportan por fila sin abortar el lote.
+
+Uso:
+    python scripts/bench/bench_bulk_insert.py [--records 100000] [--sample 2000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+import sys
+
+# Habilitar imports del proyecto (raíz del repo)
+ROOT_DIR = Path(__file__).resolve().parents[2]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from data.assignament_repo import RecordRespository
+from data.db_utils import close_all_connections, configure_database
+from data.schema import create_tables
+from data.user_repo import UserRepository
+
+_WEEKDAY_NAMES = ["Lunes", "Martes", "Miércoles", "Jueves", "Viernes", "Sábado", "Domingo"]
+
+
+def _history(user_ids: list[int], n_records: int, weeks_back_from: int = 1):
+    """Genera (user_id, date, week_day): recorre semanas hacia atrás para cada empleado."""
+    monday = date.today() - timedelta(days=date.today().weekday())
+    produced = 0
+    week = weeks_back_from
+    while produced < n_records:
+        start = monday - timedelta(days=7 * week)
+        for uid in user_ids:
+            d = start + timedelta(days=1 + (uid + week) % 4)
+            yield (uid, d.isoformat(), _WEEKDAY_NAMES[d.weekday()])
+            produced += 1
+            if produced >= n_records:
+                return
+        week += 1
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=100_000)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--sample", type=int, default=2000, help="filas para medir create_record")
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        configure_database(Path(tmp) / "bulk.db")
+        create_tables()
+
+        t0 = time.perf_counter()
+        users = UserRepository.create_many((f"Empleado {i:05d}", f"BULK-{i:05d}") for i in range(args.users))
+        print(f"usuarios create_many: {users.inserted} en {time.perf_counter() - t0:.2f} s")
+        user_ids = [uid for uid in users.ids if uid is not None]
+
+        t0 = time.perf_counter()
+        result = RecordRespository.create_many(_history(user_ids, args.records))
+        bulk_s = time.perf_counter() - t0
+        print(f"registros create_many: {result.inserted} en {bulk_s:.2f} s "
+              f"({result.inserted / bulk_s:,.0f} filas/s)")
+
+        # Duplicados: volver a cargar las primeras filas; deben rechazarse una a una
+        dup = RecordRespository.create_many(_history(user_ids, 500))
+        print(f"recarga de 500 filas: insertadas={dup.inserted} rechazadas={len(dup.rejected)}")
+
+        # Referencia: create_record de a una (semanas más antiguas para no chocar)
+        weeks_used = args.records // max(1, len(user_ids)) + 2
+        sample = list(_history(user_ids, args.sample, weeks_back_from=weeks_used))
+        t0 = time.perf_counter()
+        for row in sample:
+            RecordRespository.create_record(*row)
+        single_s = time.perf_counter() - t0
+        per_row = single_s / len(sample)
+        print(f"create_record de a una: {per_row * 1000:.3f} ms/fila -> "
+              f"{per_row * args.records:.1f} s estimados para {args.records} filas "
+              f"({per_row * args.records / bulk_s:.0f}x más lento)")
+        close_all_connections()
+
+
+if __name__ == "__main__":
+    main()
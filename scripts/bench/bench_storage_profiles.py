@@ -0,0 +1,109 @@
+"""Benchmark: latencia de escritura y lectura por perfil de almacenamiento SQLite.
+
+Para cada perfil de `config.STORAGE_PROFILES` crea una base temporal, siembra una
+nómina y mide:
+- escritura: `AsignacionService.assign_day` (una transacción y un commit por alta)
+- lectura puntual: `is_registered_this_week` por empleado
+- lectura de nómina: `users_week_status` sobre todos los empleados
+
+Uso:
+    python scripts/bench/bench_storage_profiles.py [--users 2000] [--dir RUTA]
+
+--dir permite medir sobre el disco real donde vive la DB (p. ej. una carpeta de red).
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import statistics
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+import sys
+
+# Habilitar imports del proyecto (raíz del repo)
+ROOT_DIR = Path(__file__).resolve().parents[2]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from config import STORAGE_PROFILES
+from data.db_utils import close_all_connections, configure_database, get_connection
+from data.schema import create_tables
+from services.assignment_service import AsignacionService
+from services.user_service import UserService
+
+
+def _seed(n_users: int) -> None:
+    with get_connection() as conn:
+        conn.executemany(
+            "INSERT INTO users(name, docket) VALUES (?, ?)",
+            ((f"Empleado {i:05d}", f"BENCH-{i:05d}") for i in range(n_users)),
+        )
+        conn.commit()
+
+
+def _percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+def _run_profile(profile: str, db_path: Path, n_users: int) -> dict[str, float]:
+    configure_database(db_path, profile)
+    create_tables()
+    _seed(n_users)
+    users = UserService().list_users()
+    service = AsignacionService()
+
+    today = date.today()
+    monday = today - timedelta(days=today.weekday())
+    day_iso = (monday + timedelta(days=2)).isoformat()  # miércoles de esta semana
+
+    writes: list[float] = []
+    for u in users[: min(500, len(users))]:
+        t0 = time.perf_counter()
+        service.assign_day(u.id, day_iso, allow_repeat_prev_week=True)
+        writes.append(time.perf_counter() - t0)
+
+    reads: list[float] = []
+    for u in users:
+        t0 = time.perf_counter()
+        service.is_registered_this_week(u.id)
+        reads.append(time.perf_counter() - t0)
+
+    t0 = time.perf_counter()
+    service.users_week_status(users)
+    roster = time.perf_counter() - t0
+
+    close_all_connections()
+    return {
+        "write_avg": statistics.mean(writes),
+        "write_p95": _percentile(writes, 0.95),
+        "read_avg": statistics.mean(reads),
+        "read_p95": _percentile(reads, 0.95),
+        "roster": roster,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--dir", type=Path, default=None, help="carpeta donde crear las bases de prueba")
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+
+    header = f"{'perfil':<16} {'esc. avg':>9} {'esc. p95':>9} {'lec. avg':>9} {'lec. p95':>9} {'nómina':>9}"
+    print(header + "   (ms)")
+    with tempfile.TemporaryDirectory(dir=args.dir) as tmp:
+        for profile in STORAGE_PROFILES:
+            r = _run_profile(profile, Path(tmp) / f"{profile}.db", args.users)
+            print(
+                f"{profile:<16} {r['write_avg'] * 1000:>9.3f} {r['write_p95'] * 1000:>9.3f} "
+                f"{r['read_avg'] * 1000:>9.3f} {r['read_p95'] * 1000:>9.3f} {r['roster'] * 1000:>9.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Benchmark: búsqueda de empleados con FTS5 (`UserRepository.search`) vs LIKE.
+
+Siembra `--users` empleados en una base temporal y mide, para varias consultas,
+`UserRepository.search` (índice users_fts) contra un `LIKE '%x%'` sobre nombre y
+legajo, que recorre la tabla completa. Muestra también el plan de cada consulta.
+
+Uso:
+    python scripts/bench/bench_user_search.py [--users 100000] [--repeat 20]
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+import sys
+
+# Habilitar imports del proyecto (raíz del repo)
+ROOT_DIR = Path(__file__).resolve().parents[2]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from data.db_utils import close_all_connections, configure_database, get_connection
+from data.schema import create_tables, users_fts_exists
+from data.user_repo import UserRepository
+
+_FIRST = ["Ana", "Juan", "María", "José", "Lucía", "Martín", "Sofía", "Pedro", "Valentina", "Diego"]
+_LAST = ["Gómez", "Pérez", "Rodríguez", "López", "Fernández", "Díaz", "Álvarez", "Romero", "Sosa", "Torres"]
+_QUERIES = ["gom", "maria lop", "L-0123", "L-09999", "valentina torres", "zzz"]
+
+
+def _like_search(query: str, limit: int = 50):
+    words = query.split()
+    where = " AND ".join("(name LIKE ? OR docket LIKE ?)" for _ in words)
+    params = [p for w in words for p in (f"%{w}%", f"%{w}%")]
+    with get_connection() as conn:
+        return conn.execute(
+            f"SELECT id, name, docket FROM users WHERE {where} ORDER BY name LIMIT ?", (*params, limit)
+        ).fetchall()
+
+
+def _time(fn, query: str, repeat: int) -> tuple[float, int]:
+    samples = []
+    rows = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        rows = fn(query)
+        samples.append(time.perf_counter() - t0)
+    return statistics.median(samples), len(rows)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    rnd = random.Random(7)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        configure_database(Path(tmp) / "search.db")
+        create_tables()
+        t0 = time.perf_counter()
+        UserRepository.create_many(
+            (f"{rnd.choice(_FIRST)} {rnd.choice(_LAST)} {rnd.choice(_LAST)} {i}", f"L-{i:05d}")
+            for i in range(args.users)
+        )
+        print(f"{args.users} empleados (con triggers FTS) en {time.perf_counter() - t0:.2f} s")
+        with get_connection() as conn:
+            if not users_fts_exists(conn):
+                print("SQLite sin FTS5: search() usa LIKE; la comparación no aplica.")
+
+        print(f"{'consulta':<18} {'FTS5 ms':>9} {'filas':>6} {'LIKE ms':>9} {'filas':>6} {'x':>6}")
+        for q in _QUERIES:
+            fts_s, fts_n = _time(UserRepository.search, q, args.repeat)
+            like_s, like_n = _time(_like_search, q, args.repeat)
+            print(f"{q!r:<18} {fts_s * 1000:>9.3f} {fts_n:>6} {like_s * 1000:>9.3f} {like_n:>6} "
+                  f"{like_s / fts_s:>6.1f}")
+
+        with get_connection() as conn:
+            plan = conn.execute(
+                "EXPLAIN QUERY PLAN SELECT rowid FROM users_fts WHERE users_fts MATCH '\"gom\"*'"
+            ).fetchall() if users_fts_exists(conn) else []
+            like_plan = conn.execute(
+                "EXPLAIN QUERY PLAN SELECT id FROM users WHERE name LIKE '%gom%' OR docket LIKE '%gom%'"
+            ).fetchall()
+        print("plan FTS5:", "; ".join(r[-1] for r in plan))
+        print("plan LIKE:", "; ".join(r[-1] for r in like_plan))
+        close_all_connections()
+
+
+if __name__ == "__main__":
+    main()
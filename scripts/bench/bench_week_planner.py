@@ -0,0 +1,126 @@
+"""Benchmark: planificador semanal (`WeekPlanner.propose`), de varias semanas
+(`WeekPlanner.propose_horizon`) y escritura del plan.
+
+Siembra `--users` empleados en una base temporal con un historial de la semana
+anterior (sesgado a Martes, para que la regla de no repetir tenga peso), una
+parte ya registrada en la semana actual y otra en la cuarta semana. Mide
+`propose` y `propose_horizon` (`--weeks`) sin y con cupos por día, muestra las
+métricas de equidad y balance, verifica las reglas y mide
+`AsignacionService.apply_week_plan` (una transacción).
+
+Uso:
+    python scripts/bench/bench_week_planner.py [--users 10000] [--weeks 12] [--repeat 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import random
+import statistics
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+import sys
+
+# Habilitar imports del proyecto (raíz del repo)
+ROOT_DIR = Path(__file__).resolve().parents[2]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from data.assignament_repo import RecordRespository
+from data.db_utils import close_all_connections, configure_database
+from data.schema import create_tables
+from data.user_repo import UserRepository
+from services.assignment_service import AsignacionService, _WEEKDAY_MAP
+from services.planner import WeekPlanner
+
+
+def _check(plan, previous: dict[int, str], capacity: dict[str, int] | None) -> None:
+    seen = set()
+    for a in plan.assignments:
+        assert a.user_id not in seen, "empleado asignado dos veces"
+        seen.add(a.user_id)
+        assert a.week_day not in ("Lunes", "Sábado", "Domingo"), "día no permitido"
+        assert previous.get(a.user_id) != a.week_day, "repite el día de la semana anterior"
+    for day, cap in (capacity or {}).items():
+        assert plan.load_by_day[day] <= cap, f"cupo excedido {day}"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--weeks", type=int, default=12)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    rnd = random.Random(7)
+    today = date.today()
+    start = today - timedelta(days=today.weekday())
+
+    with tempfile.TemporaryDirectory() as tmp:
+        configure_database(Path(tmp) / "planner.db")
+        create_tables()
+        UserRepository.create_many((f"Empleado {i}", f"L-{i:05d}") for i in range(args.users))
+        previous: dict[int, str] = {}
+        rows = []
+        for uid in range(1, args.users + 1):
+            if rnd.random() < 0.9:
+                d = rnd.choice([1, 1, 1, 2, 3, 4])
+                previous[uid] = _WEEKDAY_MAP[d]
+                rows.append((uid, (start - timedelta(days=7 - d)).isoformat(), _WEEKDAY_MAP[d]))
+        RecordRespository.create_many(rows)
+        already = args.users // 20
+        RecordRespository.create_many(
+            (uid, (start + timedelta(days=2)).isoformat(), "Miércoles") for uid in range(1, already + 1)
+        )
+        if args.weeks > 3:
+            RecordRespository.create_many(
+                (uid, (start + timedelta(days=25)).isoformat(), "Viernes") for uid in range(1, already // 2 + 1)
+            )
+        print(f"{args.users} empleados, {len(rows)} con registro la semana anterior, {already} ya registrados")
+
+        planner = WeekPlanner()
+        share = args.users // 4
+        capacity = {"Martes": share, "Miércoles": share, "Jueves": share, "Viernes": share - share // 10}
+        print(f"{'caso':<12} {'ms':>8} {'propuestas':>11} {'sin cupo':>9}  carga por día")
+        plan = None
+        for label, cap in (("sin cupos", None), ("con cupos", capacity)):
+            samples = []
+            for _ in range(args.repeat):
+                t0 = time.perf_counter()
+                plan = planner.propose(capacity=cap)
+                samples.append(time.perf_counter() - t0)
+            _check(plan, previous, cap)
+            print(f"{label:<12} {statistics.median(samples) * 1000:>8.1f} {len(plan.assignments):>11} "
+                  f"{len(plan.unassigned):>9}  {plan.load_by_day}")
+
+        print(f"\nHorizonte de {args.weeks} semanas")
+        print(f"{'caso':<12} {'ms':>8} {'propuestas':>11} {'sin cupo':>9} {'repet.':>7} "
+              f"{'disp.máx':>9} {'equidad':>8} {'desbal.':>8} {'cv':>7}")
+        for label, cap in (("sin cupos", None), ("con cupos", capacity)):
+            samples = []
+            for _ in range(args.repeat):
+                t0 = time.perf_counter()
+                horizon = planner.propose_horizon(args.weeks, capacity=cap)
+                samples.append(time.perf_counter() - t0)
+            _check(horizon.weeks[0], previous, cap)
+            for week in horizon.weeks[1:]:
+                _check(week, {}, cap)
+            m = horizon.metrics
+            assert m.repeats == 0, "el plan repite días consecutivos"
+            print(f"{label:<12} {statistics.median(samples) * 1000:>8.1f} {m.assigned:>11} {m.unassigned:>9} "
+                  f"{m.repeats:>7} {m.rotation_spread_max:>9} {m.fair_rotation_ratio:>8.1%} "
+                  f"{m.load_imbalance_max:>8} {m.load_cv:>7.4f}")
+
+        t0 = time.perf_counter()
+        result = AsignacionService().apply_week_plan(plan)
+        print(f"apply_week_plan: {len(result.records)} filas en {(time.perf_counter() - t0) * 1000:.1f} ms "
+              f"(rechazadas {len(result.rejected)}, sin autorizar {len(result.needs_override)})")
+        close_all_connections()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Benchmark: estado semanal de toda la nómina (N+1 vs consulta agrupada).
+
+Compara el recorrido anterior (una consulta `exists_in_week` por empleado) contra
+`AsignacionService.users_week_status`, que resuelve la semana con una sola consulta.
+Usa una base temporal; no toca la DB real.
+
+Uso:
+    python scripts/bench/bench_week_status.py [--sizes 100 1000 10000] [--repeat 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+import sys
+
+# Habilitar imports del proyecto (raíz del repo)
+ROOT_DIR = Path(__file__).resolve().parents[2]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from data.db_utils import close_all_connections, configure_database, get_connection
+from data.assignament_repo import RecordRespository
+from data.schema import create_tables, week_key
+from services.assignment_service import AsignacionService
+from services.user_service import UserService
+
+
+def _seed(n_users: int) -> None:
+    """Crea n_users empleados; la mitad con registro esta semana y todos con historial."""
+    today = date.today()
+    start = today - timedelta(days=today.weekday())
+    with get_connection() as conn:
+        conn.executemany(
+            "INSERT INTO users(name, docket) VALUES (?, ?)",
+            ((f"Empleado {i:05d}", f"BENCH-{i:05d}") for i in range(n_users)),
+        )
+        rows = []
+        for uid in range(1, n_users + 1):
+            for weeks_ago in range(1, 9):
+                d = start - timedelta(days=7 * weeks_ago) + timedelta(days=1 + uid % 4)
+                rows.append((uid, d.isoformat(), "-"))
+            if uid % 2 == 0:
+                rows.append((uid, (start + timedelta(days=1 + uid % 4)).isoformat(), "-"))
+        conn.executemany("INSERT INTO records(user_id, date, week_day) VALUES (?, ?, ?)", rows)
+        conn.commit()
+
+
+def _n_plus_one(users) -> int:
+    wk = week_key(date.today())
+    return sum(RecordRespository.exists_in_week(u.id, wk) for u in users)
+
+
+def _bulk(service: AsignacionService, users) -> int:
+    return sum(flag for _u, flag in service.users_week_status(users))
+
+
+def _best(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    # Silenciar logs DEBUG/INFO de los repositorios durante la medición
+    import logging
+    logging.disable(logging.INFO)
+
+    print(f"{'empleados':>10} {'N+1 (ms)':>12} {'agrupada (ms)':>14} {'speedup':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in args.sizes:
+            configure_database(Path(tmp) / f"bench_{n}.db")
+            create_tables()
+            _seed(n)
+            users = UserService().list_users()
+            service = AsignacionService()
+            assert _n_plus_one(users) == _bulk(service, users)
+            slow = _best(lambda: _n_plus_one(users), args.repeat)
+            fast = _best(lambda: _bulk(service, users), args.repeat)
+            print(f"{n:>10} {slow * 1000:>12.2f} {fast * 1000:>14.2f} {slow / fast:>8.1f}x")
+        close_all_connections()
+
+
+if __name__ == "__main__":
+    main()
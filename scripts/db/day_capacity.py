@@ -0,0 +1,92 @@
+"""Configura los cupos de remotos por día de semana y verifica sus contadores.
+
+Hace:
+- list: muestra los cupos configurados y la ocupación de la semana actual
+- set DIA N: fija el cupo de remotos de un día ("Martes", ...)
+- clear DIA: quita el cupo de un día
+- check [--repair]: compara day_counts contra records y opcionalmente la reconstruye
+
+Uso:
+    python scripts/db/day_capacity.py list
+    python scripts/db/day_capacity.py set Martes 40
+    python scripts/db/day_capacity.py clear Martes
+    python scripts/db/day_capacity.py check [--repair]
+"""
+
+# Permitir importar módulos del proyecto al ejecutar este script directamente
+from pathlib import Path
+import sys
+ROOT_DIR = Path(__file__).resolve().parents[2]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+import argparse
+from logger_config import logger
+from data.schema import create_tables, day_counts_drift, rebuild_day_counts
+from data.db_utils import get_connection, transaction
+from services.assignment_service import AsignacionService
+
+
+def _list(service: AsignacionService) -> None:
+    limits = service.day_capacity_limits()
+    if not limits:
+        print("Sin cupos configurados")
+    for week_day, limit in limits.items():
+        print(f"{week_day:<10} {limit:>6}")
+    print("\nSemana actual")
+    for day in service.week_capacity().values():
+        cap = "-" if day.max_remote is None else day.max_remote
+        print(f"{day.date}  remotos={day.remote:<6} cupo={cap}")
+
+
+def _check(repair: bool) -> None:
+    with get_connection() as conn:
+        drift = day_counts_drift(conn)
+    if not drift:
+        logger.info("day_counts consistente con records")
+        return
+
+    logger.warning("day_counts desincronizada: %s fechas con diferencias", drift)
+    if not repair:
+        logger.warning("Ejecuta con --repair para reconstruirla")
+        sys.exit(1)
+
+    with transaction() as conn:
+        rows = rebuild_day_counts(conn)
+    logger.info("day_counts reconstruida: %s fechas", rows)
+
+    with get_connection() as conn:
+        drift = day_counts_drift(conn)
+    assert not drift, f"Persisten diferencias en {drift} fechas"
+    logger.info("Reparación verificada")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Cupos de remotos por día de semana")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("list", help="muestra cupos y ocupación de la semana actual")
+    p_set = sub.add_parser("set", help="fija el cupo de un día")
+    p_set.add_argument("week_day")
+    p_set.add_argument("max_remote", type=int)
+    p_clear = sub.add_parser("clear", help="quita el cupo de un día")
+    p_clear.add_argument("week_day")
+    p_check = sub.add_parser("check", help="verifica los contadores day_counts")
+    p_check.add_argument("--repair", action="store_true", help="reconstruye la tabla si hay diferencias")
+    args = parser.parse_args()
+
+    create_tables()
+    service = AsignacionService()
+    if args.command == "list":
+        _list(service)
+    elif args.command == "set":
+        service.set_day_capacity(args.week_day, args.max_remote)
+        logger.info("Cupo de %s fijado en %s", args.week_day, args.max_remote)
+    elif args.command == "clear":
+        service.set_day_capacity(args.week_day, None)
+        logger.info("Cupo de %s quitado", args.week_day)
+    else:
+        _check(args.repair)
+
+
+if __name__ == "__main__":
+    main()
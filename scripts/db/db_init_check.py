@@ -3,7 +3,9 @@
 Hace:
 - Crea/verifica users y records
 - Chequea existencia en sqlite_master
-- Verifica UNIQUE en users.docket y (records.user_id, date)
+- Verifica UNIQUE en users.docket, (records.user_id, date) y (records.user_id, week_key)
+- Verifica que la versión de esquema (PRAGMA user_version) sea la última
+- Verifica que el índice users_fts coincida con users (si SQLite trae FTS5)
 - Limpia datos de prueba
 
 Uso:
@@ -13,14 +15,15 @@ Uso:
 # Permitir importar módulos del proyecto al ejecutar este script directamente
 from pathlib import Path
 import sys
-ROOT_DIR = Path(__file__).resolve().parents[1]
+ROOT_DIR = Path(__file__).resolve().parents[2]
 if str(ROOT_DIR) not in sys.path:
     sys.path.insert(0, str(ROOT_DIR))
 
 import sqlite3
 from logger_config import logger
-from data.schema import create_tables
+from data.schema import create_tables, users_fts_exists
 from data.db_utils import get_connection
+from data.migrations import LATEST_VERSION, current_version
 
 
 def _cleanup_test_data(cursor: sqlite3.Cursor) -> None:
@@ -97,11 +100,37 @@ def _verify_unique_constraints(conn: sqlite3.Connection) -> None:
         logger.info("Restricción UNIQUE en (records.user_id, date) verificada correctamente")
     assert unique_pair_ok, "Se esperaba violación de UNIQUE en (records.user_id, date) y no ocurrió"
 
+    # 3) UNIQUE en (records.user_id, week_key): otro día de la misma semana
+    logger.debug("Probando UNIQUE en (records.user_id, week_key)")
+    unique_week_ok = False
+    try:
+        cursor.execute(
+            "INSERT INTO records(user_id, date, week_day) VALUES (?, ?, ?)",
+            (user_id, "2025-01-02", "Jueves"),
+        )
+        conn.commit()
+    except sqlite3.IntegrityError:
+        unique_week_ok = True
+        logger.info("Restricción UNIQUE en (records.user_id, week_key) verificada correctamente")
+    assert unique_week_ok, "Se esperaba violación de UNIQUE en (records.user_id, week_key) y no ocurrió"
+
     # Limpieza posterior de datos de prueba
     _cleanup_test_data(cursor)
     conn.commit()
 
 
+def _verify_users_fts(conn: sqlite3.Connection) -> None:
+    """
+    Verifica el índice FTS5 users_fts contra la tabla users (integrity-check con rank=1).
+    Lanza sqlite3.DatabaseError si el índice está desincronizado.
+    """
+    if not users_fts_exists(conn):
+        logger.warning("users_fts no existe (SQLite sin FTS5): la búsqueda usa LIKE")
+        return
+    conn.execute("INSERT INTO users_fts(users_fts, rank) VALUES ('integrity-check', 1)")
+    logger.info("Índice users_fts verificado contra users")
+
+
 def main() -> None:
     logger.info("Inicializando verificación de esquema de base de datos")
 
@@ -122,6 +151,10 @@ def main() -> None:
             logger.info("PRAGMA foreign_keys=%s", fk)
             _verify_tables_exist(cursor)
             logger.info("Existencia de tablas verificada")
+            version = current_version()
+            assert version == LATEST_VERSION, f"Esquema en versión {version}, se esperaba {LATEST_VERSION}"
+            logger.info("Versión de esquema verificada: %s", version)
+            _verify_users_fts(conn)
             _verify_unique_constraints(conn)
             logger.info("Restricciones UNIQUE verificadas")
     except AssertionError as ae:
@@ -0,0 +1,63 @@
+"""Detecta (y opcionalmente elimina) semanas con más de un registro por empleado.
+
+Bases anteriores a la migración 1 podían guardar dos días remotos del mismo
+empleado en una semana; esa migración se niega a correr mientras existan y la
+app arranca avisando del error.
+
+Hace:
+- Lista, por empleado y semana repetida, el registro que se conserva (el de fecha
+  más reciente) y los que sobran
+- Con --repair elimina los sobrantes en una transacción y aplica las migraciones
+  pendientes (create_tables)
+
+Uso:
+    python scripts/db/duplicate_weeks.py [--repair]
+"""
+
+# Permitir importar módulos del proyecto al ejecutar este script directamente
+from pathlib import Path
+import sys
+ROOT_DIR = Path(__file__).resolve().parents[2]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+import argparse
+from logger_config import logger
+from data.schema import create_tables, delete_duplicate_week_records, duplicate_week_records
+from data.db_utils import get_connection, transaction
+from data.migrations import LATEST_VERSION, current_version
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Detecta/elimina semanas repetidas por empleado")
+    parser.add_argument("--repair", action="store_true", help="elimina los registros sobrantes y migra la base")
+    args = parser.parse_args()
+
+    with get_connection() as conn:
+        duplicates = duplicate_week_records(conn)
+        names = dict(conn.execute("SELECT id, name FROM users").fetchall())
+
+    if not duplicates:
+        logger.info("No hay semanas con más de un registro por empleado")
+    else:
+        for rec_id, user_id, day in duplicates:
+            logger.warning(
+                "Sobra registro id=%s empleado=%s (%s) fecha=%s",
+                rec_id, user_id, names.get(user_id, "?"), day,
+            )
+        logger.warning("%s registros sobrantes", len(duplicates))
+        if not args.repair:
+            logger.warning("Ejecuta con --repair para eliminarlos (se conserva el más reciente de cada semana)")
+            sys.exit(1)
+        with transaction() as conn:
+            deleted = delete_duplicate_week_records(conn)
+        logger.info("Registros eliminados: %s", deleted)
+
+    create_tables()
+    version = current_version()
+    assert version >= LATEST_VERSION, f"La base quedó en la versión {version} (se esperaba {LATEST_VERSION})"
+    logger.info("Esquema en versión %s", version)
+
+
+if __name__ == "__main__":
+    main()
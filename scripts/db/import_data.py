@@ -0,0 +1,54 @@
+"""Importa nómina o historial de días remotos desde Excel (.xlsx) o CSV.
+
+Columnas (primera fila = encabezado, sin distinguir mayúsculas):
+- roster:  Nombre, Legajo
+- history: Legajo, Fecha (YYYY-MM-DD o DD/MM/YYYY)
+
+Uso:
+    python scripts/db/import_data.py roster empleados.xlsx
+    python scripts/db/import_data.py history historial.csv [--batch-size 5000]
+"""
+
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+import sys
+
+# Habilitar imports del proyecto (raíz del repo)
+ROOT_DIR = Path(__file__).resolve().parents[2]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from data.schema import create_tables
+from services.import_service import DEFAULT_BATCH_SIZE, ImportProgress, ImportService
+
+
+def _print_progress(p: ImportProgress) -> None:
+    total = f"/{p.total_rows}" if p.total_rows else ""
+    print(f"\rfilas {p.rows_read}{total}  importadas {p.imported}  rechazadas {p.rejected}", end="", flush=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Importa nómina o historial desde Excel/CSV")
+    parser.add_argument("kind", choices=("roster", "history"))
+    parser.add_argument("path", type=Path)
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--max-rejects", type=int, default=50, help="rechazos a listar (0 = todos)")
+    args = parser.parse_args()
+
+    create_tables()
+    # El servicio solo guarda el detalle de los rechazos que se van a listar
+    service = ImportService(batch_size=args.batch_size, max_rejects=args.max_rejects or None)
+    run = service.import_roster if args.kind == "roster" else service.import_history
+    report = run(args.path, _print_progress)
+    print()
+    print(f"Leídas: {report.rows_read}  Importadas: {report.imported}  Rechazadas: {report.rejected}")
+    for reject in report.rejects:
+        print(f"  fila {reject.row}: {reject.reason}")
+    if len(report.rejects) < report.rejected:
+        print(f"  ... y {report.rejected - len(report.rejects)} más")
+
+
+if __name__ == "__main__":
+    main()
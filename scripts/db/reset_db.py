@@ -17,10 +17,13 @@ if str(ROOT_DIR) not in sys.path:
 
 from config import DB_PATH
 from data.schema import create_tables
+from data.db_utils import close_all_connections
 
 
 def main() -> None:
     db_path = Path(DB_PATH)
+    # Liberar conexiones abiertas antes de borrar el archivo (necesario en Windows)
+    close_all_connections()
     if db_path.exists():
         try:
             os.remove(db_path)
@@ -30,6 +33,11 @@ def main() -> None:
             raise
     else:
         print(f"DB no existía: {db_path}")
+    # Restos de modo WAL, si la última conexión no llegó a limpiarlos
+    for suffix in ("-wal", "-shm"):
+        side = db_path.with_name(db_path.name + suffix)
+        if side.exists():
+            os.remove(side)
 
     # Recrear esquema en DB nueva
     create_tables()
@@ -51,26 +51,24 @@ def ensure_clean_prefix(prefix: str = "EMP-") -> None:
 def main() -> None:
     ensure_clean_prefix()
 
-    # Crear 10 empleados EMP-01..EMP-10
-    user_ids: list[int] = []
-    for i in range(1, 11):
-        name = f"Empleado {i:02d}"
-        docket = f"EMP-{i:02d}"
-        uid = UserRepository.create(name, docket)
-        assert uid is not None
-        user_ids.append(int(uid))
+    # Crear 10 empleados EMP-01..EMP-10 (una sola transacción)
+    users = UserRepository.create_many((f"Empleado {i:02d}", f"EMP-{i:02d}") for i in range(1, 11))
+    assert not users.rejected, users.rejected
+    user_ids: list[int] = [int(uid) for uid in users.ids]
 
+    records: list[tuple[int, str, str]] = []
     # E01..E05 => semana pasada (weeks_ago=1)
     for idx, uid in enumerate(user_ids[:5], start=0):
         weekday_num = WEEKDAYS[idx % len(WEEKDAYS)]
         d = date_for_week_and_weekday(1, weekday_num)
-        RecordRespository.create_record(uid, d.isoformat(), WEEKDAY_NAME[weekday_num])
+        records.append((uid, d.isoformat(), WEEKDAY_NAME[weekday_num]))
 
     # E06..E10 => hace dos semanas (weeks_ago=2)
     for idx, uid in enumerate(user_ids[5:], start=0):
         weekday_num = WEEKDAYS[idx % len(WEEKDAYS)]
         d = date_for_week_and_weekday(2, weekday_num)
-        RecordRespository.create_record(uid, d.isoformat(), WEEKDAY_NAME[weekday_num])
+        records.append((uid, d.isoformat(), WEEKDAY_NAME[weekday_num]))
+    RecordRespository.create_many(records)
 
     print("Seed completado: 5 con semana pasada, 5 con hace dos semanas. Semana actual sin registros.")
 
@@ -0,0 +1,93 @@
+"""Administra equipos (anidables) y muestra su estado de la semana actual.
+
+Hace:
+- list: árbol de equipos con miembros, registrados, pendientes y reparto por día
+- add NOMBRE [--parent NOMBRE]: crea un equipo (o subequipo)
+- rename NOMBRE NUEVO: renombra un equipo
+- delete NOMBRE: elimina un equipo sin subequipos (sus miembros quedan sin equipo)
+- assign NOMBRE LEGAJO...: mueve empleados (por legajo) al equipo; NOMBRE "-" los deja sin equipo
+
+Uso:
+    python scripts/db/teams.py list
+    python scripts/db/teams.py add Norte --parent Ventas
+    python scripts/db/teams.py assign Norte L-00012 L-00013
+"""
+
+# Permitir importar módulos del proyecto al ejecutar este script directamente
+from pathlib import Path
+import sys
+ROOT_DIR = Path(__file__).resolve().parents[2]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+import argparse
+from logger_config import logger
+from data.schema import create_tables
+from exceptions import AppError
+from services.team_service import TeamService
+from services.user_service import UserService
+
+
+def _team_id(service: TeamService, name: str) -> int:
+    for team in service.list_teams():
+        if team.name == name:
+            return int(team.id)
+    raise AppError(f"No existe el equipo '{name}'.")
+
+
+def _list(service: TeamService) -> None:
+    stats = service.week_stats()
+    for team, depth in service.team_tree():
+        st = stats[team.id]
+        days = " ".join(f"{day[:2]}={count}" for day, count in st.by_day.items())
+        print(f"{'  ' * depth}{team.name:<{30 - 2 * depth}} miembros={st.members:<6} "
+              f"registrados={st.registered:<6} pendientes={st.pending:<6} {days}")
+    st = stats[None]
+    print(f"{'(sin equipo)':<30} miembros={st.members:<6} registrados={st.registered:<6} pendientes={st.pending}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Equipos y su estado semanal")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("list", help="árbol de equipos con su estado de la semana")
+    p_add = sub.add_parser("add", help="crea un equipo")
+    p_add.add_argument("name")
+    p_add.add_argument("--parent", help="equipo superior")
+    p_rename = sub.add_parser("rename", help="renombra un equipo")
+    p_rename.add_argument("name")
+    p_rename.add_argument("new_name")
+    p_delete = sub.add_parser("delete", help="elimina un equipo sin subequipos")
+    p_delete.add_argument("name")
+    p_assign = sub.add_parser("assign", help="mueve empleados (por legajo) a un equipo")
+    p_assign.add_argument("name", help='equipo destino ("-" = sin equipo)')
+    p_assign.add_argument("dockets", nargs="+")
+    args = parser.parse_args()
+
+    create_tables()
+    service = TeamService()
+    try:
+        if args.command == "list":
+            _list(service)
+        elif args.command == "add":
+            parent_id = _team_id(service, args.parent) if args.parent else None
+            team = service.create_team(args.name, parent_id)
+            logger.info("Equipo creado id=%s name=%s", team.id, team.name)
+        elif args.command == "rename":
+            service.rename_team(_team_id(service, args.name), args.new_name)
+        elif args.command == "delete":
+            service.delete_team(_team_id(service, args.name))
+        else:
+            team_id = None if args.name == "-" else _team_id(service, args.name)
+            by_docket = {u.docket: u.id for u in UserService().list_users()}
+            missing = [d for d in args.dockets if d not in by_docket]
+            if missing:
+                logger.warning("Legajos inexistentes: %s", ", ".join(missing))
+            moved = service.assign_members((by_docket[d] for d in args.dockets if d in by_docket), team_id)
+            logger.info("Empleados movidos: %s", moved)
+    except AppError as e:
+        logger.error("%s", e)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
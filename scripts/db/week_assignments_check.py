@@ -0,0 +1,73 @@
+"""Verifica (y opcionalmente repara) la tabla materializada week_assignments.
+
+Hace:
+- Aplica migraciones pendientes (create_tables)
+- Compara week_assignments contra records (filas faltantes y sobrantes)
+- Verifica que existan los triggers de sincronización
+- Con --repair reconstruye la tabla desde records en una transacción
+
+Uso:
+    python scripts/db/week_assignments_check.py [--repair]
+"""
+
+# Permitir importar módulos del proyecto al ejecutar este script directamente
+from pathlib import Path
+import sys
+ROOT_DIR = Path(__file__).resolve().parents[2]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+import argparse
+import sqlite3
+from logger_config import logger
+from data.schema import create_tables, rebuild_week_assignments, week_assignments_drift
+from data.db_utils import get_connection, transaction
+
+_TRIGGERS = {"trg_records_week_ai", "trg_records_week_au", "trg_records_week_ad"}
+
+
+def _verify_triggers(cursor: sqlite3.Cursor) -> None:
+    """
+    Verifica que los triggers que mantienen week_assignments existan.
+    Lanza AssertionError si falta alguno.
+    """
+    cursor.execute("SELECT name FROM sqlite_master WHERE type='trigger' AND tbl_name='records'")
+    names = {row[0] for row in cursor.fetchall()}
+    assert _TRIGGERS <= names, f"Triggers faltantes: {_TRIGGERS - names}"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Verifica/repara week_assignments")
+    parser.add_argument("--repair", action="store_true", help="reconstruye la tabla si hay diferencias")
+    args = parser.parse_args()
+
+    logger.info("Verificando week_assignments")
+    create_tables()
+
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        _verify_triggers(cursor)
+        logger.info("Triggers de week_assignments verificados")
+        missing, extra = week_assignments_drift(conn)
+
+    if not missing and not extra:
+        logger.info("week_assignments consistente con records")
+        return
+
+    logger.warning("week_assignments desincronizada: faltantes=%s sobrantes=%s", missing, extra)
+    if not args.repair:
+        logger.warning("Ejecuta con --repair para reconstruirla")
+        sys.exit(1)
+
+    with transaction() as conn:
+        rows = rebuild_week_assignments(conn)
+    logger.info("week_assignments reconstruida: %s filas", rows)
+
+    with get_connection() as conn:
+        missing, extra = week_assignments_drift(conn)
+    assert not missing and not extra, f"Persisten diferencias: faltantes={missing} sobrantes={extra}"
+    logger.info("Reparación verificada")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,29 +1,50 @@
 """Servicio de asignaciones: reglas de negocio para días remotos.
 
 Responsabilidades principales:
-- Determinar los límites de semana ISO (lunes..domingo)
+- Determinar los límites de semana ISO (lunes..domingo) y su clave `week_key`
 - Validar reglas de negocio antes de crear o cambiar un registro
 - Orquestar acceso a repositorios sin exponer detalles SQL a la UI
+
+Las operaciones de escritura (`assign_day`, `change_week_assignment`,
+`delete_user_and_records`) corren validaciones y escritura en una única unidad de
+trabajo (`data.db_utils.transaction`): una conexión y un `BEGIN IMMEDIATE`.
+`validate_many` / `assign_many` aplican las mismas reglas a un lote de pedidos con
+una consulta para todos los empleados y, al asignar, una sola transacción.
 """
 
 import logging
+from dataclasses import replace
 from datetime import date, datetime, timedelta
-from typing import List, Optional, Tuple
-import logging
+from functools import partial
+from typing import TYPE_CHECKING, Collection, Iterable, List, Optional, Tuple
 
+from config import PLANNING_WEEKS
+from data.db_utils import transaction
+from data.schema import week_key
 from data.user_repo import  UserRepository
 from data.assignament_repo import RecordRespository
+from data.capacity_repo import CapacityRepository
 
 from models.record import Record
+from models.summary import EmployeeSummary
+from models.week_matrix import WeekMatrixRow
+from models.week_status import WeekStatus
+from models.capacity import DayCapacity
+from models.batch import AssignmentCheck, BatchResult
 from models.user import User
 from exceptions import (
     AppError,
+    CupoDiarioCompleto,
     DiaNoPermitido,
     YaRegistradoEstaSemana,
     NoHayRegistroEstaSemana,
     FechaFueraDeSemanaActual,
+    RegistroDuplicado,
 )
 
+if TYPE_CHECKING:
+    from services.planner import HorizonPlan, WeekPlan
+
 logger = logging.getLogger(__name__)
 
 
@@ -37,6 +58,15 @@ _WEEKDAY_MAP = {
     6: "Domingo",
 }
 
+# Lunes (0), Sábado (5) y Domingo (6) no se pueden registrar como día remoto
+_DISALLOWED_WEEKDAYS = (0, 5, 6)
+
+
+def validate_day_allowed(d: date) -> None:
+    """Lanza DiaNoPermitido si `d` cae Lunes o fin de semana (regla compartida con importaciones)."""
+    if d.weekday() in _DISALLOWED_WEEKDAYS:
+        raise DiaNoPermitido("No se permite registrar Lunes ni fines de semana.")
+
 
 def _parse_iso(d: str) -> date:
     return datetime.strptime(d, "%Y-%m-%d").date()
@@ -49,24 +79,59 @@ def _week_bounds(d: date) -> Tuple[str, str]:
     return start.isoformat(), end.isoformat()
 
 
+def _capacity_error(d: date, limit: int) -> CupoDiarioCompleto:
+    return CupoDiarioCompleto(
+        f"El {_WEEKDAY_MAP[d.weekday()]} {d.strftime('%d/%m')} alcanzó el cupo de {limit} personas remotas."
+    )
+
+
 class AsignacionService:
    
-    def __init__(self, record_repo: RecordRespository | None = None, user_repo: UserRepository | None = None) -> None:
+    def __init__(
+        self,
+        record_repo: RecordRespository | None = None,
+        user_repo: UserRepository | None = None,
+        capacity_repo: CapacityRepository | None = None,
+        planning_weeks: int = PLANNING_WEEKS,
+    ) -> None:
         self._records = record_repo or RecordRespository
         self._users = user_repo or UserRepository
+        self._capacity = capacity_repo or CapacityRepository
+        # Semanas futuras que admiten registros; las pasadas son de solo lectura
+        self._planning_weeks = max(0, planning_weeks)
 
     def is_registered_this_week(self, user_id: int, ref_date: Optional[date] = None) -> bool:
         """True si el usuario tiene un registro en la semana de `ref_date` (por defecto hoy)."""
         ref = ref_date or date.today()
-        start_iso, end_iso = _week_bounds(ref)
-        logger.debug("Esta registrado esta semana user_id=%s start=%s end=%s", user_id, start_iso, end_iso)
-        return self._records.exists_in_week(user_id, start_iso, end_iso)
+        wk = week_key(ref)
+        logger.debug("Esta registrado esta semana user_id=%s week_key=%s", user_id, wk)
+        return self._records.exists_in_week(user_id, wk)
 
     def latest_for_user(self, user_id: int) -> Optional[Record]:
         """Último registro del usuario o None."""
         row = self._records.get_latest_record(user_id)
         return Record.from_row(row) if row else None
 
+    def employee_summary(self, user_id: int, ref_date: Optional[date] = None) -> Optional[EmployeeSummary]:
+        """Usuario y registros de la semana de `ref_date`, la anterior y el último, en una consulta.
+
+        Devuelve None si el usuario no existe.
+        """
+        ref = ref_date or date.today()
+        row = self._records.get_employee_summary(user_id, week_key(ref))
+        return EmployeeSummary.from_row(row) if row else None
+
+    def employee_summaries(self, user_ids: List[int], ref_date: Optional[date] = None) -> dict[int, EmployeeSummary]:
+        """Resúmenes de varios empleados en una consulta: {user_id: EmployeeSummary} (omite inexistentes)."""
+        ref = ref_date or date.today()
+        rows = self._records.get_employee_summaries(user_ids, week_key(ref))
+        return {summary.user_id: summary for summary in map(EmployeeSummary.from_row, rows)}
+
+    def week_matrix(self, ref_date: Optional[date] = None) -> List[WeekMatrixRow]:
+        """Toda la nómina (por nombre) con su registro de la semana de `ref_date`, en una consulta."""
+        ref = ref_date or date.today()
+        return [WeekMatrixRow.from_row(row) for row in self._records.week_matrix(week_key(ref))]
+
     def list_by_user(self, user_id: int) -> List[Record]:
         """Lista registros del usuario como modelos Record (ordenados por fecha desc)."""
         rows = self._records.list_by_user(user_id)
@@ -76,42 +141,49 @@ class AsignacionService:
     # === Validaciones separadas ===
     def _validate_day_allowed(self, d: date) -> None:
         """No se permite Lunes (0) ni Sábado (5) ni Domingo (6)."""
-        weekday = d.weekday()
-        if weekday in (0, 5, 6):
-            raise DiaNoPermitido("No se permite registrar Lunes ni fines de semana.")
+        validate_day_allowed(d)
 
-    def _validate_in_current_week(self, d: date, now: Optional[date] = None) -> None:
-        """La fecha debe pertenecer a la semana actual del sistema.
+    def _validate_in_editable_weeks(self, d: date, now: Optional[date] = None) -> None:
+        """La fecha debe caer en la semana actual o en una de las `planning_weeks` siguientes.
 
-        Evita que la UI envíe fechas de otras semanas por error.
+        Las semanas pasadas son de solo lectura; evita que la UI envíe fechas fuera de rango.
         """
-        today = now or date.today()
-        cur_start, cur_end = _week_bounds(today)
-        if not (cur_start <= d.isoformat() <= cur_end):
+        if self.is_week_editable(d, now):
+            return
+        if week_key(d) < week_key(now or date.today()):
+            raise FechaFueraDeSemanaActual("Las semanas pasadas son de solo lectura.")
+        if not self._planning_weeks:
             raise FechaFueraDeSemanaActual("La fecha no pertenece a la semana actual.")
+        raise FechaFueraDeSemanaActual(
+            f"Solo se puede registrar hasta {self._planning_weeks} semanas después de la actual."
+        )
 
-    def _validate_not_same_weekday_as_prev_week(self, user_id: int, d: date) -> None:
-        """No repetir el mismo día que la semana anterior para el mismo usuario."""
+    def is_week_editable(self, ref_date: date, now: Optional[date] = None) -> bool:
+        """True si la semana de `ref_date` admite registros (la actual o una planificable)."""
+        current = week_key(now or date.today())
+        return current <= week_key(ref_date) <= current + self._planning_weeks
+
+    def _validate_not_same_weekday_as_adjacent_weeks(self, user_id: int, d: date) -> None:
+        """No repetir el mismo día que la semana anterior ni que la siguiente (ya planificada)."""
         week_day = _WEEKDAY_MAP[d.weekday()]
-        prev_week_day = d - timedelta(days=7)
-        prev_start, prev_end = _week_bounds(prev_week_day)
-        prev = self._records.get_record_in_week(user_id, prev_start, prev_end)
-        if prev is not None:
-            _prev_id, _prev_date, prev_week_day_name = prev
-            if prev_week_day_name == week_day:
+        wk = week_key(d)
+        for other_wk, label in ((wk - 1, "anterior"), (wk + 1, "siguiente")):
+            other = self._records.get_record_in_week(user_id, other_wk)
+            if other is None:
+                continue
+            _other_id, _other_date, other_week_day_name = other
+            if other_week_day_name == week_day:
                 logger.debug(
-                    "Regla violada user_id=%s date=%s week_day=%s prev_week=(%s..%s) prev_day=%s",
-                    user_id, d.isoformat(), week_day, prev_start, prev_end, prev_week_day_name,
+                    "Regla violada user_id=%s date=%s week_day=%s week_key=%s day=%s",
+                    user_id, d.isoformat(), week_day, other_wk, other_week_day_name,
                 )
-                raise AppError("No puede repetir el mismo día que la semana anterior.")
+                raise AppError(f"No puede repetir el mismo día que la semana {label}.")
 
     def is_same_weekday_as_prev_week(self, user_id: int, date_iso: str) -> bool:
         """True si la fecha cae en el mismo día de semana que el registro de la semana anterior."""
         d = _parse_iso(date_iso)
         week_day = _WEEKDAY_MAP[d.weekday()]
-        prev_week_day = d - timedelta(days=7)
-        prev_start, prev_end = _week_bounds(prev_week_day)
-        prev = self._records.get_record_in_week(user_id, prev_start, prev_end)
+        prev = self._records.get_record_in_week(user_id, week_key(d) - 1)
         if prev is None:
             return False
         _prev_id, _prev_date, prev_week_day_name = prev
@@ -120,45 +192,105 @@ class AsignacionService:
     def prev_week_record(self, user_id: int, date_iso: str) -> Optional[Record]:
         """Devuelve el registro de la semana anterior respecto a `date_iso`, si existe."""
         d = _parse_iso(date_iso)
-        prev_ref = d - timedelta(days=7)
-        start_iso, end_iso = _week_bounds(prev_ref)
-        row = self._records.get_record_in_week(user_id, start_iso, end_iso)
+        row = self._records.get_record_in_week(user_id, week_key(d) - 1)
         return Record.from_row(row) if row else None
 
     def _ensure_not_registered_this_week(self, user_id: int, ref_date: Optional[date] = None) -> None:
-        """Valida que el usuario no posea ya un registro en la semana actual."""
-        if self.is_registered_this_week(user_id, ref_date):
+        """Valida que el usuario no posea ya un registro en la semana de `ref_date`."""
+        ref = ref_date or date.today()
+        if self._records.exists_in_week(user_id, week_key(ref)):
             raise YaRegistradoEstaSemana("El empleado ya tiene un registro esta semana.")
 
+    def _ensure_day_capacity(self, d: date) -> None:
+        """Valida que la fecha no haya alcanzado el cupo de remotos de su día de semana.
+
+        Lee el contador `day_counts` (una búsqueda por clave) dentro de la transacción.
+        """
+        limit = self._capacity.get_limit(d.weekday())
+        if limit is None:
+            return
+        if self._capacity.remote_count(d.isoformat()) >= limit:
+            raise _capacity_error(d, limit)
+
+    # === Cupos por día ===
+    def week_status(self, ref_date: Optional[date] = None) -> WeekStatus:
+        """Registrados y ocupación por día de la semana de `ref_date`, y si admite registros."""
+        ref = ref_date or date.today()
+        start = ref - timedelta(days=ref.weekday())
+        return WeekStatus(
+            week_start=start,
+            registered=frozenset(self._records.registered_user_ids_in_week(week_key(start))),
+            capacity=self.week_capacity(start),
+            editable=self.is_week_editable(start),
+        )
+
+    def day_capacity_limits(self) -> dict[str, int]:
+        """Cupos configurados: {nombre de día: máximo de remotos}."""
+        return {_WEEKDAY_MAP[wd]: limit for wd, limit in sorted(self._capacity.get_limits().items())}
+
+    def set_day_capacity(self, week_day: str, max_remote: Optional[int]) -> None:
+        """Configura el cupo de remotos de un día de semana ("Martes", ...); None lo quita."""
+        weekday = next((wd for wd, name in _WEEKDAY_MAP.items() if name == week_day), None)
+        if weekday is None or weekday in _DISALLOWED_WEEKDAYS:
+            raise DiaNoPermitido(f"No se puede configurar cupo para '{week_day}'.")
+        if max_remote is not None and max_remote < 0:
+            raise AppError("El cupo no puede ser negativo.")
+        self._capacity.set_limit(weekday, max_remote)
+
+    def week_capacity(self, ref_date: Optional[date] = None) -> dict[str, DayCapacity]:
+        """Ocupación y cupo de cada día de la semana de `ref_date`: {fecha ISO: DayCapacity}."""
+        ref = ref_date or date.today()
+        start_iso, end_iso = _week_bounds(ref)
+        start = date.fromisoformat(start_iso)
+        limits = self._capacity.get_limits()
+        counts = self._capacity.remote_counts(start_iso, end_iso)
+        out = {}
+        for offset in range(7):
+            day_iso = (start + timedelta(days=offset)).isoformat()
+            out[day_iso] = DayCapacity(day_iso, counts.get(day_iso, 0), limits.get(offset))
+        return out
+
     # === Operaciones principales ===
     def assign_day(self, user_id: int, date_iso: str, allow_repeat_prev_week: bool = False) -> Record:
-        """Asigna fecha aplicando todas las validaciones de negocio."""
-        urow = self._users.get_by_id(user_id)
-        if not urow:
-            raise AppError("El usuario no existe.")
+        """Asigna fecha aplicando todas las validaciones de negocio.
 
+        Validación y alta ocurren en una sola transacción: otro supervisor no puede
+        registrar al mismo empleado entre el chequeo y el INSERT.
+        """
         d = _parse_iso(date_iso)
-        self._validate_in_current_week(d)
+        self._validate_in_editable_weeks(d)
         self._validate_day_allowed(d)
-        self._ensure_not_registered_this_week(user_id, d)
-        if not allow_repeat_prev_week:
-            self._validate_not_same_weekday_as_prev_week(user_id, d)
-
         week_day = _WEEKDAY_MAP[d.weekday()]
-        logger.debug("Creando registro user_id=%s fecha=%s dia=%s", user_id, date_iso, week_day)
-        rec_id = self._records.create_record(user_id, date_iso, week_day)
+
+        with transaction():
+            urow = self._users.get_by_id(user_id)
+            if not urow:
+                raise AppError("El usuario no existe.")
+            self._ensure_not_registered_this_week(user_id, d)
+            if not allow_repeat_prev_week:
+                self._validate_not_same_weekday_as_adjacent_weeks(user_id, d)
+            self._ensure_day_capacity(d)
+
+            logger.debug("Creando registro user_id=%s fecha=%s dia=%s", user_id, date_iso, week_day)
+            rec_id = self._records.create_record(user_id, date_iso, week_day)
         logger.info("Registro creado id=%s user_id=%s date=%s day=%s", rec_id, user_id, date_iso, week_day)
         return Record(id=rec_id, user_id=user_id, date=date_iso, week_day=week_day)
 
     def users_week_status(self, users: List[User], ref_date: Optional[date] = None) -> List[tuple[User, bool]]:
         """Devuelve [(User, registrado_esta_semana)] para pintar en la UI."""
         ref = ref_date or date.today()
-        start_iso, end_iso = _week_bounds(ref)
-        result: List[tuple[User, bool]] = []
-        for u in users:
-            flag = self._records.exists_in_week(u.id, start_iso, end_iso) if u.id is not None else False
-            result.append((u, flag))
-        return result
+        # Una sola consulta indexada por week_key para toda la nómina (evita N+1)
+        registered = self._records.registered_user_ids_in_week(week_key(ref))
+        return [(u, u.id is not None and u.id in registered) for u in users]
+
+    def week_records_by_user(self, ref_date: Optional[date] = None) -> dict[int, Record]:
+        """Devuelve {user_id: Record} con el registro de la semana de `ref_date` de cada usuario."""
+        ref = ref_date or date.today()
+        rows = self._records.records_in_week(week_key(ref))
+        return {
+            uid: Record(id=rec_id, user_id=uid, date=d, week_day=wd)
+            for uid, (rec_id, d, wd) in rows.items()
+        }
 
     def current_week_record(self, user_id: int, ref_date: Optional[date] = None) -> Optional[Record]:
         """Devuelve el Record de la semana actual para `user_id`, o None si no hay.
@@ -166,50 +298,175 @@ class AsignacionService:
         Útil para que la UI pueda resaltar el día ya registrado en la semana.
         """
         ref = ref_date or date.today()
-        start_iso, end_iso = _week_bounds(ref)
-        row = self._records.get_record_in_week(user_id, start_iso, end_iso)
+        row = self._records.get_record_in_week(user_id, week_key(ref))
         return Record.from_row(row) if row else None
 
     def change_week_assignment(self, user_id: int, date_iso: str, allow_repeat_prev_week: bool = False) -> Record:
-        """Cambia el registro existente de la semana actual a una nueva fecha válida."""
-        urow = self._users.get_by_id(user_id)
-        if not urow:
-            raise AppError("El usuario no existe.")
-
+        """Cambia el registro de la semana de `date_iso` a esa nueva fecha válida (en una transacción)."""
         d = _parse_iso(date_iso)
-        self._validate_in_current_week(d)
+        self._validate_in_editable_weeks(d)
         self._validate_day_allowed(d)
-        if not allow_repeat_prev_week:
-            self._validate_not_same_weekday_as_prev_week(user_id, d)
-
-        # Buscar el registro actual de la semana
-        start_iso, end_iso = _week_bounds(d)
-        current = self._records.get_record_in_week(user_id, start_iso, end_iso)
-        if current is None:
-            raise NoHayRegistroEstaSemana("No hay registro esta semana para cambiar.")
-
-        rec_id, _cur_date, _cur_day = current
         week_day = _WEEKDAY_MAP[d.weekday()]
-        self._records.update_record_date_and_day(rec_id, date_iso, week_day)
+        wk = week_key(d)
+
+        with transaction():
+            urow = self._users.get_by_id(user_id)
+            if not urow:
+                raise AppError("El usuario no existe.")
+            if not allow_repeat_prev_week:
+                self._validate_not_same_weekday_as_adjacent_weeks(user_id, d)
+
+            # Buscar el registro actual de la semana
+            current = self._records.get_record_in_week(user_id, wk)
+            if current is None:
+                raise NoHayRegistroEstaSemana("No hay registro esta semana para cambiar.")
+
+            rec_id, cur_date, _cur_day = current
+            if cur_date != date_iso:
+                self._ensure_day_capacity(d)
+            self._records.update_record_date_and_day(rec_id, date_iso, week_day)
         logger.info("Registro cambiado id=%s user_id=%s nueva_fecha=%s nuevo_dia=%s", rec_id, user_id, date_iso, week_day)
         return Record(id=rec_id, user_id=user_id, date=date_iso, week_day=week_day)
 
+    # === Operaciones por lote ===
+    def validate_many(
+        self,
+        items: Iterable[Tuple[int, str]],
+        allow_repeat: Collection[int] = (),
+        now: Optional[date] = None,
+    ) -> BatchResult:
+        """Valida pedidos (user_id, fecha ISO) con las reglas de `assign_day`, sin escribir.
+
+        `allow_repeat` son los user_id autorizados a repetir el día de la semana
+        anterior o de la siguiente; los demás que lo repiten quedan en `needs_override`.
+        """
+        return BatchResult(self._check_many(list(items), set(allow_repeat), now))
+
+    def assign_many(
+        self,
+        items: Iterable[Tuple[int, str]],
+        allow_repeat: Collection[int] = (),
+        now: Optional[date] = None,
+    ) -> BatchResult:
+        """Valida y registra los pedidos aceptados en una sola transacción.
+
+        Los rechazados y los que necesitan autorización no se escriben; se informan
+        en el resultado junto con los Record creados.
+        """
+        items = list(items)
+        with transaction():
+            checks = self._check_many(items, set(allow_repeat), now)
+            accepted = [c for c in checks if c.accepted]
+            result = self._records.create_many((c.user_id, c.date, c.week_day) for c in accepted)
+        # Bajo BEGIN IMMEDIATE no debería haber rechazos; si los hay, se informan por pedido
+        for i, reason in result.rejected:
+            check = accepted[i]
+            checks[check.index] = replace(check, error=RegistroDuplicado(reason))
+        records = [
+            Record(id=rec_id, user_id=c.user_id, date=c.date, week_day=c.week_day)
+            for c, rec_id in zip(accepted, result.ids)
+            if rec_id is not None
+        ]
+        logger.info("Asignación por lote: %s pedidos, %s registros creados", len(items), len(records))
+        return BatchResult(checks, records)
+
+    def _check_many(
+        self, items: List[Tuple[int, str]], allow_repeat: set[int], now: Optional[date]
+    ) -> List[AssignmentCheck]:
+        """Reglas de `assign_day` para cada pedido, con una lectura del estado de todos.
+
+        Se consulta una vez por semana pedida (normalmente una sola). Los pedidos
+        aceptados ocupan cupo y registran al empleado en su semana, así un mismo lote
+        no puede exceder un cupo, asignar dos veces a alguien ni repetir el día de una
+        semana contigua planificada en el mismo lote.
+        """
+        today = now or date.today()
+        dates: List[Optional[date]] = []
+        for _user_id, date_iso in items:
+            try:
+                dates.append(_parse_iso(date_iso))
+            except (TypeError, ValueError):
+                dates.append(None)
+        editable = [d for d in dates if d is not None and self.is_week_editable(d, today)]
+        user_ids = [uid for uid, _ in items]
+        status = {wk: self._records.week_status_for_users(user_ids, wk) for wk in {week_key(d) for d in editable}}
+        limits = self._capacity.get_limits()
+        counts = {}
+        if limits and editable:
+            counts = self._capacity.remote_counts(_week_bounds(min(editable))[0], _week_bounds(max(editable))[1])
+        assigned: dict[tuple[int, int], str] = {}  # (user_id, week_key) -> día aceptado en el lote
+        checks: List[AssignmentCheck] = []
+        for index, ((user_id, date_iso), d) in enumerate(zip(items, dates)):
+            if d is None:
+                checks.append(AssignmentCheck(index, user_id, date_iso, None, AppError("Fecha inválida.")))
+                continue
+            date_iso = d.isoformat()
+            week_day = _WEEKDAY_MAP[d.weekday()]
+            wk = week_key(d)
+            check = partial(AssignmentCheck, index, user_id, date_iso, week_day)
+            try:
+                self._validate_in_editable_weeks(d, today)
+                self._validate_day_allowed(d)
+                if user_id not in status[wk]:
+                    raise AppError("El usuario no existe.")
+                cur_date, prev_day, next_day = status[wk][user_id]
+                if cur_date is not None:
+                    raise YaRegistradoEstaSemana("El empleado ya tiene un registro esa semana.")
+                if (user_id, wk) in assigned:
+                    raise YaRegistradoEstaSemana("El empleado ya tiene otro pedido aceptado en el lote.")
+            except AppError as e:
+                checks.append(check(error=e))
+                continue
+
+            prev_day = assigned.get((user_id, wk - 1), prev_day)
+            next_day = assigned.get((user_id, wk + 1), next_day)
+            repeats = week_day in (prev_day, next_day)
+            override = repeats and user_id in allow_repeat
+            if repeats and not override:
+                checks.append(check(repeats_adjacent_week=True))
+                continue
+            limit = limits.get(d.weekday())
+            if limit is not None and counts.get(date_iso, 0) >= limit:
+                checks.append(check(error=_capacity_error(d, limit), repeats_adjacent_week=repeats, override=override))
+                continue
+            counts[date_iso] = counts.get(date_iso, 0) + 1
+            assigned[(user_id, wk)] = week_day
+            checks.append(check(repeats_adjacent_week=repeats, override=override))
+        return checks
+
     # Compatibilidad: método previo usado en algunos puntos
     def validate_repeat_week_day(self, user_id: int, date_iso: str) -> None:
         d = _parse_iso(date_iso)
-        self._validate_not_same_weekday_as_prev_week(user_id, d)
+        self._validate_not_same_weekday_as_adjacent_weeks(user_id, d)
 
     def delete_all_records_by_user(self, user_id: int) -> None:
         """Elimina todos los registros de un usuario."""
         logger.debug("Eliminando todos los registros para user_id=%s", user_id)
         # Primero registros, luego usuario (respeta claves foráneas)
-        self._records.delete_all_records_by_user(user_id)
-        self._users.delete_user(user_id)
+        with transaction():
+            self._records.delete_all_records_by_user(user_id)
+            self._users.delete_user(user_id)
         logger.info("Todos los registros eliminados para user_id=%s", user_id)
 
+    def apply_week_plan(self, plan: "WeekPlan") -> BatchResult:
+        """Guarda las asignaciones de un plan (`services.planner`) en una sola transacción.
+
+        Pasa por `assign_many`: reglas y cupos se vuelven a validar al escribir, así
+        que lo que cambió desde la propuesta (p. ej. alguien registró a ese empleado
+        o llenó un cupo) queda rechazado por fila en el resultado.
+        """
+        logger.debug("Aplicando plan semana=%s asignaciones=%s", plan.week_start, len(plan.assignments))
+        return self.assign_many((a.user_id, a.date) for a in plan.assignments)
+
+    def apply_horizon_plan(self, plan: "HorizonPlan") -> BatchResult:
+        """Guarda todas las semanas de un plan de varias semanas como `apply_week_plan`."""
+        logger.debug("Aplicando plan de %s semanas", len(plan.weeks))
+        return self.assign_many((a.user_id, a.date) for week in plan.weeks for a in week.assignments)
+
     def delete_user_and_records(self, user_id: int) -> None:
         """Elimina los registros de un usuario y luego el usuario (orden correcto)."""
         logger.debug("Eliminando usuario y sus registros user_id=%s", user_id)
-        self._records.delete_all_records_by_user(user_id)
-        self._users.delete_user(user_id)
+        with transaction():
+            self._records.delete_all_records_by_user(user_id)
+            self._users.delete_user(user_id)
         logger.info("Usuario y registros eliminados user_id=%s", user_id)
\ No newline at end of file
@@ -0,0 +1,107 @@
+"""Servicio de exportación: días remotos (con datos del empleado) a Excel/CSV.
+
+Los registros se leen en streaming desde SQLite (`iter_with_users`, con
+`fetchmany`) y se escriben fila a fila: openpyxl en modo `write_only` para .xlsx y
+`csv` para .csv. La memoria queda acotada aunque la base tenga años de historial
+y miles de empleados.
+
+El callback de avance recibe las filas escritas y puede devolver False para
+cancelar: se lanza ExportacionCancelada y no queda un archivo a medias.
+"""
+
+import csv
+import logging
+from contextlib import closing
+from datetime import date
+from pathlib import Path
+from typing import Callable, Iterable, Optional
+
+from data.assignament_repo import RecordRespository
+from exceptions import AppError, ExportacionCancelada
+from services.assignment_service import _week_bounds
+
+logger = logging.getLogger(__name__)
+
+_HEADERS = ("Fecha", "Día", "Legajo", "Nombre")
+_PROGRESS_EVERY = 5000
+
+# Devuelve False para cancelar la exportación
+ProgressCallback = Callable[[int], Optional[bool]]
+
+
+class ExportService:
+    def __init__(self, record_repo: RecordRespository | None = None) -> None:
+        self._records = record_repo or RecordRespository
+
+    @staticmethod
+    def current_week_range(ref_date: Optional[date] = None) -> tuple[str, str]:
+        """(inicio_iso, fin_iso) de la semana de `ref_date` (por defecto hoy)."""
+        return _week_bounds(ref_date or date.today())
+
+    def export(
+        self,
+        path: str | Path,
+        start_iso: str,
+        end_iso: str,
+        user_ids: Optional[Iterable[int]] = None,
+        progress: ProgressCallback | None = None,
+    ) -> int:
+        """Exporta los registros entre start_iso y end_iso (incluidos) a `path`.
+
+        El formato se elige por extensión (.xlsx o .csv). `user_ids` limita la
+        exportación a esos empleados. Devuelve la cantidad de filas escritas; si
+        `progress` devuelve False lanza ExportacionCancelada.
+        """
+        if start_iso > end_iso:
+            raise AppError("La fecha de inicio es posterior a la de fin.")
+        path = Path(path)
+        suffix = path.suffix.lower()
+        if suffix not in (".xlsx", ".csv"):
+            raise AppError(f"Formato no soportado: {path.suffix} (use .xlsx o .csv).")
+        ids = list(user_ids) if user_ids is not None else None
+        logger.debug("Exportando %s inicio=%s fin=%s empleados=%s", path, start_iso, end_iso,
+                     "todos" if ids is None else len(ids))
+        # closing: al cancelar, el cursor de lectura se libera enseguida
+        with closing(self._records.iter_with_users(start_iso, end_iso, ids)) as rows:
+            if suffix == ".xlsx":
+                written = _write_xlsx(path, rows, progress)
+            else:
+                written = _write_csv(path, rows, progress)
+        logger.info("Exportación completada %s: %s filas", path, written)
+        return written
+
+
+def _write_xlsx(path: Path, rows, progress) -> int:
+    from openpyxl import Workbook
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Días remotos")
+    ws.append(list(_HEADERS))
+    written = 0
+    for date_iso, week_day, docket, name in rows:
+        ws.append([date.fromisoformat(date_iso), week_day, docket, name])
+        written += 1
+        if progress is not None and written % _PROGRESS_EVERY == 0 and progress(written) is False:
+            # El libro aún no se guardó: no hay nada que borrar
+            raise ExportacionCancelada("Exportación cancelada.")
+    wb.save(path)
+    return written
+
+
+def _write_csv(path: Path, rows, progress) -> int:
+    written = 0
+    cancelled = False
+    # utf-8-sig para que Excel reconozca acentos al abrir el CSV
+    with open(path, "w", newline="", encoding="utf-8-sig") as f:
+        writer = csv.writer(f)
+        writer.writerow(_HEADERS)
+        for row in rows:
+            writer.writerow(row)
+            written += 1
+            if progress is not None and written % _PROGRESS_EVERY == 0 and progress(written) is False:
+                cancelled = True
+                break
+    if cancelled:
+        path.unlink(missing_ok=True)
+        raise ExportacionCancelada("Exportación cancelada.")
+    return written
@@ -0,0 +1,273 @@
+"""Servicio de importación: nómina e historial de días remotos desde Excel/CSV.
+
+- Lee en streaming: openpyxl en modo `read_only` para .xlsx y `csv` fila a fila
+  para .csv; la memoria no depende del tamaño del archivo (solo la tanda actual y
+  el mapa legajo -> id de la nómina).
+- Valida cada fila con las mismas reglas que AsignacionService: días permitidos
+  (Martes..Viernes) y un registro por semana ISO (este último lo aplica la DB con el
+  índice único (user_id, week_key), y se reporta por fila).
+- Escribe en tandas con `create_many` (una transacción por tanda).
+- Informa progreso por callback y devuelve el total de rechazos y el detalle (con
+  número de fila) de los primeros `max_rejects`: un archivo con muchas filas malas
+  no hace crecer la memoria.
+
+La regla de no repetir el día de la semana anterior no se aplica: el historial
+importado refleja lo que ya ocurrió.
+"""
+
+import csv
+import logging
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from pathlib import Path
+from typing import Callable, Iterator, Optional
+
+from data.assignament_repo import RecordRespository
+from data.user_repo import UserRepository
+from exceptions import AppError
+from services.assignment_service import _WEEKDAY_MAP, validate_day_allowed
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 2000
+DEFAULT_MAX_REJECTS = 500
+
+# Encabezados aceptados (sin distinguir mayúsculas) por columna lógica
+_HEADER_ALIASES = {
+    "name": {"nombre", "name", "empleado"},
+    "docket": {"legajo", "docket"},
+    "date": {"fecha", "date", "dia", "día"},
+}
+_HEADER_LABELS = {"name": "Nombre", "docket": "Legajo", "date": "Fecha"}
+_DATE_FORMATS = ("%Y-%m-%d", "%d/%m/%Y", "%d-%m-%Y")
+
+
+@dataclass(frozen=True)
+class ImportReject:
+    row: int        # número de fila en el archivo (1 = encabezado)
+    reason: str
+
+
+@dataclass(frozen=True)
+class ImportProgress:
+    rows_read: int
+    imported: int
+    rejected: int
+    total_rows: Optional[int]  # None si el formato no lo informa (CSV)
+
+
+@dataclass
+class ImportReport:
+    rows_read: int = 0
+    imported: int = 0
+    rejected: int = 0                                          # total de filas rechazadas
+    rejects: list[ImportReject] = field(default_factory=list)  # detalle de las primeras `max_rejects`
+    cancelled: bool = False
+    max_rejects: Optional[int] = DEFAULT_MAX_REJECTS           # None = sin límite
+
+    def add_reject(self, row: int, reason: str) -> None:
+        self.rejected += 1
+        if self.max_rejects is None or len(self.rejects) < self.max_rejects:
+            self.rejects.append(ImportReject(row, reason))
+
+
+# Devuelve False para cancelar tras la tanda en curso (lo ya escrito se conserva)
+ProgressCallback = Callable[[ImportProgress], Optional[bool]]
+
+
+class ImportService:
+    def __init__(
+        self,
+        user_repo: UserRepository | None = None,
+        record_repo: RecordRespository | None = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_rejects: Optional[int] = DEFAULT_MAX_REJECTS,
+    ) -> None:
+        self._users = user_repo or UserRepository
+        self._records = record_repo or RecordRespository
+        self._batch_size = batch_size
+        self._max_rejects = max_rejects
+
+    # === API pública ===
+    def import_roster(self, path: str | Path, progress: ProgressCallback | None = None) -> ImportReport:
+        """Importa empleados desde columnas Nombre y Legajo."""
+        dockets = self._docket_map()
+        report = ImportReport(max_rejects=self._max_rejects)
+        batch: list[tuple[int, tuple[str, str]]] = []
+
+        def flush() -> None:
+            result = self._users.create_many(row for _n, row in batch)
+            for i, reason in result.rejected:
+                report.add_reject(batch[i][0], reason)
+            for (_n, (_name, docket)), uid in zip(batch, result.ids):
+                if uid is not None:
+                    dockets[docket] = uid
+            report.imported += result.inserted
+            batch.clear()
+
+        rows, total = self._open_rows(path, required=("name", "docket"))
+        for row_number, values in rows:
+            report.rows_read += 1
+            name, docket = values["name"], values["docket"]
+            if not name or not docket:
+                report.add_reject(row_number, "Nombre y Legajo son obligatorios.")
+                continue
+            if docket in dockets:
+                report.add_reject(row_number, "El legajo ya está registrado.")
+                continue
+            dockets[docket] = -1  # reservado: detecta duplicados dentro del mismo archivo
+            batch.append((row_number, (name, docket)))
+            if len(batch) >= self._batch_size:
+                flush()
+                if not self._notify(progress, report, total):
+                    break
+        if batch:
+            flush()
+        self._notify(progress, report, total)
+        logger.info("Importación de nómina: leídas=%s importadas=%s rechazadas=%s",
+                    report.rows_read, report.imported, report.rejected)
+        return report
+
+    def import_history(self, path: str | Path, progress: ProgressCallback | None = None) -> ImportReport:
+        """Importa días remotos desde columnas Legajo y Fecha."""
+        dockets = self._docket_map()
+        report = ImportReport(max_rejects=self._max_rejects)
+        batch: list[tuple[int, tuple[int, str, str]]] = []
+
+        def flush() -> None:
+            result = self._records.create_many(row for _n, row in batch)
+            for i, reason in result.rejected:
+                report.add_reject(batch[i][0], reason)
+            report.imported += result.inserted
+            batch.clear()
+
+        rows, total = self._open_rows(path, required=("docket", "date"))
+        for row_number, values in rows:
+            report.rows_read += 1
+            user_id = dockets.get(values["docket"])
+            if user_id is None:
+                report.add_reject(row_number, f"Legajo desconocido: {values['docket']!r}.")
+                continue
+            try:
+                d = _parse_date(values["date"])
+                validate_day_allowed(d)
+            except AppError as e:
+                report.add_reject(row_number, str(e))
+                continue
+            batch.append((row_number, (user_id, d.isoformat(), _WEEKDAY_MAP[d.weekday()])))
+            if len(batch) >= self._batch_size:
+                flush()
+                if not self._notify(progress, report, total):
+                    break
+        if batch:
+            flush()
+        self._notify(progress, report, total)
+        logger.info("Importación de historial: leídas=%s importadas=%s rechazadas=%s",
+                    report.rows_read, report.imported, report.rejected)
+        return report
+
+    # === Lectura en streaming ===
+    def _docket_map(self) -> dict[str, int]:
+        return {docket: uid for uid, _name, docket in self._users.list_all()}
+
+    def _open_rows(self, path: str | Path, required: tuple[str, ...]):
+        """Devuelve (iterador de (nro_fila, {columna: valor}), total de filas o None)."""
+        path = Path(path)
+        suffix = path.suffix.lower()
+        if suffix in (".xlsx", ".xlsm"):
+            return _iter_xlsx(path, required)
+        if suffix == ".csv":
+            return _iter_csv(path, required), None
+        raise AppError(f"Formato no soportado: {path.suffix} (use .xlsx o .csv).")
+
+    def _notify(self, progress: ProgressCallback | None, report: ImportReport, total: Optional[int]) -> bool:
+        if progress is None:
+            return True
+        keep_going = progress(ImportProgress(report.rows_read, report.imported, report.rejected, total))
+        if keep_going is False:
+            report.cancelled = True
+            return False
+        return True
+
+
+def _iter_xlsx(path: Path, required: tuple[str, ...]):
+    """Filas de la hoja activa con openpyxl en modo solo lectura (no carga el libro en memoria)."""
+    from openpyxl import load_workbook
+
+    wb = load_workbook(path, read_only=True, data_only=True)
+    ws = wb.active
+    total = (ws.max_row - 1) if ws.max_row else None
+
+    def rows() -> Iterator[tuple[int, dict]]:
+        try:
+            it = ws.iter_rows(values_only=True)
+            header = next(it, None)
+            columns = _map_header(header or (), required)
+            for row_number, values in enumerate(it, start=2):
+                if values is None or all(v is None for v in values):
+                    continue
+                yield row_number, _pick(values, columns)
+        finally:
+            wb.close()
+
+    return rows(), total
+
+
+def _iter_csv(path: Path, required: tuple[str, ...]) -> Iterator[tuple[int, dict]]:
+    """Filas de un CSV leídas de a una (detecta ',' o ';' como separador)."""
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        sample = f.read(4096)
+        f.seek(0)
+        try:
+            dialect = csv.Sniffer().sniff(sample, delimiters=",;")
+        except csv.Error:
+            dialect = csv.excel
+        reader = csv.reader(f, dialect)
+        columns = _map_header(next(reader, None) or (), required)
+        for row_number, values in enumerate(reader, start=2):
+            if not any(v.strip() for v in values):
+                continue
+            yield row_number, _pick(values, columns)
+
+
+def _map_header(header, required: tuple[str, ...]) -> dict[str, int]:
+    normalized = [str(h).strip().lower() if h is not None else "" for h in header]
+    columns: dict[str, int] = {}
+    for key, aliases in _HEADER_ALIASES.items():
+        for idx, h in enumerate(normalized):
+            if h in aliases:
+                columns[key] = idx
+                break
+    missing = [k for k in required if k not in columns]
+    if missing:
+        names = ", ".join(_HEADER_LABELS[k] for k in missing)
+        raise AppError(f"Faltan columnas obligatorias en el encabezado: {names}.")
+    return columns
+
+
+def _pick(values, columns: dict[str, int]) -> dict:
+    out = {}
+    for key, idx in columns.items():
+        v = values[idx] if idx < len(values) else None
+        out[key] = v.strip() if isinstance(v, str) else v
+    # Legajos numéricos en Excel llegan como int/float
+    docket = out.get("docket")
+    if isinstance(docket, float) and docket.is_integer():
+        out["docket"] = str(int(docket))
+    elif docket is not None and not isinstance(docket, str):
+        out["docket"] = str(docket)
+    return out
+
+
+def _parse_date(value) -> date:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    text = str(value or "").strip()
+    for fmt in _DATE_FORMATS:
+        try:
+            return datetime.strptime(text, fmt).date()
+        except ValueError:
+            continue
+    raise AppError(f"Fecha inválida: {text!r}.")
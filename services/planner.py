@@ -0,0 +1,545 @@
+"""Planificador semanal: propone el día remoto de cada empleado sin asignación.
+
+Reglas (las mismas que `AsignacionService`):
+- Solo días permitidos (`validate_day_allowed`: ni Lunes ni fin de semana).
+- Un día por semana: los que ya tienen registro en la semana no se tocan.
+- No repetir el día de la semana anterior ni el de la siguiente, si ya está registrada.
+- Cupo por día: total de la semana, contando los ya registrados. Se usan los cupos
+  configurados (`day_capacity`) y, si se pasa `capacity`, el menor de ambos.
+
+El cálculo trabaja por grupos, no por empleado: los empleados se agrupan según los
+días que tienen la semana anterior y la siguiente (una consulta por semana para
+toda la nómina) y el reparto se hace sobre cantidades por (grupo, día). Sin cupos,
+cada unidad va al día menos cargado; con cupos, al de mayor holgura. Si un grupo
+solo encuentra lugar en un día prohibido, se mueve a otro empleado que sí pueda ir
+allí. Luego se asignan fechas a los ids de cada grupo, en orden.
+
+`WeekPlanner.propose_horizon` extiende el plan a varias semanas con rotación: a
+cada empleado se le asigna un desplazamiento inicial (repartido con el mismo
+algoritmo de grupos) y su día avanza una posición por semana, así que recorre
+todos los días permitidos por igual y nunca repite el de la semana anterior. La
+grilla empleado × semana vive en un `array` de bytes; luego una búsqueda local
+por semana corrige repeticiones contra registros ya existentes (incluida la semana
+siguiente al horizonte) y excesos de cupo
+(mueve al empleado al día con lugar que menos usó en el horizonte) y, si no hay
+lugar, deja sin asignar a quienes menos semanas perdieron. `PlanMetrics` informa
+equidad de la rotación y balance de ocupación.
+
+Los planificadores no escriben; `AsignacionService.apply_week_plan` y
+`apply_horizon_plan` guardan el plan por `assign_many`: en una sola transacción y
+volviendo a validar reglas y cupos al escribir.
+"""
+
+import logging
+import statistics
+from array import array
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Hashable, Mapping, Optional
+
+from data.assignament_repo import RecordRespository
+from data.capacity_repo import CapacityRepository
+from data.schema import week_key
+from data.user_repo import UserRepository
+from exceptions import AppError
+from services.assignment_service import _WEEKDAY_MAP, validate_day_allowed
+
+logger = logging.getLogger(__name__)
+
+# Día ausente: sin registro (o con un día no permitido) en la semana vecina
+_FREE = -1
+
+
+@dataclass(frozen=True)
+class PlannedAssignment:
+    user_id: int
+    date: str       # YYYY-MM-DD
+    week_day: str   # Martes, Miércoles, ...
+
+    def to_insert_tuple(self) -> tuple[int, str, str]:
+        """Tupla (user_id, date, week_day) para INSERT."""
+        return (self.user_id, self.date, self.week_day)
+
+
+@dataclass(frozen=True)
+class WeekPlan:
+    """Propuesta para la semana `week_start` (lunes, ISO).
+
+    `unassigned`: empleados sin lugar por falta de cupo.
+    `load_by_day`: total por día (registros existentes + propuestos).
+    """
+    week_start: str
+    assignments: tuple[PlannedAssignment, ...]
+    unassigned: tuple[int, ...]
+    load_by_day: dict[str, int]
+
+
+@dataclass(frozen=True)
+class PlanMetrics:
+    """Métricas de un plan de varias semanas.
+
+    Dispersión de rotación de un empleado: usos de su día más usado menos los del
+    menos usado (0 o 1 es una rotación perfecta según el horizonte).
+    """
+    employees: int
+    weeks: int
+    assigned: int
+    unassigned: int
+    repeats: int                    # semanas consecutivas con el mismo día
+    rotation_spread_max: int
+    rotation_spread_mean: float
+    fair_rotation_ratio: float      # empleados con dispersión mínima posible
+    load_imbalance_max: int         # mayor (día más cargado - menos cargado) en una semana
+    load_cv: float                  # coeficiente de variación de la carga por día
+
+
+@dataclass(frozen=True)
+class HorizonPlan:
+    weeks: tuple[WeekPlan, ...]
+    metrics: PlanMetrics
+
+    @property
+    def assignments(self) -> tuple[PlannedAssignment, ...]:
+        return tuple(a for week in self.weeks for a in week.assignments)
+
+
+class WeekPlanner:
+    def __init__(
+        self,
+        record_repo: RecordRespository | None = None,
+        user_repo: UserRepository | None = None,
+        capacity_repo: CapacityRepository | None = None,
+    ) -> None:
+        self._records = record_repo or RecordRespository
+        self._users = user_repo or UserRepository
+        self._capacity = capacity_repo or CapacityRepository
+
+    def _effective_capacity(self, capacity: Optional[Mapping[str, int]], days: list[int]) -> dict[int, Optional[int]]:
+        """Cupo por día: el configurado, acotado por `capacity` si se indica."""
+        caps = _capacity_by_day(capacity, days)
+        for weekday, limit in self._capacity.get_limits().items():
+            if weekday in caps:
+                caps[weekday] = limit if caps[weekday] is None else min(caps[weekday], limit)
+        return caps
+
+    def propose(self, ref_date: Optional[date] = None, capacity: Optional[Mapping[str, int]] = None) -> WeekPlan:
+        """Propone la semana de `ref_date` (por defecto la actual) para los empleados sin registro.
+
+        `capacity` mapea nombre de día ("Martes", ...) a cupo total; un día sin cupo
+        (ni configurado ni en `capacity`) no tiene tope.
+        """
+        ref = ref_date or date.today()
+        wk = week_key(ref)
+        start = ref - timedelta(days=ref.weekday())
+        days = _allowed_weekdays(start)
+        caps = self._effective_capacity(capacity, days)
+
+        # Cuatro consultas para toda la nómina
+        user_ids = [row[0] for row in self._users.list_all()]
+        current = self._records.records_in_week(wk)
+        previous = self._records.records_in_week(wk - 1)
+        following = self._records.records_in_week(wk + 1)
+
+        load = {d: 0 for d in days}
+        for _rec_id, rec_date, _wd in current.values():
+            wd = date.fromisoformat(rec_date).weekday()
+            if wd in load:
+                load[wd] += 1
+
+        def neighbour_day(rec) -> int:
+            wd = date.fromisoformat(rec[1]).weekday() if rec else _FREE
+            return wd if wd in load else _FREE
+
+        # Grupo: (día de la semana anterior, día de la siguiente)
+        groups: dict[tuple[int, int], list[int]] = {}
+        for uid in sorted(user_ids):
+            if uid in current:
+                continue
+            key = (neighbour_day(previous.get(uid)), neighbour_day(following.get(uid)))
+            groups.setdefault(key, []).append(uid)
+
+        forbidden = {g: frozenset(d for d in g if d != _FREE) for g in groups}
+        alloc, left = _allocate({g: len(ids) for g, ids in groups.items()}, load, caps, forbidden)
+
+        assignments: list[PlannedAssignment] = []
+        unassigned: list[int] = []
+        for g, ids in groups.items():
+            pos = 0
+            for d in days:
+                n = alloc.get((g, d), 0)
+                day_iso = (start + timedelta(days=d)).isoformat()
+                assignments.extend(PlannedAssignment(uid, day_iso, _WEEKDAY_MAP[d]) for uid in ids[pos:pos + n])
+                pos += n
+            unassigned.extend(ids[pos:pos + left.get(g, 0)])
+        assignments.sort(key=lambda a: a.user_id)
+        unassigned.sort()
+        logger.info(
+            "Plan semana %s: %s propuestas, %s sin cupo", start.isoformat(), len(assignments), len(unassigned)
+        )
+        return WeekPlan(
+            week_start=start.isoformat(),
+            assignments=tuple(assignments),
+            unassigned=tuple(unassigned),
+            load_by_day={_WEEKDAY_MAP[d]: load[d] for d in days},
+        )
+
+    def propose_horizon(
+        self, weeks: int, ref_date: Optional[date] = None, capacity: Optional[Mapping[str, int]] = None
+    ) -> HorizonPlan:
+        """Propone `weeks` semanas desde la de `ref_date` (por defecto la actual) rotando el día de cada empleado.
+
+        Los registros existentes en el horizonte se respetan. `capacity` es el cupo
+        semanal por día, como en `propose`.
+        """
+        if weeks < 1:
+            raise AppError("El horizonte debe tener al menos una semana.")
+        ref = ref_date or date.today()
+        wk0 = week_key(ref)
+        start = ref - timedelta(days=ref.weekday())
+        weekdays = _allowed_weekdays(start)
+        caps_by_day = self._effective_capacity(capacity, weekdays)
+        caps = [caps_by_day[d] for d in weekdays]
+        slot_of = {d: slot for slot, d in enumerate(weekdays)}
+
+        # Cuatro consultas: nómina, semanas vecinas al horizonte y registros ya hechos en él
+        user_ids = sorted(row[0] for row in self._users.list_all())
+        index = {uid: i for i, uid in enumerate(user_ids)}
+        grid = _Grid(len(user_ids), weeks, len(weekdays))
+        prev = array("b", [-1]) * len(user_ids)
+        after = array("b", [-1]) * len(user_ids)  # registro fijo de la semana siguiente al horizonte
+        for edge, wk in ((prev, wk0 - 1), (after, wk0 + weeks)):
+            for uid, (_rec_id, rec_date, _wd) in self._records.records_in_week(wk).items():
+                if uid in index:
+                    edge[index[uid]] = slot_of.get(date.fromisoformat(rec_date).weekday(), -1)
+        for wk, uid, rec_date, _wd in self._records.records_in_weeks(wk0, wk0 + weeks - 1):
+            if uid in index:
+                i = index[uid]
+                grid.fixed[i * weeks + wk - wk0] = 1
+                grid.set(i, wk - wk0, slot_of.get(date.fromisoformat(rec_date).weekday(), -1))
+
+        _rotate(grid, prev)
+        loads = _repair(grid, prev, after, caps)
+
+        plans = []
+        for w in range(weeks):
+            week_start = start + timedelta(weeks=w)
+            # (fecha, nombre de día) de cada posición de la semana
+            slots = [((week_start + timedelta(days=d)).isoformat(), _WEEKDAY_MAP[d]) for d in weekdays]
+            assignments = []
+            unassigned = []
+            for i, uid in enumerate(user_ids):
+                pos = i * weeks + w
+                if grid.fixed[pos]:
+                    continue
+                slot = grid.cells[pos]
+                if slot < 0:
+                    unassigned.append(uid)
+                else:
+                    assignments.append(PlannedAssignment(uid, *slots[slot]))
+            plans.append(WeekPlan(
+                week_start=week_start.isoformat(),
+                assignments=tuple(assignments),
+                unassigned=tuple(unassigned),
+                load_by_day={_WEEKDAY_MAP[d]: loads[w][slot] for slot, d in enumerate(weekdays)},
+            ))
+        metrics = _metrics(grid, prev, loads, caps)
+        logger.info(
+            "Plan de %s semanas desde %s: %s propuestas, %s sin cupo, dispersión máx=%s",
+            weeks, start.isoformat(), metrics.assigned, metrics.unassigned, metrics.rotation_spread_max,
+        )
+        return HorizonPlan(weeks=tuple(plans), metrics=metrics)
+
+
+def _capacity_by_day(capacity: Optional[Mapping[str, int]], days: list[int]) -> dict[int, Optional[int]]:
+    """Cupo por índice de día (None = sin tope); valida que los nombres sean días permitidos."""
+    if capacity:
+        unknown = set(capacity) - {_WEEKDAY_MAP[d] for d in days}
+        if unknown:
+            raise AppError(f"Cupo para días no permitidos: {', '.join(sorted(unknown))}.")
+    return {d: capacity.get(_WEEKDAY_MAP[d]) if capacity else None for d in days}
+
+
+def _allowed_weekdays(week_start: date) -> list[int]:
+    """Índices de día (0=Lunes) que admiten registro, según la regla compartida."""
+    days = []
+    for d in range(7):
+        try:
+            validate_day_allowed(week_start + timedelta(days=d))
+        except AppError:
+            continue
+        days.append(d)
+    return days
+
+
+def _allocate(
+    sizes: dict[Hashable, int],
+    load: dict[int, int],
+    caps: dict[int, Optional[int]],
+    forbidden: Optional[Mapping[Hashable, frozenset[int]]] = None,
+) -> tuple[dict[tuple[Hashable, int], int], dict[Hashable, int]]:
+    """Reparte cantidades por grupo entre días.
+
+    `sizes`: empleados por grupo. `forbidden`: días prohibidos de cada grupo; si no
+    se indica, la clave del grupo es su único día prohibido (o _FREE). `load` se
+    actualiza con lo asignado. Devuelve ({(grupo, día): cantidad}, {grupo: sin lugar}).
+    """
+    alloc: dict[tuple[Hashable, int], int] = {}
+    left: dict[Hashable, int] = {}
+    if forbidden is None:
+        forbidden = {g: frozenset() if g == _FREE else frozenset((g,)) for g in sizes}
+
+    def slack(d: int) -> float:
+        cap = caps[d]
+        return float("inf") if cap is None else cap - load[d]
+
+    def best_day(g: Hashable) -> Optional[int]:
+        candidates = [d for d in load if d not in forbidden[g] and slack(d) > 0]
+        if not candidates:
+            return None
+        # Mayor holgura; a igual holgura (o sin cupo), el menos cargado
+        return max(candidates, key=lambda d: (slack(d), -load[d], -d))
+
+    def relocate_for(g: Hashable) -> Optional[int]:
+        """Libera un lugar para el grupo `g` moviendo a otro empleado a un día prohibido de `g`."""
+        for f in forbidden[g]:
+            if slack(f) <= 0:
+                continue
+            for d in load:
+                if d in forbidden[g]:
+                    continue
+                for h in sizes:
+                    if f not in forbidden[h] and alloc.get((h, d), 0) > 0:
+                        alloc[(h, d)] -= 1
+                        alloc[(h, f)] = alloc.get((h, f), 0) + 1
+                        load[d] -= 1
+                        load[f] += 1
+                        return d
+        return None
+
+    # Primero los grupos con restricción (más restringidos y más grandes primero); los libres al final
+    order = sorted(sizes, key=lambda g: (not forbidden[g], -len(forbidden[g]), -sizes[g]))
+    for g in order:
+        for _ in range(sizes[g]):
+            d = best_day(g)
+            if d is None:
+                d = relocate_for(g)
+            if d is None:
+                left[g] = left.get(g, 0) + 1
+                continue
+            alloc[(g, d)] = alloc.get((g, d), 0) + 1
+            load[d] += 1
+    return alloc, left
+
+
+class _Grid:
+    """Grilla empleado × semana con el índice de día (posición en `days`) o -1.
+
+    `fixed` marca los registros existentes (no se mueven); `counts` lleva cuántas
+    veces usó cada empleado cada día en el horizonte.
+    """
+
+    def __init__(self, n: int, weeks: int, k: int) -> None:
+        self.n, self.weeks, self.k = n, weeks, k
+        self.cells = array("b", [-1]) * (n * weeks)
+        self.fixed = bytearray(n * weeks)
+        self.counts = array("H", [0]) * (n * k)
+
+    def get(self, i: int, w: int) -> int:
+        return self.cells[i * self.weeks + w]
+
+    def set(self, i: int, w: int, slot: int) -> None:
+        pos = i * self.weeks + w
+        old = self.cells[pos]
+        if old >= 0:
+            self.counts[i * self.k + old] -= 1
+        if slot >= 0:
+            self.counts[i * self.k + slot] += 1
+        self.cells[pos] = slot
+
+
+def _rotate(grid: _Grid, prev: array) -> None:
+    """Llena las celdas libres rotando desde un desplazamiento por empleado.
+
+    El desplazamiento es el día de la primera semana: lo fija un registro existente
+    o se reparte con `_allocate`, agrupando por el día de la semana previa.
+    """
+    n, weeks, k = grid.n, grid.weeks, grid.k
+    base = array("b", [-1]) * n
+    load = {slot: 0 for slot in range(k)}
+    groups: dict[int, list[int]] = {}
+    for i in range(n):
+        first = grid.cells[i * weeks]
+        if grid.fixed[i * weeks] and first >= 0:
+            base[i] = first
+            load[first] += 1
+        else:
+            groups.setdefault(prev[i], []).append(i)
+    alloc, _left = _allocate({g: len(m) for g, m in groups.items()}, load, {slot: None for slot in range(k)})
+    for g, members in groups.items():
+        pos = 0
+        for slot in range(k):
+            count = alloc.get((g, slot), 0)
+            for i in members[pos:pos + count]:
+                base[i] = slot
+            pos += count
+    for i in range(n):
+        row = i * weeks
+        for w in range(weeks):
+            if not grid.fixed[row + w]:
+                grid.set(i, w, (base[i] + w) % k)
+
+
+def _repair(grid: _Grid, prev: array, after: array, caps: list[Optional[int]]) -> list[list[int]]:
+    """Búsqueda local semana a semana: quita repeticiones, excesos de cupo y desbalance.
+
+    1. Repeticiones con la semana anterior (o con un registro fijo de la siguiente,
+       incluido `after`, la semana posterior al horizonte): se mueve al empleado; si
+       no hay día válido con cupo, queda sin asignar.
+    2. Excesos de cupo: se mueve a quienes más usaron ese día; si no hay lugar,
+       quedan sin asignar quienes menos semanas perdieron.
+    3. Balance: se mueve gente del día más cargado a días con al menos dos
+       personas menos, en rondas, mientras alguna mueva. Cada movimiento reduce
+       la suma de cuadrados de la carga, así que termina; las cadenas (Martes ->
+       Jueves -> Viernes) resuelven a quien no puede ir directo al día vacío.
+
+    Devuelve la carga por día de cada semana.
+    """
+    n, weeks, k = grid.n, grid.weeks, grid.k
+    missed = array("H", [0]) * n  # semanas sin asignar por empleado
+    loads: list[list[int]] = []
+    for w in range(weeks):
+        load = [0] * k
+        members: list[list[int]] = [[] for _ in range(k)]
+        for i in range(n):
+            slot = grid.cells[i * weeks + w]
+            if slot >= 0:
+                load[slot] += 1
+                if not grid.fixed[i * weeks + w]:
+                    members[slot].append(i)
+
+        def neighbours(i: int) -> tuple[int, int, bool]:
+            left = prev[i] if w == 0 else grid.cells[i * weeks + w - 1]
+            if w + 1 < weeks:
+                return left, grid.cells[i * weeks + w + 1], bool(grid.fixed[i * weeks + w + 1])
+            return left, after[i], after[i] >= 0
+
+        def move(i: int, slot: int, below: Optional[int] = None) -> bool:
+            """Pasa a `i` al día con lugar que menos usó; False si no hay ninguno válido.
+
+            Con `below`, solo a días con carga menor que ese valor.
+            """
+            left, right, right_fixed = neighbours(i)
+            best, best_key = -1, None
+            for t in range(k):
+                if t == slot or t == left or (right_fixed and t == right):
+                    continue
+                if caps[t] is not None and load[t] >= caps[t]:
+                    continue
+                if below is not None and load[t] >= below:
+                    continue
+                # Evitar (sin prohibir) el día planificado para la semana siguiente
+                key = (t == right, grid.counts[i * k + t], load[t])
+                if best_key is None or key < best_key:
+                    best, best_key = t, key
+            if best < 0:
+                return False
+            grid.set(i, w, best)
+            load[slot] -= 1
+            load[best] += 1
+            members[best].append(i)
+            return True
+
+        def drop(i: int, slot: int) -> None:
+            grid.set(i, w, -1)
+            load[slot] -= 1
+            missed[i] += 1
+
+        def current(slot: int) -> list[int]:
+            """Miembros movibles que siguen en `slot`, primero quienes más lo usaron."""
+            stay = [i for i in members[slot] if grid.cells[i * weeks + w] == slot]
+            stay.sort(key=lambda i: -grid.counts[i * k + slot])
+            members[slot] = stay
+            return stay
+
+        cells, fixed = grid.cells, grid.fixed
+        last_week = w + 1 == weeks
+        for slot in range(k):
+            for i in list(members[slot]):
+                pos = i * weeks + w
+                left = prev[i] if w == 0 else cells[pos - 1]
+                right_fixed = after[i] == slot if last_week else fixed[pos + 1] and cells[pos + 1] == slot
+                if slot == left or right_fixed:
+                    if not move(i, slot):
+                        drop(i, slot)
+        for slot in range(k):
+            cap = caps[slot]
+            if cap is None or load[slot] <= cap:
+                continue
+            for i in current(slot):
+                if load[slot] <= cap:
+                    break
+                move(i, slot)
+            if load[slot] > cap:
+                stay = current(slot)
+                stay.sort(key=lambda i: missed[i])
+                for i in stay[:load[slot] - cap]:
+                    drop(i, slot)
+        def lowest_open() -> int:
+            """Carga del día menos cargado que aún admite gente (sin cupo o con lugar)."""
+            return min((load[t] for t in range(k) if caps[t] is None or load[t] < caps[t]), default=n)
+
+        moved = True
+        while moved:
+            moved = False
+            for slot in sorted(range(k), key=lambda t: -load[t]):
+                for i in current(slot):
+                    if load[slot] - lowest_open() <= 1:
+                        break
+                    if move(i, slot, below=load[slot] - 1):
+                        moved = True
+                if moved:
+                    break
+        loads.append(load)
+    return loads
+
+
+def _metrics(grid: _Grid, prev: array, loads: list[list[int]], caps: list[Optional[int]]) -> PlanMetrics:
+    n, weeks, k = grid.n, grid.weeks, grid.k
+    # La rotación se mide sobre los días que admiten gente (cupo distinto de 0)
+    open_slots = [t for t in range(k) if caps[t] != 0] or list(range(k))
+    assigned = unassigned = repeats = fair = spread_max = spread_total = 0
+    for i in range(n):
+        row = i * weeks
+        last = prev[i]
+        for w in range(weeks):
+            slot = grid.cells[row + w]
+            fixed = grid.fixed[row + w]
+            if slot >= 0:
+                if not fixed:
+                    assigned += 1
+                # Solo cuentan las repeticiones que involucran una celda propuesta
+                if slot == last and not (fixed and (w == 0 or grid.fixed[row + w - 1])):
+                    repeats += 1
+            elif not grid.fixed[row + w]:
+                unassigned += 1
+            last = slot
+        counts = [grid.counts[i * k + t] for t in open_slots]
+        spread = max(counts) - min(counts)
+        spread_max = max(spread_max, spread)
+        spread_total += spread
+        if spread <= (0 if sum(counts) % len(counts) == 0 else 1):
+            fair += 1
+    flat = [x for load in loads for x in load]
+    mean = statistics.fmean(flat) if flat else 0.0
+    return PlanMetrics(
+        employees=n,
+        weeks=weeks,
+        assigned=assigned,
+        unassigned=unassigned,
+        repeats=repeats,
+        rotation_spread_max=spread_max,
+        rotation_spread_mean=spread_total / n if n else 0.0,
+        fair_rotation_ratio=fair / n if n else 1.0,
+        load_imbalance_max=max((max(load) - min(load) for load in loads), default=0),
+        load_cv=statistics.pstdev(flat) / mean if mean else 0.0,
+    )
@@ -0,0 +1,100 @@
+"""Índice en memoria para buscar empleados por nombre o legajo mientras se escribe.
+
+Guarda una lista ordenada de (término, user_id) con cada palabra del nombre y el
+legajo, normalizados (minúsculas y sin acentos). Un prefijo se resuelve con dos
+búsquedas binarias sobre esa lista, sin tocar SQLite. Se construye una vez con la
+nómina (`rebuild`) y se mantiene con `add` / `update` / `remove`.
+
+Con varias palabras, cada una debe ser prefijo de algún término del empleado
+("ana gó" encuentra a "Ana María Gómez").
+"""
+
+import unicodedata
+from bisect import bisect_left, insort
+from typing import Iterable, Optional
+
+from models.user import User
+
+# Mayor que cualquier carácter que pueda seguir a un prefijo
+_PREFIX_END = "\U0010ffff"
+
+
+def normalize(text: str) -> str:
+    """Minúsculas y sin diacríticos ("Gómez" -> "gomez")."""
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    return "".join(c for c in decomposed if not unicodedata.combining(c))
+
+
+def _terms(user: User) -> tuple[str, ...]:
+    terms = set(normalize(user.name).split())
+    docket = normalize(user.docket).strip()
+    if docket:
+        terms.add(docket)
+    return tuple(terms)
+
+
+class UserSearchIndex:
+    """Índice de prefijos de nombre y legajo por id de usuario."""
+
+    def __init__(self, users: Iterable[User] = ()) -> None:
+        self._entries: list[tuple[str, int]] = []
+        self._terms_of: dict[int, tuple[str, ...]] = {}
+        self._built = False
+        if users:
+            self.rebuild(users)
+
+    @property
+    def is_built(self) -> bool:
+        return self._built
+
+    def __len__(self) -> int:
+        return len(self._terms_of)
+
+    def rebuild(self, users: Iterable[User]) -> None:
+        """Reconstruye el índice completo (arranque o tras una importación masiva)."""
+        terms_of = {u.id: _terms(u) for u in users if u.id is not None}
+        self._terms_of = terms_of
+        self._entries = sorted((t, uid) for uid, terms in terms_of.items() for t in terms)
+        self._built = True
+
+    def invalidate(self) -> None:
+        """Marca el índice como desactualizado; el próximo `rebuild` lo reemplaza."""
+        self._built = False
+
+    def add(self, user: User) -> None:
+        if user.id is None:
+            return
+        if user.id in self._terms_of:
+            self.remove(user.id)
+        terms = _terms(user)
+        self._terms_of[user.id] = terms
+        for t in terms:
+            insort(self._entries, (t, user.id))
+
+    def update(self, user: User) -> None:
+        self.add(user)
+
+    def remove(self, user_id: int) -> None:
+        for t in self._terms_of.pop(user_id, ()):
+            i = bisect_left(self._entries, (t, user_id))
+            if i < len(self._entries) and self._entries[i] == (t, user_id):
+                del self._entries[i]
+
+    def search(self, query: str) -> Optional[set[int]]:
+        """Ids cuyos términos empiezan con cada palabra de `query`; None si la consulta está vacía."""
+        words = normalize(query).split()
+        if not words:
+            return None
+        # Palabras más largas primero: rangos más chicos y la intersección se achica antes
+        result: Optional[set[int]] = None
+        for word in sorted(set(words), key=len, reverse=True):
+            matches = self._prefix(word)
+            result = matches if result is None else result & matches
+            if not result:
+                return set()
+        return result
+
+    def _prefix(self, word: str) -> set[int]:
+        lo = bisect_left(self._entries, (word,))
+        hi = bisect_left(self._entries, (word + _PREFIX_END,), lo)
+        return {uid for _t, uid in self._entries[lo:hi]}
@@ -0,0 +1,93 @@
+"""Servicio de equipos: jerarquía, pertenencia y estado semanal agregado por equipo.
+
+Las vistas por equipo no dependen del tamaño del equipo: los miembros (con sus
+subequipos) y las métricas de la semana salen de una consulta agrupada cada una.
+"""
+
+import logging
+from datetime import date
+from typing import Iterable, List, Optional, Tuple
+
+from data.schema import week_key
+from data.team_repo import TeamRepository
+from exceptions import AppError
+from models.team import Team, TeamWeekStats
+
+logger = logging.getLogger(__name__)
+
+
+class TeamService:
+    def __init__(self, team_repo: TeamRepository | None = None) -> None:
+        self._repo = team_repo or TeamRepository
+
+    def create_team(self, name: str, parent_id: Optional[int] = None) -> Team:
+        """Crea un equipo (subequipo de `parent_id` si se indica)."""
+        name = (name or "").strip()
+        if not name:
+            raise AppError("El nombre del equipo no puede estar vacío.")
+        team_id = self._repo.create(name, parent_id)
+        return Team(id=team_id, name=name, parent_id=parent_id)
+
+    def rename_team(self, team_id: int, name: str) -> None:
+        name = (name or "").strip()
+        if not name:
+            raise AppError("El nombre del equipo no puede estar vacío.")
+        self._repo.rename(team_id, name)
+
+    def delete_team(self, team_id: int) -> None:
+        """Elimina un equipo sin subequipos; sus miembros quedan sin equipo."""
+        self._repo.delete(team_id)
+
+    def list_teams(self) -> List[Team]:
+        """Equipos ordenados por nombre."""
+        return [Team.from_full_row(row) for row in self._repo.list_all()]
+
+    def team_tree(self) -> List[Tuple[Team, int]]:
+        """[(Team, profundidad)] en orden de árbol: cada equipo seguido de sus subequipos."""
+        teams = self.list_teams()
+        children: dict[Optional[int], list[Team]] = {}
+        for team in teams:
+            children.setdefault(team.parent_id, []).append(team)
+        out: List[Tuple[Team, int]] = []
+        stack = [(team, 0) for team in reversed(children.get(None, []))]
+        while stack:
+            team, depth = stack.pop()
+            out.append((team, depth))
+            stack.extend((child, depth + 1) for child in reversed(children.get(team.id, [])))
+        return out
+
+    def assign_members(self, user_ids: Iterable[int], team_id: Optional[int]) -> int:
+        """Mueve los empleados al equipo `team_id` (None: sin equipo); devuelve cuántos cambiaron."""
+        return self._repo.set_members(user_ids, team_id)
+
+    def member_ids(self, team_id: int, include_subteams: bool = True) -> set[int]:
+        """Ids de los empleados del equipo (por defecto, también los de sus subequipos)."""
+        return self._repo.member_ids(team_id, include_subteams)
+
+    def week_stats(
+        self, ref_date: Optional[date] = None, team_id: Optional[int] = None
+    ) -> dict[Optional[int], TeamWeekStats]:
+        """Miembros, registrados, pendientes y distribución por día de la semana de `ref_date`.
+
+        Sin `team_id` devuelve todos los equipos (vacíos incluidos) y, bajo la clave
+        None, los empleados sin equipo; con `team_id`, solo ese equipo.
+        """
+        ref = ref_date or date.today()
+        rows = self._repo.week_stats(week_key(ref), team_id)
+        members: dict[Optional[int], int] = {}
+        by_day: dict[Optional[int], dict[str, int]] = {}
+        for tid, week_day, count in rows:
+            members[tid] = members.get(tid, 0) + count
+            days = by_day.setdefault(tid, {})
+            if week_day is not None:
+                days[week_day] = count
+        keys = [team_id] if team_id is not None else [t.id for t in self.list_teams()] + [None]
+        return {
+            tid: TeamWeekStats(
+                team_id=tid,
+                members=members.get(tid, 0),
+                registered=sum(by_day.get(tid, {}).values()),
+                by_day=by_day.get(tid, {}),
+            )
+            for tid in keys
+        }
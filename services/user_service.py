@@ -24,6 +24,11 @@ class UserService:
         rows = self._repo.list_all()
         return [User.from_full_row(row) for row in rows]
 
+    def search_users(self, query: str, limit: int = 50) -> List[User]:
+        """Usuarios cuyo nombre o legajo coincide con `query` (por prefijo de palabra), por relevancia."""
+        rows = self._repo.search(query, limit)
+        return [User.from_full_row(row) for row in rows]
+
     def get_user(self, user_id: int) -> Optional[User]:
         """Obtiene un usuario por id, o None si no existe."""
         row = self._repo.get_by_id(user_id)
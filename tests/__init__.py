@@ -0,0 +1,23 @@
+"""Pruebas de comportamiento (unittest): cada caso corre sobre una base SQLite temporal nueva."""
+
+import os
+import tempfile
+from pathlib import Path
+
+# config crea carpetas en %LOCALAPPDATA% al importarse: apuntarla a una temporal
+_TMP_DIR = Path(tempfile.mkdtemp(prefix="trabajo_remoto_tests_"))
+os.environ["LOCALAPPDATA"] = str(_TMP_DIR)
+_counter = 0
+
+
+def fresh_database() -> Path:
+    """Apunta el acceso a datos a un archivo SQLite nuevo, con esquema y migraciones aplicados."""
+    global _counter
+    from data.db_utils import configure_database
+    from data.schema import create_tables
+
+    _counter += 1
+    path = _TMP_DIR / f"test_{_counter}.db"
+    configure_database(path)
+    create_tables()
+    return path
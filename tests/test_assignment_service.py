@@ -0,0 +1,64 @@
+import unittest
+from datetime import date, timedelta
+
+from tests import fresh_database
+from data.user_repo import UserRepository
+from exceptions import AppError
+from services.assignment_service import AsignacionService
+
+"""Regla de no repetir el día entre semanas contiguas, ahora que se planifican semanas futuras."""
+
+
+def _monday(d: date) -> date:
+    return d - timedelta(days=d.weekday())
+
+
+class RepeatDayAcrossWeeksTest(unittest.TestCase):
+    def setUp(self) -> None:
+        fresh_database()
+        self.user_id = UserRepository.create("Empleado Prueba", "T-001")
+        self.service = AsignacionService(planning_weeks=4)
+        start = _monday(date.today())
+        self.next_tuesday = (start + timedelta(weeks=1, days=1)).isoformat()
+        self.tuesday_in_two_weeks = (start + timedelta(weeks=2, days=1)).isoformat()
+
+    def test_assign_rejects_same_day_as_following_week(self) -> None:
+        self.service.assign_day(self.user_id, self.tuesday_in_two_weeks)
+        with self.assertRaises(AppError):
+            self.service.assign_day(self.user_id, self.next_tuesday)
+        # Con autorización explícita se permite
+        self.service.assign_day(self.user_id, self.next_tuesday, allow_repeat_prev_week=True)
+
+    def test_change_rejects_same_day_as_following_week(self) -> None:
+        self.service.assign_day(self.user_id, self.tuesday_in_two_weeks)
+        next_wednesday = (date.fromisoformat(self.next_tuesday) + timedelta(days=1)).isoformat()
+        self.service.assign_day(self.user_id, next_wednesday)
+        with self.assertRaises(AppError):
+            self.service.change_week_assignment(self.user_id, self.next_tuesday)
+
+    def test_batch_flags_same_day_as_following_week(self) -> None:
+        self.service.assign_day(self.user_id, self.tuesday_in_two_weeks)
+        result = self.service.validate_many([(self.user_id, self.next_tuesday)])
+        self.assertEqual(len(result.needs_override), 1)
+
+    def test_batch_flags_following_week_planned_in_same_batch(self) -> None:
+        result = self.service.validate_many(
+            [(self.user_id, self.tuesday_in_two_weeks), (self.user_id, self.next_tuesday)]
+        )
+        self.assertTrue(result.checks[0].accepted)
+        self.assertTrue(result.checks[1].needs_override)
+
+    def test_summary_and_matrix_carry_following_week(self) -> None:
+        self.service.assign_day(self.user_id, self.tuesday_in_two_weeks)
+        ref = date.fromisoformat(self.next_tuesday)
+        summary = self.service.employee_summary(self.user_id, ref)
+        self.assertEqual(summary.next_week.date, self.tuesday_in_two_weeks)
+        self.assertIs(summary.adjacent_week_repeating("Martes"), summary.next_week)
+        self.assertIsNone(summary.adjacent_week_repeating("Miércoles"))
+        (row,) = self.service.week_matrix(ref)
+        self.assertEqual(row.next_week_day, "Martes")
+        self.assertIsNone(row.prev_week_day)
+
+
+if __name__ == "__main__":
+    unittest.main()
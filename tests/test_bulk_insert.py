@@ -0,0 +1,67 @@
+import unittest
+
+from tests import fresh_database
+from data.assignament_repo import RecordRespository
+from data.db_utils import get_connection
+from data.user_repo import UserRepository
+
+"""Altas masivas: ids por fila, rechazos fila a fila y bloques (`chunk_size`) independientes."""
+
+
+class BulkInsertTest(unittest.TestCase):
+    def setUp(self) -> None:
+        fresh_database()
+
+    def test_ids_follow_input_order_across_chunks(self) -> None:
+        rows = [(f"Empleado {i}", f"T-{i:03d}") for i in range(7)]
+        result = UserRepository.create_many(rows, chunk_size=3)
+        self.assertEqual(result.inserted, 7)
+        self.assertEqual(result.rejected, [])
+        with get_connection() as conn:
+            stored = dict(conn.execute("SELECT id, docket FROM users").fetchall())
+        self.assertEqual([stored[i] for i in result.ids], [docket for _name, docket in rows])
+
+    def test_conflicting_rows_are_rejected_without_aborting_the_batch(self) -> None:
+        UserRepository.create("Existente", "T-000")
+        rows = [
+            ("Ana", "T-001"),
+            ("Beto", "T-000"),   # legajo en uso
+            ("Carla", "T-002"),
+            ("Ana", "T-003"),    # nombre repetido dentro del lote
+            ("Dora", "T-004"),
+        ]
+        result = UserRepository.create_many(rows, chunk_size=2)
+        self.assertEqual([i for i, _reason in result.rejected], [1, 3])
+        self.assertIsNone(result.ids[1])
+        self.assertIsNone(result.ids[3])
+        self.assertEqual(result.inserted, 3)
+        with get_connection() as conn:
+            names = {row[0] for row in conn.execute("SELECT name FROM users")}
+        self.assertEqual(names, {"Existente", "Ana", "Carla", "Dora"})
+
+    def test_record_rejects_explain_the_rule(self) -> None:
+        user = UserRepository.create("Ana", "T-001")
+        result = RecordRespository.create_many(
+            [
+                (user, "2026-10-06", "Martes"),
+                (user, "2026-10-08", "Jueves"),     # misma semana
+                (9999, "2026-10-07", "Miércoles"),  # usuario inexistente
+                (user, "2026-10-14", "Miércoles"),
+            ],
+            chunk_size=10,
+        )
+        self.assertEqual(result.inserted, 2)
+        self.assertEqual(
+            result.rejected,
+            [
+                (1, "El empleado ya tiene un registro esa semana."),
+                (2, "El usuario no existe."),
+            ],
+        )
+        with get_connection() as conn:
+            weeks = conn.execute("SELECT COUNT(*) FROM week_assignments").fetchone()[0]
+        self.assertEqual(weeks, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
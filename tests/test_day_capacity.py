@@ -0,0 +1,82 @@
+import unittest
+from datetime import date, timedelta
+
+from tests import fresh_database
+from data.capacity_repo import CapacityRepository
+from data.db_utils import get_connection, transaction
+from data.schema import day_counts_drift, rebuild_day_counts
+from data.user_repo import UserRepository
+from exceptions import AppError, CupoDiarioCompleto, DiaNoPermitido
+from services.assignment_service import AsignacionService
+
+"""Cupos de remotos por día: contador day_counts (triggers), su reparación y la regla de cupo."""
+
+
+class DayCapacityTest(unittest.TestCase):
+    def setUp(self) -> None:
+        fresh_database()
+        self.service = AsignacionService(planning_weeks=4)
+        today = date.today()
+        monday = today - timedelta(days=today.weekday()) + timedelta(weeks=1)
+        self.tuesday = (monday + timedelta(days=1)).isoformat()
+        self.wednesday = (monday + timedelta(days=2)).isoformat()
+        self.users = [UserRepository.create(f"Empleado {i}", f"T-{i:03d}") for i in range(3)]
+
+    def _drift(self) -> int:
+        with get_connection() as conn:
+            return day_counts_drift(conn)
+
+    def test_triggers_follow_insert_change_and_delete(self) -> None:
+        first, second, _third = self.users
+        self.service.assign_day(first, self.tuesday)
+        self.service.assign_day(second, self.tuesday)
+        self.assertEqual(CapacityRepository.remote_count(self.tuesday), 2)
+
+        self.service.change_week_assignment(second, self.wednesday)
+        self.assertEqual(CapacityRepository.remote_count(self.tuesday), 1)
+        self.assertEqual(CapacityRepository.remote_count(self.wednesday), 1)
+
+        self.service.delete_user_and_records(first)
+        self.assertEqual(CapacityRepository.remote_count(self.tuesday), 0)
+        self.assertEqual(self._drift(), 0)
+
+    def test_drift_is_detected_and_rebuilt(self) -> None:
+        self.service.assign_day(self.users[0], self.tuesday)
+        with transaction() as conn:
+            conn.execute("UPDATE day_counts SET remote = 5 WHERE date = ?", (self.tuesday,))
+            conn.execute("INSERT INTO day_counts(date, remote) VALUES (?, 3)", (self.wednesday,))
+        self.assertEqual(self._drift(), 2)
+        with transaction() as conn:
+            rebuild_day_counts(conn)
+        self.assertEqual(self._drift(), 0)
+        self.assertEqual(CapacityRepository.remote_count(self.tuesday), 1)
+        self.assertEqual(CapacityRepository.remote_count(self.wednesday), 0)
+
+    def test_full_day_rejects_assign_and_change(self) -> None:
+        first, second, third = self.users
+        self.service.set_day_capacity("Martes", 1)
+        self.service.assign_day(first, self.tuesday)
+        with self.assertRaises(CupoDiarioCompleto):
+            self.service.assign_day(second, self.tuesday)
+        self.service.assign_day(third, self.wednesday)
+        with self.assertRaises(CupoDiarioCompleto):
+            self.service.change_week_assignment(third, self.tuesday)
+
+        capacity = self.service.week_capacity(date.fromisoformat(self.tuesday))[self.tuesday]
+        self.assertEqual((capacity.remote, capacity.max_remote, capacity.is_full), (1, 1, True))
+
+        # Quitar el cupo vuelve a admitir altas
+        self.service.set_day_capacity("Martes", None)
+        self.service.assign_day(second, self.tuesday)
+        self.assertEqual(CapacityRepository.remote_count(self.tuesday), 2)
+
+    def test_invalid_capacity_settings(self) -> None:
+        with self.assertRaises(DiaNoPermitido):
+            self.service.set_day_capacity("Lunes", 3)
+        with self.assertRaises(AppError):
+            self.service.set_day_capacity("Martes", -1)
+        self.assertEqual(self.service.day_capacity_limits(), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+import csv
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from tests import fresh_database
+from data.assignament_repo import RecordRespository
+from data.db_utils import get_connection
+from data.user_repo import UserRepository
+from exceptions import AppError, ExportacionCancelada
+from services.export_service import ExportService
+from services.import_service import ImportService
+
+"""Exportación de días remotos a CSV/Excel: filtros, cancelación y reimportación del archivo."""
+
+
+class ExportServiceTest(unittest.TestCase):
+    def setUp(self) -> None:
+        fresh_database()
+        self.dir = Path(tempfile.mkdtemp(prefix="trabajo_remoto_export_"))
+        self.ana = UserRepository.create("Ana García", "L1")
+        self.beto = UserRepository.create("Beto Díaz", "L2")
+        RecordRespository.create_many([
+            (self.ana, "2026-10-06", "Martes"),
+            (self.beto, "2026-10-07", "Miércoles"),
+            (self.ana, "2026-10-14", "Miércoles"),
+            (self.beto, "2026-10-23", "Viernes"),
+        ])
+
+    def _records(self) -> list[tuple[str, str, str]]:
+        with get_connection() as conn:
+            return conn.execute(
+                """
+                SELECT u.docket, r.date, r.week_day FROM records r
+                JOIN users u ON u.id = r.user_id ORDER BY r.date
+                """
+            ).fetchall()
+
+    def test_csv_range_and_selected_employees(self) -> None:
+        path = self.dir / "rango.csv"
+        written = ExportService().export(path, "2026-10-06", "2026-10-14", user_ids=[self.ana])
+        self.assertEqual(written, 2)
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            rows = list(csv.reader(f))
+        self.assertEqual(rows, [
+            ["Fecha", "Día", "Legajo", "Nombre"],
+            ["2026-10-06", "Martes", "L1", "Ana García"],
+            ["2026-10-14", "Miércoles", "L1", "Ana García"],
+        ])
+
+    def test_round_trip_through_import(self) -> None:
+        expected = self._records()
+        for suffix in (".csv", ".xlsx"):
+            with self.subTest(formato=suffix):
+                path = self.dir / f"todo{suffix}"
+                self.assertEqual(ExportService().export(path, "2026-01-01", "2026-12-31"), 4)
+                fresh_database()
+                # El archivo exportado trae Nombre y Legajo: alcanza para rearmar la nómina
+                ImportService().import_roster(path)
+                report = ImportService().import_history(path)
+                self.assertEqual((report.imported, report.rejected), (4, 0))
+                self.assertEqual(self._records(), expected)
+
+    def test_cancel_leaves_no_partial_file(self) -> None:
+        path = self.dir / "cancelada.csv"
+        with mock.patch("services.export_service._PROGRESS_EVERY", 2):
+            with self.assertRaises(ExportacionCancelada):
+                ExportService().export(path, "2026-01-01", "2026-12-31", progress=lambda _n: False)
+        self.assertFalse(path.exists())
+
+    def test_invalid_arguments(self) -> None:
+        with self.assertRaises(AppError):
+            ExportService().export(self.dir / "x.csv", "2026-12-31", "2026-01-01")
+        with self.assertRaises(AppError):
+            ExportService().export(self.dir / "x.txt", "2026-01-01", "2026-12-31")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+import csv
+import tempfile
+import unittest
+from pathlib import Path
+
+from tests import fresh_database
+from data.db_utils import get_connection
+from exceptions import AppError
+from services.import_service import ImportService
+
+"""Importación de nómina e historial desde CSV/Excel: altas por tandas, rechazos por fila y cancelación."""
+
+
+class ImportServiceTest(unittest.TestCase):
+    def setUp(self) -> None:
+        fresh_database()
+        self.dir = Path(tempfile.mkdtemp(prefix="trabajo_remoto_import_"))
+
+    def _csv(self, name: str, rows: list[list[str]], delimiter: str = ",") -> Path:
+        path = self.dir / name
+        with open(path, "w", newline="", encoding="utf-8-sig") as f:
+            csv.writer(f, delimiter=delimiter).writerows(rows)
+        return path
+
+    def _records(self) -> list[tuple[str, str]]:
+        with get_connection() as conn:
+            return conn.execute(
+                "SELECT u.docket, r.date FROM records r JOIN users u ON u.id = r.user_id ORDER BY r.date"
+            ).fetchall()
+
+    def test_roster_rejects_missing_and_duplicated_dockets(self) -> None:
+        path = self._csv("nomina.csv", [
+            ["Legajo", "Nombre"],
+            ["L1", "Ana"],
+            ["", "Sin legajo"],
+            ["L1", "Ana otra vez"],
+            ["L2", "Beto"],
+        ], delimiter=";")
+        report = ImportService().import_roster(path)
+        self.assertEqual((report.rows_read, report.imported, report.rejected), (4, 2, 2))
+        self.assertEqual([r.row for r in report.rejects], [3, 4])
+
+        # Reimportar: los legajos existentes se rechazan
+        again = ImportService().import_roster(path)
+        self.assertEqual(again.imported, 0)
+
+    def test_history_validates_each_row(self) -> None:
+        ImportService().import_roster(self._csv("nomina.csv", [["Nombre", "Legajo"], ["Ana", "L1"]]))
+        path = self._csv("historial.csv", [
+            ["Fecha", "Legajo"],
+            ["06/10/2026", "L1"],    # martes, formato dd/mm/aaaa
+            ["2026-10-08", "L1"],    # misma semana
+            ["2026-10-12", "L1"],    # lunes
+            ["no-es-fecha", "L1"],
+            ["2026-10-14", "L9"],    # legajo desconocido
+            ["2026-10-16", "L1"],
+        ])
+        report = ImportService().import_history(path)
+        self.assertEqual((report.imported, report.rejected), (2, 4))
+        self.assertEqual(sorted(r.row for r in report.rejects), [3, 4, 5, 6])
+        self.assertEqual(self._records(), [("L1", "2026-10-06"), ("L1", "2026-10-16")])
+
+    def test_missing_header_column_is_an_error(self) -> None:
+        with self.assertRaises(AppError):
+            ImportService().import_history(self._csv("malo.csv", [["Nombre", "Fecha"], ["Ana", "2026-10-06"]]))
+
+    def test_reject_detail_is_capped(self) -> None:
+        rows = [["Nombre", "Legajo"]] + [["", f"L{i}"] for i in range(10)]
+        report = ImportService(max_rejects=3).import_roster(self._csv("vacios.csv", rows))
+        self.assertEqual(report.rejected, 10)
+        self.assertEqual(len(report.rejects), 3)
+
+    def test_cancel_keeps_written_batches(self) -> None:
+        rows = [["Nombre", "Legajo"]] + [[f"Empleado {i}", f"L{i}"] for i in range(10)]
+        seen = []
+
+        def progress(p) -> bool:
+            seen.append(p.imported)
+            return False
+
+        report = ImportService(batch_size=4).import_roster(self._csv("nomina.csv", rows), progress)
+        self.assertTrue(report.cancelled)
+        self.assertEqual(report.imported, 4)
+        # Se corta tras la primera tanda; el último aviso repite el total final
+        self.assertEqual(set(seen), {4})
+        with get_connection() as conn:
+            self.assertEqual(conn.execute("SELECT COUNT(*) FROM users").fetchone()[0], 4)
+
+    def test_xlsx_roster_with_numeric_dockets(self) -> None:
+        from openpyxl import Workbook
+
+        path = self.dir / "nomina.xlsx"
+        wb = Workbook()
+        ws = wb.active
+        ws.append(["Nombre", "Legajo"])
+        ws.append(["Ana", 101])
+        ws.append(["Beto", 102.0])
+        wb.save(path)
+        report = ImportService().import_roster(path)
+        self.assertEqual((report.imported, report.rejected), (2, 0))
+        with get_connection() as conn:
+            dockets = {row[0] for row in conn.execute("SELECT docket FROM users")}
+        self.assertEqual(dockets, {"101", "102"})
+
+
+if __name__ == "__main__":
+    unittest.main()
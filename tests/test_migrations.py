@@ -0,0 +1,81 @@
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+
+import tests  # noqa: F401  (LOCALAPPDATA temporal antes de importar config)
+from data.db_utils import configure_database, get_connection, transaction
+from data.migrations import LATEST_VERSION, current_version
+from data.schema import create_tables, delete_duplicate_week_records, duplicate_week_records
+from exceptions import ErrorDeBaseDeDatos
+
+"""Migraciones sobre una base con el esquema original (versión 0)."""
+
+_LEGACY_SCHEMA = """
+    CREATE TABLE users (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL UNIQUE,
+        docket TEXT NOT NULL UNIQUE
+    );
+    CREATE TABLE records (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER NOT NULL,
+        date DATE NOT NULL,
+        week_day TEXT NOT NULL,
+        FOREIGN KEY(user_id) REFERENCES users(id),
+        UNIQUE(user_id, date)
+    );
+    INSERT INTO users(name, docket) VALUES ('Ana', '1'), ('Beto', '2');
+"""
+
+
+class LegacyMigrationTest(unittest.TestCase):
+    def setUp(self) -> None:
+        path = Path(tempfile.mkdtemp(prefix="trabajo_remoto_legacy_")) / "legacy.db"
+        conn = sqlite3.connect(path)
+        conn.executescript(_LEGACY_SCHEMA)
+        conn.close()
+        configure_database(path)
+
+    def _insert(self, rows: list[tuple[int, str, str]]) -> None:
+        with transaction() as conn:
+            conn.executemany("INSERT INTO records(user_id, date, week_day) VALUES (?, ?, ?)", rows)
+
+    def test_migrates_legacy_database_to_latest(self) -> None:
+        self._insert([(1, "2026-10-06", "Martes"), (2, "2026-10-07", "Miércoles")])
+        create_tables()
+        self.assertEqual(current_version(), LATEST_VERSION)
+        with get_connection() as conn:
+            rows = conn.execute("SELECT user_id, date FROM week_assignments ORDER BY user_id").fetchall()
+            counts = dict(conn.execute("SELECT date, remote FROM day_counts").fetchall())
+        self.assertEqual(rows, [(1, "2026-10-06"), (2, "2026-10-07")])
+        self.assertEqual(counts, {"2026-10-06": 1, "2026-10-07": 1})
+
+    def test_duplicate_week_blocks_migration_without_changes(self) -> None:
+        self._insert([(1, "2026-10-06", "Martes"), (1, "2026-10-08", "Jueves")])
+        with self.assertRaises(ErrorDeBaseDeDatos):
+            create_tables()
+        self.assertEqual(current_version(), 0)
+        with get_connection() as conn:
+            self.assertEqual(conn.execute("SELECT COUNT(*) FROM records").fetchone()[0], 2)
+
+    def test_repair_keeps_latest_record_per_week(self) -> None:
+        self._insert([
+            (1, "2026-10-06", "Martes"),
+            (1, "2026-10-08", "Jueves"),
+            (1, "2026-10-14", "Miércoles"),
+            (2, "2026-10-07", "Miércoles"),
+        ])
+        with get_connection() as conn:
+            self.assertEqual([(r[1], r[2]) for r in duplicate_week_records(conn)], [(1, "2026-10-06")])
+        with transaction() as conn:
+            self.assertEqual(delete_duplicate_week_records(conn), 1)
+        create_tables()
+        self.assertEqual(current_version(), LATEST_VERSION)
+        with get_connection() as conn:
+            dates = [r[0] for r in conn.execute("SELECT date FROM records ORDER BY date")]
+        self.assertEqual(dates, ["2026-10-07", "2026-10-08", "2026-10-14"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,123 @@
+import unittest
+from datetime import date, timedelta
+
+from tests import fresh_database
+from data.capacity_repo import CapacityRepository
+from data.assignament_repo import RecordRespository
+from data.user_repo import UserRepository
+from exceptions import CupoDiarioCompleto
+from services.assignment_service import AsignacionService
+from services.planner import WeekPlanner
+
+"""Planificador semanal y de varias semanas: reglas y cupos al proponer y al guardar."""
+
+TUESDAY, WEDNESDAY, THURSDAY, FRIDAY = 1, 2, 3, 4
+
+
+def _day(week_start: date, weekday: int) -> str:
+    return (week_start + timedelta(days=weekday)).isoformat()
+
+
+class _PlannerCase(unittest.TestCase):
+    def setUp(self) -> None:
+        fresh_database()
+        today = date.today()
+        # La semana siguiente: siempre editable y con una semana posterior planificable
+        self.week = today - timedelta(days=today.weekday()) + timedelta(weeks=1)
+        self.service = AsignacionService(planning_weeks=4)
+        self.planner = WeekPlanner()
+
+    def _users(self, n: int) -> list[int]:
+        return UserRepository.create_many((f"Empleado {i}", f"P-{i:04d}") for i in range(n)).ids
+
+
+class WeekPlannerTest(_PlannerCase):
+    def test_propose_respects_previous_week_and_capacity(self) -> None:
+        ids = self._users(40)
+        prev = self.week - timedelta(weeks=1)
+        RecordRespository.create_many((uid, _day(prev, TUESDAY), "Martes") for uid in ids[:20])
+        plan = self.planner.propose(self.week, capacity={"Martes": 10, "Miércoles": 10, "Jueves": 10, "Viernes": 10})
+        self.assertEqual(len(plan.assignments), 40)
+        for a in plan.assignments:
+            if a.user_id in ids[:20]:
+                self.assertNotEqual(a.week_day, "Martes")
+        self.assertTrue(all(load <= 10 for load in plan.load_by_day.values()))
+
+    def test_propose_avoids_weekday_of_following_week(self) -> None:
+        (uid,) = self._users(1)
+        RecordRespository.create_many([(uid, _day(self.week + timedelta(weeks=1), TUESDAY), "Martes")])
+        for weekday in (WEDNESDAY, THURSDAY, FRIDAY):
+            CapacityRepository.set_limit(weekday, 0)
+        plan = self.planner.propose(self.week)
+        self.assertEqual(plan.assignments, ())
+        self.assertEqual(plan.unassigned, (uid,))
+
+    def test_apply_week_plan_rechecks_capacity_at_write_time(self) -> None:
+        ids = self._users(3)
+        for weekday in (WEDNESDAY, THURSDAY, FRIDAY):
+            CapacityRepository.set_limit(weekday, 0)
+        CapacityRepository.set_limit(TUESDAY, 2)
+        plan = self.planner.propose(self.week)
+        self.assertEqual(len(plan.assignments), 2)
+        # Entre la propuesta y la escritura alguien ocupa un lugar del Martes
+        self.service.assign_day(ids[2], _day(self.week, TUESDAY))
+        result = self.service.apply_week_plan(plan)
+        self.assertEqual(len(result.records), 1)
+        (rejected,) = result.rejected
+        self.assertIsInstance(rejected.error, CupoDiarioCompleto)
+
+    def test_apply_week_plan_rechecks_repeat_rule(self) -> None:
+        (uid,) = self._users(1)
+        plan = self.planner.propose(self.week)
+        (proposed,) = plan.assignments
+        # Se planifica la semana siguiente en el mismo día antes de guardar
+        following = date.fromisoformat(proposed.date) + timedelta(weeks=1)
+        self.service.assign_day(uid, following.isoformat())
+        result = self.service.apply_week_plan(plan)
+        self.assertEqual(result.records, [])
+        self.assertEqual(len(result.needs_override), 1)
+
+
+class HorizonPlannerTest(_PlannerCase):
+    def test_horizon_avoids_weekday_of_week_after_horizon(self) -> None:
+        (uid,) = self._users(1)
+        # Miércoles fijo en la primera semana y Martes ya registrado después del horizonte:
+        # la segunda semana no puede ir ni Miércoles ni Martes
+        RecordRespository.create_many([
+            (uid, _day(self.week, WEDNESDAY), "Miércoles"),
+            (uid, _day(self.week + timedelta(weeks=2), TUESDAY), "Martes"),
+        ])
+        for weekday in (THURSDAY, FRIDAY):
+            CapacityRepository.set_limit(weekday, 0)
+        horizon = self.planner.propose_horizon(2, self.week)
+        first, last = horizon.weeks
+        self.assertEqual(first.assignments, ())
+        self.assertEqual(last.assignments, ())
+        self.assertEqual(last.unassigned, (uid,))
+
+    def test_horizon_has_no_consecutive_repeats(self) -> None:
+        self._users(30)
+        horizon = self.planner.propose_horizon(6, self.week)
+        self.assertEqual(horizon.metrics.repeats, 0)
+        self.assertEqual(horizon.metrics.unassigned, 0)
+        result = self.service.apply_horizon_plan(horizon)
+        # La última semana del horizonte (4 después de la siguiente) excede la planificación
+        editable = [a for a in horizon.assignments if self.service.is_week_editable(date.fromisoformat(a.date))]
+        self.assertEqual(len(result.records), len(editable))
+        self.assertEqual(len(result.rejected), len(horizon.assignments) - len(editable))
+
+    def test_apply_horizon_plan_rechecks_capacity(self) -> None:
+        ids = self._users(2)
+        CapacityRepository.set_limit(TUESDAY, 1)
+        for weekday in (WEDNESDAY, THURSDAY, FRIDAY):
+            CapacityRepository.set_limit(weekday, 1)
+        horizon = self.planner.propose_horizon(2, self.week)
+        taken = next(a for a in horizon.weeks[0].assignments)
+        other = next(uid for uid in ids if uid != taken.user_id)
+        self.service.assign_day(other, taken.date)
+        result = self.service.apply_horizon_plan(horizon)
+        self.assertTrue(any(isinstance(c.error, CupoDiarioCompleto) for c in result.rejected))
+
+
+if __name__ == "__main__":
+    unittest.main()
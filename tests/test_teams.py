@@ -0,0 +1,89 @@
+import unittest
+from datetime import date, timedelta
+
+from tests import fresh_database
+from data.assignament_repo import RecordRespository
+from data.user_repo import UserRepository
+from exceptions import AppError, EquipoYaExiste
+from services.team_service import TeamService
+
+"""Jerarquía de equipos: árbol, miembros con subequipos y estado semanal agregado."""
+
+
+class TeamServiceTest(unittest.TestCase):
+    def setUp(self) -> None:
+        fresh_database()
+        self.service = TeamService()
+        # Ventas > (Norte > Norte Centro), Ventas > Sur; Soporte sin subequipos
+        self.ventas = self.service.create_team("Ventas").id
+        self.norte = self.service.create_team("Norte", self.ventas).id
+        self.centro = self.service.create_team("Norte Centro", self.norte).id
+        self.sur = self.service.create_team("Sur", self.ventas).id
+        self.soporte = self.service.create_team("Soporte").id
+        self.users = [UserRepository.create(f"Empleado {i}", f"T-{i:03d}") for i in range(6)]
+        u = self.users
+        self.service.assign_members([u[0]], self.ventas)
+        self.service.assign_members([u[1]], self.norte)
+        self.service.assign_members([u[2], u[3]], self.centro)
+        self.service.assign_members([u[4]], self.sur)
+        # u[5] queda sin equipo
+        self.monday = date.today() - timedelta(days=date.today().weekday())
+
+    def _register(self, user_id: int, offset: int, week_day: str) -> None:
+        RecordRespository.create_record(user_id, (self.monday + timedelta(days=offset)).isoformat(), week_day)
+
+    def test_tree_lists_each_team_before_its_subteams(self) -> None:
+        tree = [(team.name, depth) for team, depth in self.service.team_tree()]
+        self.assertEqual(
+            tree,
+            [("Soporte", 0), ("Ventas", 0), ("Norte", 1), ("Norte Centro", 2), ("Sur", 1)],
+        )
+
+    def test_member_ids_include_subteams_on_request(self) -> None:
+        u = self.users
+        self.assertEqual(self.service.member_ids(self.ventas), set(u[:5]))
+        self.assertEqual(self.service.member_ids(self.norte), {u[1], u[2], u[3]})
+        self.assertEqual(self.service.member_ids(self.norte, include_subteams=False), {u[1]})
+        self.assertEqual(self.service.member_ids(self.soporte), set())
+
+    def test_week_stats_aggregate_subteams(self) -> None:
+        u = self.users
+        self._register(u[1], 1, "Martes")
+        self._register(u[2], 1, "Martes")
+        self._register(u[4], 3, "Jueves")
+        self._register(u[5], 2, "Miércoles")
+        # Registro de otra semana: no cuenta
+        RecordRespository.create_record(u[3], (self.monday - timedelta(days=6)).isoformat(), "Martes")
+
+        stats = self.service.week_stats(self.monday)
+        self.assertEqual(set(stats), {self.ventas, self.norte, self.centro, self.sur, self.soporte, None})
+        ventas = stats[self.ventas]
+        self.assertEqual((ventas.members, ventas.registered, ventas.pending), (5, 3, 2))
+        self.assertEqual(ventas.by_day, {"Martes": 2, "Jueves": 1})
+        self.assertEqual((stats[self.norte].members, stats[self.norte].registered), (3, 2))
+        self.assertEqual((stats[self.centro].members, stats[self.centro].registered), (2, 1))
+        self.assertEqual((stats[self.soporte].members, stats[self.soporte].registered), (0, 0))
+        self.assertEqual((stats[None].members, stats[None].by_day), (1, {"Miércoles": 1}))
+
+        only_norte = self.service.week_stats(self.monday, team_id=self.norte)
+        self.assertEqual(list(only_norte), [self.norte])
+        self.assertEqual(only_norte[self.norte].by_day, {"Martes": 2})
+
+    def test_delete_and_rename_rules(self) -> None:
+        with self.assertRaises(EquipoYaExiste):
+            self.service.create_team("Soporte")
+        with self.assertRaises(EquipoYaExiste):
+            self.service.rename_team(self.sur, "Norte")
+        with self.assertRaises(AppError):
+            self.service.create_team("   ")
+        # Con subequipos no se puede borrar; sin ellos, los miembros quedan sin equipo
+        with self.assertRaises(AppError):
+            self.service.delete_team(self.norte)
+        self.service.delete_team(self.centro)
+        self.assertEqual(self.service.member_ids(self.norte), {self.users[1]})
+        stats = self.service.week_stats(self.monday)
+        self.assertEqual(stats[None].members, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+import unittest
+from unittest import mock
+
+from tests import fresh_database
+from data.db_utils import get_connection
+from data.schema import users_fts_exists
+from data.user_repo import UserRepository
+
+"""Búsqueda de empleados por nombre y legajo: índice FTS5 y respaldo con LIKE."""
+
+
+def _names(rows) -> list[str]:
+    return sorted(name for _id, name, _docket in rows)
+
+
+class UserSearchTest(unittest.TestCase):
+    def setUp(self) -> None:
+        fresh_database()
+        with get_connection() as conn:
+            if not users_fts_exists(conn):
+                self.skipTest("SQLite sin FTS5")
+        self.ana = UserRepository.create("Ana García", "L-0012")
+        UserRepository.create("Anabel Pérez", "L-0345")
+        UserRepository.create("Bruno 100% Díaz", "X_77")
+
+    def test_prefix_match_ignores_case_and_accents(self) -> None:
+        self.assertEqual(_names(UserRepository.search("gar")), ["Ana García"])
+        self.assertEqual(_names(UserRepository.search("ANA")), ["Ana García", "Anabel Pérez"])
+        self.assertEqual(_names(UserRepository.search("perez")), ["Anabel Pérez"])
+
+    def test_every_word_must_match(self) -> None:
+        self.assertEqual(_names(UserRepository.search("ana garc")), ["Ana García"])
+        self.assertEqual(UserRepository.search("ana bruno"), [])
+
+    def test_docket_with_punctuation(self) -> None:
+        self.assertEqual(_names(UserRepository.search("L-0012")), ["Ana García"])
+        self.assertEqual(_names(UserRepository.search("0345")), ["Anabel Pérez"])
+
+    def test_punctuation_only_words_are_ignored(self) -> None:
+        self.assertEqual(UserRepository.search("- &"), [])
+        self.assertEqual(_names(UserRepository.search("garcía -")), ["Ana García"])
+
+    def test_index_follows_updates_and_deletes(self) -> None:
+        UserRepository.update(self.ana, "Ana Fernández", "L-0012")
+        self.assertEqual(UserRepository.search("garcia"), [])
+        self.assertEqual(_names(UserRepository.search("fernan")), ["Ana Fernández"])
+        UserRepository.delete_user(self.ana)
+        self.assertEqual(UserRepository.search("fernan"), [])
+
+
+class UserSearchLikeFallbackTest(unittest.TestCase):
+    """Sin users_fts (SQLite sin FTS5) la búsqueda recurre a LIKE con comodines escapados."""
+
+    def setUp(self) -> None:
+        fresh_database()
+        patcher = mock.patch("data.user_repo.users_fts_exists", return_value=False)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        UserRepository.create("Ana García", "L0012")
+        UserRepository.create("Bruno 100% Díaz", "X_77")
+        UserRepository.create("Carla Ruiz", "X177")
+
+    def test_wildcards_are_literal(self) -> None:
+        self.assertEqual(_names(UserRepository.search("100%")), ["Bruno 100% Díaz"])
+        self.assertEqual(_names(UserRepository.search("X_7")), ["Bruno 100% Díaz"])
+
+    def test_punctuation_only_words_are_ignored(self) -> None:
+        self.assertEqual(UserRepository.search("%"), [])
+        self.assertEqual(_names(UserRepository.search("ana -")), ["Ana García"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,8 +2,11 @@
 
 AddUserDialog: captura nombre y legajo (docket) de un nuevo empleado.
 AssignDayDialog: selector de fecha con calendario emergente (no valida reglas).
+ExportDialog: filtros de exportación (semana actual o rango, empleado seleccionado).
 """
 
+from datetime import date, timedelta
+
 from PyQt6.QtCore import QDate
 from PyQt6.QtWidgets import (
     QDialog,
@@ -13,6 +16,8 @@ from PyQt6.QtWidgets import (
     QLineEdit,
     QPushButton,
     QDateEdit,
+    QCheckBox,
+    QRadioButton,
 )
 
 
@@ -75,3 +80,75 @@ class AssignDayDialog(QDialog):
         return f"{qd.year():04d}-{qd.month():02d}-{qd.day():02d}"
 
 
+class ExportDialog(QDialog):
+    """Filtros para exportar días remotos: semana actual o rango de fechas.
+
+    `selected_count` es la cantidad de empleados seleccionados en el listado; si hay
+    alguno se habilita la opción de limitar la exportación a ellos.
+    """
+    def __init__(self, parent=None, selected_count: int = 0) -> None:
+        super().__init__(parent)
+        self.setWindowTitle("Exportar días remotos")
+        self._current_week = QRadioButton("Semana actual")
+        self._range = QRadioButton("Rango de fechas")
+        self._current_week.setChecked(True)
+
+        today = date.today()
+        self._from = QDateEdit()
+        self._from.setCalendarPopup(True)
+        self._from.setDate(_to_qdate(today - timedelta(days=90)))
+        self._to = QDateEdit()
+        self._to.setCalendarPopup(True)
+        self._to.setDate(_to_qdate(today))
+        label = (
+            "Solo el empleado seleccionado" if selected_count <= 1
+            else f"Solo los {selected_count} empleados seleccionados"
+        )
+        self._only_selected = QCheckBox(label)
+        self._only_selected.setEnabled(selected_count > 0)
+
+        range_row = QHBoxLayout()
+        range_row.addWidget(QLabel("Desde"))
+        range_row.addWidget(self._from)
+        range_row.addWidget(QLabel("Hasta"))
+        range_row.addWidget(self._to)
+
+        layout = QVBoxLayout(self)
+        layout.addWidget(self._current_week)
+        layout.addWidget(self._range)
+        layout.addLayout(range_row)
+        layout.addWidget(self._only_selected)
+
+        self._range.toggled.connect(self._sync_enabled)
+        self._sync_enabled(False)
+
+        btns = QHBoxLayout()
+        btn_ok = QPushButton("Exportar")
+        btn_cancel = QPushButton("Cancelar")
+        btn_ok.clicked.connect(self.accept)
+        btn_cancel.clicked.connect(self.reject)
+        btns.addWidget(btn_ok)
+        btns.addWidget(btn_cancel)
+        layout.addLayout(btns)
+
+    def _sync_enabled(self, use_range: bool) -> None:
+        self._from.setEnabled(use_range)
+        self._to.setEnabled(use_range)
+
+    def use_current_week(self) -> bool:
+        return self._current_week.isChecked()
+
+    def date_range_iso(self) -> tuple[str, str]:
+        """(desde, hasta) en formato YYYY-MM-DD."""
+        return _qdate_iso(self._from.date()), _qdate_iso(self._to.date())
+
+    def only_selected(self) -> bool:
+        return self._only_selected.isEnabled() and self._only_selected.isChecked()
+
+
+def _to_qdate(d: date) -> QDate:
+    return QDate(d.year, d.month, d.day)
+
+
+def _qdate_iso(qd: QDate) -> str:
+    return f"{qd.year():04d}-{qd.month():02d}-{qd.day():02d}"
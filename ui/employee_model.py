@@ -0,0 +1,269 @@
+"""Modelo de lista de empleados para el sidebar (QListView).
+
+EmployeeListModel guarda las filas indexadas por id de usuario y, al recibir una
+nueva nómina con `sync`, aplica solo las diferencias: altas (beginInsertRows),
+bajas (beginRemoveRows), cambios de datos (dataChanged) y reordenamientos
+(beginMoveRows, o layoutChanged si son muchos). La vista conserva selección y
+scroll, y no se recrean objetos por fila: con decenas de miles de empleados el
+costo de un refresco es proporcional a lo que cambió más un recorrido lineal.
+
+`set_filter` limita las filas visibles a un conjunto de ids (búsqueda del sidebar)
+sin perder el orden ni los datos del resto.
+"""
+
+from bisect import bisect_left
+from typing import Iterable, Optional
+
+from PyQt6.QtCore import QAbstractListModel, QModelIndex, Qt
+from PyQt6.QtGui import QBrush, QColor
+
+from models.user import User
+
+# Por encima de esta cantidad de filas movidas conviene un único layoutChanged
+_MAX_ROW_MOVES = 64
+
+
+class EmployeeListModel(QAbstractListModel):
+    """Empleados con su estado semanal: primero los pendientes, luego los registrados."""
+
+    UserIdRole = Qt.ItemDataRole.UserRole
+    RegisteredRole = Qt.ItemDataRole.UserRole + 1
+
+    def __init__(self, parent=None) -> None:
+        super().__init__(parent)
+        self._ids: list[int] = []            # filas visibles, en orden
+        self._order: list[int] = []          # todos los empleados, en orden
+        self._order_pos: Optional[dict[int, int]] = None
+        self._filter: Optional[set[int]] = None
+        self._users: dict[int, User] = {}
+        self._registered: set[int] = set()
+        self._row_of: Optional[dict[int, int]] = None  # id -> fila (se recalcula a demanda)
+        self._marked_brush = QBrush(QColor(2, 106, 167))
+
+    # === API de Qt ===
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._ids)
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        uid = self._ids[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self._users[uid].name
+        if role == self.UserIdRole:
+            return uid
+        if role == self.RegisteredRole:
+            return uid in self._registered
+        if role == Qt.ItemDataRole.ForegroundRole:
+            # Solo texto distinto para empleados registrados
+            return self._marked_brush if uid in self._registered else None
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return "Registrado esta semana" if uid in self._registered else "Sin registro esta semana"
+        return None
+
+    # === Consultas ===
+    def user(self, user_id: int) -> Optional[User]:
+        return self._users.get(user_id)
+
+    def row_of(self, user_id: int) -> Optional[int]:
+        if self._row_of is None:
+            self._row_of = {uid: row for row, uid in enumerate(self._ids)}
+        return self._row_of.get(user_id)
+
+    def index_of(self, user_id: int) -> QModelIndex:
+        row = self.row_of(user_id)
+        return self.index(row, 0) if row is not None else QModelIndex()
+
+    def neighbours(self, user_id: int, radius: int) -> list[int]:
+        """Ids de hasta `radius` filas visibles a cada lado de `user_id`, de la más cercana a la más lejana."""
+        row = self.row_of(user_id)
+        if row is None:
+            return []
+        out: list[int] = []
+        for step in range(1, radius + 1):
+            if row + step < len(self._ids):
+                out.append(self._ids[row + step])
+            if row - step >= 0:
+                out.append(self._ids[row - step])
+        return out
+
+    # === Actualización ===
+    def set_filter(self, user_ids: Optional[set[int]], refresh: bool = True) -> None:
+        """Muestra solo `user_ids` (None = todos).
+
+        Con `refresh=False` solo se guarda y lo aplica el próximo `sync` por diferencias.
+        """
+        self._filter = user_ids
+        if not refresh:
+            return
+        self.beginResetModel()
+        self._ids = self._visible(self._order)
+        self._row_of = None
+        self.endResetModel()
+
+    def _visible(self, order: list[int]) -> list[int]:
+        f = self._filter
+        if f is None:
+            return list(order)
+        if len(f) * 8 < len(order):
+            # Pocos resultados: ordenarlos por posición es más barato que recorrer todo
+            if self._order_pos is None:
+                self._order_pos = {uid: i for i, uid in enumerate(order)}
+            pos = self._order_pos
+            return sorted((uid for uid in f if uid in pos), key=pos.__getitem__)
+        return [uid for uid in order if uid in f]
+
+    def set_marked_color(self, color: QColor) -> None:
+        """Color de texto de los registrados (cambia con el tema); no altera filas."""
+        self._marked_brush = QBrush(color)
+        if self._ids:
+            self.dataChanged.emit(
+                self.index(0, 0), self.index(len(self._ids) - 1, 0), [Qt.ItemDataRole.ForegroundRole]
+            )
+
+    def sync(self, status_list: Iterable[tuple[User, bool]]) -> None:
+        """Lleva el modelo a `status_list` aplicando solo las diferencias.
+
+        Orden resultante: no registrados (arriba) y registrados (abajo), cada grupo en
+        el orden recibido.
+        """
+        pending: list[int] = []
+        done: list[int] = []
+        users: dict[int, User] = {}
+        registered: set[int] = set()
+        for u, is_marked in status_list:
+            if u.id is None:
+                continue
+            users[u.id] = u
+            if is_marked:
+                registered.add(u.id)
+                done.append(u.id)
+            else:
+                pending.append(u.id)
+        self._order = pending + done
+        self._order_pos = None
+        desired = self._visible(self._order)
+
+        if not self._ids:
+            self.beginResetModel()
+            self._ids, self._users, self._registered = desired, users, registered
+            self._row_of = None
+            self.endResetModel()
+            return
+
+        self._remove_missing(set(desired))
+        changed = [
+            uid for uid in self._ids
+            if users[uid] != self._users[uid] or (uid in registered) != (uid in self._registered)
+        ]
+        self._users = users
+        self._registered = registered
+        self._reorder([uid for uid in desired if uid in self._row_of_current()])
+        self._insert_new(desired)
+        self._emit_changed(changed)
+
+    # === Pasos de `sync` ===
+    def _row_of_current(self) -> dict[int, int]:
+        self.row_of(-1)  # fuerza el recálculo si hace falta
+        return self._row_of  # type: ignore[return-value]
+
+    def _remove_missing(self, keep: set[int]) -> None:
+        gone = [row for row, uid in enumerate(self._ids) if uid not in keep]
+        # De abajo hacia arriba, en rangos contiguos
+        for first, last in reversed(_ranges(gone)):
+            self.beginRemoveRows(QModelIndex(), first, last)
+            del self._ids[first:last + 1]
+            self._row_of = None
+            self.endRemoveRows()
+
+    def _reorder(self, desired: list[int]) -> None:
+        """Reordena filas existentes a `desired` (mismo conjunto de ids)."""
+        rank = {uid: i for i, uid in enumerate(desired)}
+        keep = _longest_increasing_ranks([rank[uid] for uid in self._ids])
+        moves = len(desired) - len(keep)
+        if moves == 0:
+            return
+        if moves > _MAX_ROW_MOVES:
+            self._relayout(desired)
+            return
+        # Las filas de la subsecuencia creciente más larga quedan fijas; el resto se
+        # ubica, en orden, inmediatamente después de su predecesor deseado.
+        for r, uid in enumerate(desired):
+            if r in keep:
+                continue
+            src = self._ids.index(uid)
+            dst = 0 if r == 0 else self._ids.index(desired[r - 1]) + 1
+            if dst in (src, src + 1):
+                continue
+            self.beginMoveRows(QModelIndex(), src, src, QModelIndex(), dst)
+            del self._ids[src]
+            self._ids.insert(dst - 1 if dst > src else dst, uid)
+            self.endMoveRows()
+        self._row_of = None
+
+    def _relayout(self, desired: list[int]) -> None:
+        self.layoutAboutToBeChanged.emit()
+        persistent = self.persistentIndexList()
+        tracked = [self._ids[i.row()] if i.isValid() else None for i in persistent]
+        self._ids = list(desired)
+        self._row_of = None
+        self.changePersistentIndexList(
+            persistent, [self.index_of(uid) if uid is not None else QModelIndex() for uid in tracked]
+        )
+        self.layoutChanged.emit()
+
+    def _insert_new(self, desired: list[int]) -> None:
+        present = self._row_of_current()
+        if len(present) == len(desired):
+            return
+        k = 0
+        while k < len(desired):
+            if desired[k] in present:
+                k += 1
+                continue
+            j = k
+            while j < len(desired) and desired[j] not in present:
+                j += 1
+            self.beginInsertRows(QModelIndex(), k, j - 1)
+            self._ids[k:k] = desired[k:j]
+            self.endInsertRows()
+            k = j
+        self._row_of = None
+
+    def _emit_changed(self, changed: list[int]) -> None:
+        rows = sorted(r for r in (self.row_of(uid) for uid in changed) if r is not None)
+        for first, last in _ranges(rows):
+            self.dataChanged.emit(self.index(first, 0), self.index(last, 0))
+
+
+def _ranges(rows: list[int]) -> list[tuple[int, int]]:
+    """Agrupa filas ordenadas en rangos contiguos [(primera, última)]."""
+    out: list[tuple[int, int]] = []
+    for r in rows:
+        if out and out[-1][1] == r - 1:
+            out[-1] = (out[-1][0], r)
+        else:
+            out.append((r, r))
+    return out
+
+
+def _longest_increasing_ranks(seq: list[int]) -> set[int]:
+    """Valores de una subsecuencia estrictamente creciente más larga de `seq` (O(n log n))."""
+    tails: list[int] = []       # menor valor final de cada longitud
+    tail_pos: list[int] = []    # posición en seq de ese valor
+    parent = [-1] * len(seq)
+    for i, v in enumerate(seq):
+        k = bisect_left(tails, v)
+        if k == len(tails):
+            tails.append(v)
+            tail_pos.append(i)
+        else:
+            tails[k] = v
+            tail_pos[k] = i
+        parent[i] = tail_pos[k - 1] if k > 0 else -1
+    out: set[int] = set()
+    i = tail_pos[-1] if tail_pos else -1
+    while i >= 0:
+        out.add(seq[i])
+        i = parent[i]
+    return out
@@ -8,13 +8,19 @@ Nota: Esta vista no contiene la lógica de negocio. Invoca servicios para consul
 estado y asignar/cambiar registros.
 """
 
+from typing import Optional
+
 from PyQt6.QtCore import Qt
 from PyQt6.QtWidgets import (
     QApplication,
+    QCheckBox,
+    QComboBox,
     QFrame,
     QLabel,
+    QLineEdit,
     QPushButton,
-    QListWidget,
+    QListView,
+    QProgressBar,
     QSizePolicy,
     QStyledItemDelegate,
     QStyle,
@@ -25,10 +31,25 @@ from PyQt6.QtWidgets import (
     QWidget,
 )
 from PyQt6.QtGui import QColor, QBrush
-from exceptions import AppError
+from exceptions import AppError, ExportacionCancelada
 from services.user_service import UserService
 from services.assignment_service import AsignacionService
-from .dialogs import AddUserDialog
+from services.import_service import ImportService
+from services.export_service import ExportService
+from services.search_index import UserSearchIndex
+from services.team_service import TeamService
+from models.batch import BatchResult
+from models.capacity import DayCapacity
+from models.summary import EmployeeSummary
+from models.team import Team, TeamWeekStats
+from models.week_status import WeekStatus
+from models.user import User
+from .dialogs import AddUserDialog, ExportDialog
+from .employee_model import EmployeeListModel
+from .summary_loader import SummaryLoader
+from .week_clock import WeekClock
+from .week_loader import WeekLoader
+from .workers import DbWorker, ProgressRelay
 from datetime import date, timedelta
 from PyQt6.QtWidgets import QButtonGroup
 from PyQt6.QtWidgets import QMessageBox
@@ -39,6 +60,11 @@ from PyQt6.QtCore import pyqtSignal
 from PyQt6.QtGui import QPainter, QPen, QBrush
 from PyQt6.QtCore import QRectF
 from PyQt6.QtCore import QTimer
+import logging
+
+logger = logging.getLogger(__name__)
+
+_WEEKDAY_NAMES = ["Lunes", "Martes", "Miércoles", "Jueves", "Viernes", "Sábado", "Domingo"]
 
 
 class ThemeSwitch(QWidget):
@@ -111,6 +137,22 @@ class MainWindow(QMainWindow):
         self.setMinimumSize(960, 600)
         self._user_service = UserService()
         self._assign_service = AsignacionService()
+        self._team_service = TeamService()
+        # Miembros del equipo elegido en el sidebar (None = todos los equipos)
+        self._team_filter: Optional[set[int]] = None
+        self._team_stats: dict[Optional[int], TeamWeekStats] = {}
+        self._team_parents: dict[int, Optional[int]] = {}
+        # Semana mostrada (lunes) y nómina del último refresco (para repintar al navegar)
+        today = date.today()
+        self._current_week_start = today - timedelta(days=today.weekday())
+        self._roster: list[User] = []
+        # Las llamadas a servicios corren en el hilo de base de datos (la ventana no se congela)
+        self._db = DbWorker(self)
+        # Avance de las tareas largas en curso (importar/exportar), para cancelarlas al cerrar
+        self._job_relays: set[ProgressRelay] = set()
+        self._detail: Optional[EmployeeSummary] = None
+        # Búsqueda en memoria por nombre/legajo (no consulta SQLite al escribir)
+        self._search_index = UserSearchIndex()
 
         # Sidebar (izquierda): botón de alta y lista de empleados
         sidebar = QFrame()
@@ -134,13 +176,22 @@ class MainWindow(QMainWindow):
         emp_title_row.addWidget(self._emp_icon_label)
         emp_title_row.addWidget(empleados_label)
         emp_title_row.addStretch(1)
-        empleados_list = QListWidget()
+        # Modelo/vista: los refrescos aplican solo diferencias por fila (ver employee_model)
+        self._employee_model = EmployeeListModel(self)
+        empleados_list = QListView()
+        empleados_list.setModel(self._employee_model)
+        empleados_list.setEditTriggers(QListView.EditTrigger.NoEditTriggers)
+        # Selección múltiple (Ctrl/Shift): un clic en el calendario asigna el día a todos
+        empleados_list.setSelectionMode(QListView.SelectionMode.ExtendedSelection)
         self._employees_list = empleados_list
         # Evitar rectángulo punteado de foco en la lista
         self._employees_list.setFocusPolicy(Qt.FocusPolicy.NoFocus)
         # Optimización de render: items de tamaño uniforme
         try:
             self._employees_list.setUniformItemSizes(True)
+            # Con nóminas grandes el layout se reparte en tandas entre eventos (no congela al filtrar)
+            self._employees_list.setLayoutMode(QListView.LayoutMode.Batched)
+            self._employees_list.setBatchSize(2000)
         except Exception:
             pass
         sidebar.setMinimumWidth(240)
@@ -155,11 +206,58 @@ class MainWindow(QMainWindow):
         # Icono se asigna en _apply_icon_palette
         top_new_btn.clicked.connect(self._on_add_user)
         self._top_new_btn = top_new_btn
-        sidebar_layout.insertWidget(0, top_new_btn, 0, Qt.AlignmentFlag.AlignLeft)
+        # Importación masiva desde Excel/CSV (nómina o historial)
+        import_btn = QPushButton("Importar")
+        import_btn.setProperty("btn", "secondary")
+        import_btn.setProperty("btn_size", "sm")
+        import_btn.setCursor(QCursor(Qt.CursorShape.PointingHandCursor))
+        import_btn.clicked.connect(self._on_import)
+        self._import_btn = import_btn
+        export_btn = QPushButton("Exportar")
+        export_btn.setProperty("btn", "secondary")
+        export_btn.setProperty("btn_size", "sm")
+        export_btn.setCursor(QCursor(Qt.CursorShape.PointingHandCursor))
+        export_btn.clicked.connect(self._on_export)
+        self._export_btn = export_btn
+        # Matriz semana × empleado (ventana aparte, se crea al abrirla)
+        matrix_btn = QPushButton("Semana")
+        matrix_btn.setProperty("btn", "secondary")
+        matrix_btn.setProperty("btn_size", "sm")
+        matrix_btn.setCursor(QCursor(Qt.CursorShape.PointingHandCursor))
+        matrix_btn.clicked.connect(self._on_open_matrix)
+        self._matrix_btn = matrix_btn
+        self._matrix = None
+        top_actions_row = QHBoxLayout()
+        top_actions_row.setSpacing(6)
+        top_actions_row.addWidget(top_new_btn)
+        top_actions_row.addWidget(import_btn)
+        top_actions_row.addWidget(export_btn)
+        top_actions_row.addWidget(matrix_btn)
+        top_actions_row.addStretch(1)
+        sidebar_layout.insertLayout(0, top_actions_row)
         sidebar_layout.insertSpacing(1, 4)
         emp_title_container = QFrame()
         emp_title_container.setLayout(emp_title_row)
         sidebar_layout.addWidget(emp_title_container)
+        self._search_edit = QLineEdit()
+        self._search_edit.setPlaceholderText("Buscar por nombre o legajo")
+        self._search_edit.setClearButtonEnabled(True)
+        sidebar_layout.addWidget(self._search_edit)
+        # Debounce: filtrar cuando se deja de escribir
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(120)
+        self._search_timer.timeout.connect(self._apply_search)
+        self._search_edit.textChanged.connect(lambda _text: self._search_timer.start())
+        # Filtro por equipo (con sus subequipos) y su estado de la semana
+        self._team_combo = QComboBox()
+        self._team_combo.addItem("Todos los equipos", None)
+        self._team_combo.currentIndexChanged.connect(self._on_team_changed)
+        sidebar_layout.addWidget(self._team_combo)
+        self._team_stats_label = QLabel("")
+        self._team_stats_label.setProperty("role", "metricTitle")
+        self._team_stats_label.setWordWrap(True)
+        sidebar_layout.addWidget(self._team_stats_label)
         # Dejar casi pegado el título a la lista
         sidebar_layout.addSpacing(0)
         sidebar_layout.addWidget(empleados_list, 1)
@@ -310,6 +408,18 @@ class MainWindow(QMainWindow):
         week_header_row.addWidget(self._week_icon_label)
         week_header_row.addWidget(self._lbl_week_title)
         week_header_row.addStretch(1)
+        # Navegación: semanas pasadas (solo lectura) y futuras hasta el límite de planificación
+        self._btn_prev_week = QPushButton("‹ Anterior")
+        self._btn_today_week = QPushButton("Hoy")
+        self._btn_next_week = QPushButton("Siguiente ›")
+        for nav_btn in (self._btn_prev_week, self._btn_today_week, self._btn_next_week):
+            nav_btn.setProperty("btn", "secondary")
+            nav_btn.setProperty("btn_size", "sm")
+            nav_btn.setCursor(QCursor(Qt.CursorShape.PointingHandCursor))
+            week_header_row.addWidget(nav_btn)
+        self._btn_prev_week.clicked.connect(lambda: self._go_to_week(self._current_week_start - timedelta(weeks=1)))
+        self._btn_today_week.clicked.connect(lambda: self._go_to_week(date.today()))
+        self._btn_next_week.clicked.connect(lambda: self._go_to_week(self._current_week_start + timedelta(weeks=1)))
 
         self._lbl_week_range = QLabel("")
         self._lbl_week_range.setStyleSheet("font-size: 13px;")
@@ -365,9 +475,36 @@ class MainWindow(QMainWindow):
         root_layout.addWidget(splitter)
         self.setCentralWidget(root)
 
+        # Indicador de actividad (no bloqueante): aparece solo si la DB tarda
+        self._busy_bar = QProgressBar()
+        self._busy_bar.setRange(0, 0)
+        self._busy_bar.setTextVisible(False)
+        self._busy_bar.setMaximumSize(120, 10)
+        self._busy_bar.setVisible(False)
+        self.statusBar().addPermanentWidget(self._busy_bar)
+        self.statusBar().setSizeGripEnabled(False)
+        self._busy_timer = QTimer(self)
+        self._busy_timer.setSingleShot(True)
+        self._busy_timer.setInterval(200)
+        self._busy_timer.timeout.connect(lambda: self._busy_bar.setVisible(True))
+        self._db.busyChanged.connect(self._on_db_busy)
+
         # Conexiones de UI
         btn_add_user.clicked.connect(self._on_add_user)
-        self._employees_list.currentItemChanged.connect(self._on_user_selected)
+        self._employees_list.selectionModel().currentChanged.connect(self._on_user_selected)
+        # Selección: pedidos coalescidos (flecha mantenida) y prefetch de filas vecinas
+        self._summaries = SummaryLoader(
+            self._db, self._fetch_summaries, self._employee_model.neighbours, self
+        )
+        self._summaries.summaryReady.connect(self._on_summary_ready)
+        self._summaries.failed.connect(self._on_db_error)
+        # Estado de la semana mostrada, con caché por semana y prefetch de las adyacentes
+        self._weeks = WeekLoader(self._db, self._assign_service.week_status, self)
+        self._weeks.weekReady.connect(self._on_week_ready)
+        self._weeks.failed.connect(self._on_db_error)
+        # Cambio de día/semana con la aplicación abierta (un timer a la próxima medianoche)
+        self._clock = WeekClock(self)
+        self._clock.dayChanged.connect(self._on_day_changed)
         self._day_group.buttonClicked.connect(self._on_day_selected)
         self._btn_edit.clicked.connect(self._on_edit_user)
         self._btn_delete.clicked.connect(self._on_delete_user)
@@ -395,68 +532,218 @@ class MainWindow(QMainWindow):
         # Flag para centrar y adaptar tamaño solo una vez al mostrarse
         self._did_center_once = False
 
-    def load_users(self) -> None:
-        """Carga y pinta el listado de empleados en el sidebar.
+    # ===== Hilo de base de datos =====
+    def _on_db_busy(self, busy: bool) -> None:
+        if busy:
+            self._busy_timer.start()
+        else:
+            self._busy_timer.stop()
+            self._busy_bar.setVisible(False)
 
-        El `id` queda asociado como `UserRole` en cada item para recuperarlo al seleccionar.
+    def _on_db_error(self, error: Exception) -> None:
+        """Muestra errores de negocio; los inesperados se registran y se informan genéricamente."""
+        if isinstance(error, AppError):
+            QMessageBox.warning(self, "Error", str(error))
+        else:
+            logger.error("Error inesperado en operación de base de datos", exc_info=error)
+            QMessageBox.critical(self, "Error", "Ocurrió un error inesperado al acceder a la base de datos.")
+
+    def closeEvent(self, event) -> None:
+        # Esperar la tarea en curso antes de cerrar las conexiones (run_app)
+        self._clock.stop()
+        for relay in self._job_relays:
+            relay.cancel()
+        self._db.shutdown()
+        super().closeEvent(event)
+
+    def load_users(self, select_id: Optional[int] = None) -> None:
+        """Recarga el listado de empleados en segundo plano y lo pinta al llegar.
+
+        Si se indica `select_id`, se selecciona ese empleado tras repintar. Toda
+        escritura termina aquí, así que los resúmenes y semanas guardados se descartan.
         """
+        self._summaries.invalidate()
+        self._db.submit(
+            "users",
+            self._fetch_users_status,
+            self._current_week_start,
+            on_result=lambda status_list: self._render_users(status_list, select_id),
+            on_error=self._on_db_error,
+        )
+        self._weeks.invalidate()
+        self._weeks.request(self._current_week_start)
+        self._load_teams()
+        if self._matrix is not None and self._matrix.isVisible():
+            self._matrix.reload()
+
+    def _fetch_users_status(self, week_start: date) -> list[tuple[User, bool]]:
+        """(Hilo de base de datos) Nómina con su estado en la semana mostrada."""
         users = self._user_service.list_users()
-        self._employees_list.setUpdatesEnabled(False)
-        self._employees_list.blockSignals(True)
-        self._employees_list.clear()
-        # Consultar estado semanal para pintar usuarios registrados
-        try:
-            status_list = self._assign_service.users_week_status(users)
-        except Exception:
-            status_list = [(u, False) for u in users]
+        return self._assign_service.users_week_status(users, week_start)
 
-        from PyQt6.QtWidgets import QListWidgetItem
-        # Separar no-registrados (arriba) y registrados (abajo)
-        pending = [(u, f) for (u, f) in status_list if not f]
-        done = [(u, f) for (u, f) in status_list if f]
+    def _render_users(self, status_list: list[tuple[User, bool]], select_id: Optional[int] = None) -> None:
+        """Actualiza el listado del sidebar aplicando solo las filas que cambiaron.
 
-        # Colores de ítem registrado según tema (solo texto)
-        if getattr(self, "_current_theme", "dark") == "light":
-            marked_fg = QColor(2, 106, 167)     # azul legible sobre blanco
+        La selección y el scroll se conservan; el `id` se obtiene con `UserIdRole`.
+        """
+        self._roster = [u for u, _registered in status_list]
+        if not self._search_index.is_built:
+            self._search_index.rebuild(self._roster)
+        self._employee_model.set_filter(self._visible_filter(), refresh=False)
+        self._employee_model.sync(status_list)
+        if select_id is None:
+            return
+        if self._current_user_id() == int(select_id):
+            # La selección se conservó: no hay currentChanged, refrescar sus datos
+            self._on_user_selected(self._employees_list.currentIndex(), None)
         else:
-            marked_fg = QColor(93, 200, 255)    # cian claro sobre oscuro
-
-        def _add_items(pairs: list[tuple]):
-            for u, is_marked in pairs:
-                it = QListWidgetItem(u.name)
-                it.setData(Qt.ItemDataRole.UserRole, u.id)
-                if is_marked:
-                    # Solo texto distinto para empleados registrados
-                    it.setData(Qt.ItemDataRole.ForegroundRole, QBrush(marked_fg))
-                    it.setToolTip("Registrado esta semana")
-                else:
-                    it.setToolTip("Sin registro esta semana")
-                self._employees_list.addItem(it)
-
-        _add_items(pending)
-        _add_items(done)
-        try:
-            self._employees_list.viewport().update()
-        except Exception:
-            pass
-        finally:
-            self._employees_list.blockSignals(False)
-            self._employees_list.setUpdatesEnabled(True)
+            self._select_user_in_list(int(select_id))
+
+    def _apply_search(self) -> None:
+        """Filtra el sidebar con el índice en memoria conservando la selección si sigue visible."""
+        selected_id = self._current_user_id()
+        if selected_id is None and self._detail is not None:
+            # El empleado mostrado quedó oculto por un filtro anterior: reseleccionarlo si reaparece
+            selected_id = self._detail.user_id
+        visible = self._visible_filter()
+        self._employee_model.set_filter(visible)
+        if self._matrix is not None:
+            self._matrix.set_filter(visible)
+        if selected_id is None:
+            return
+        index = self._employee_model.index_of(selected_id)
+        if index.isValid():
+            # Mismo empleado: no volver a pedir sus datos
+            selection = self._employees_list.selectionModel()
+            selection.blockSignals(True)
+            self._employees_list.setCurrentIndex(index)
+            selection.blockSignals(False)
+            self._employees_list.scrollTo(index)
+
+    def _visible_filter(self) -> Optional[set[int]]:
+        """Empleados a mostrar: búsqueda y equipo combinados (None = todos)."""
+        found = self._search_index.search(self._search_edit.text())
+        if self._team_filter is None:
+            return found
+        if found is None:
+            return self._team_filter
+        return found & self._team_filter
+
+    # ===== Equipos =====
+    def _selected_team_id(self) -> Optional[int]:
+        return self._team_combo.currentData()
+
+    def _load_teams(self) -> None:
+        """Relee en segundo plano los equipos, los miembros del elegido y el estado semanal.
+
+        Son consultas agrupadas: su cantidad no depende del tamaño de los equipos.
+        """
+        team_id = self._selected_team_id()
+        week_start = self._current_week_start
+
+        def fetch() -> tuple[list[tuple[Team, int]], Optional[set[int]], dict[Optional[int], TeamWeekStats]]:
+            members = self._team_service.member_ids(team_id) if team_id is not None else None
+            return self._team_service.team_tree(), members, self._team_service.week_stats(week_start)
+
+        self._db.submit("teams", fetch, on_result=self._render_teams, on_error=self._on_db_error)
+
+    def _render_teams(
+        self, result: tuple[list[tuple[Team, int]], Optional[set[int]], dict[Optional[int], TeamWeekStats]]
+    ) -> None:
+        tree, members, stats = result
+        selected = self._selected_team_id()
+        self._team_stats = stats
+        self._team_parents = {team.id: team.parent_id for team, _depth in tree}
+        self._team_combo.blockSignals(True)
+        self._team_combo.clear()
+        self._team_combo.addItem("Todos los equipos", None)
+        for team, depth in tree:
+            self._team_combo.addItem(f"{'    ' * depth}{team.name}", team.id)
+        index = self._team_combo.findData(selected) if selected is not None else 0
+        self._team_combo.setCurrentIndex(max(index, 0))
+        self._team_combo.blockSignals(False)
+        # Sin equipos no hay filtro que mostrar
+        self._team_combo.setVisible(bool(tree))
+        self._team_stats_label.setVisible(bool(tree))
+        if index < 0:
+            # El equipo elegido ya no existe
+            members = None
+        self._set_team_filter(members)
+
+    def _on_team_changed(self, _index: int) -> None:
+        team_id = self._selected_team_id()
+        if team_id is None:
+            self._set_team_filter(None)
+            return
+        self._db.submit(
+            "team_members",
+            self._team_service.member_ids,
+            team_id,
+            on_result=self._set_team_filter,
+            on_error=self._on_db_error,
+        )
 
-    
-    def _mark_registered_day_for_user(self, user_id: int) -> None:
-        """Sincroniza la cuadrícula con el registro de la semana actual del usuario.
+    def _set_team_filter(self, members: Optional[set[int]]) -> None:
+        self._render_team_stats()
+        if members == self._team_filter:
+            # Recarga sin cambios de pertenencia: no rehacer el listado
+            return
+        self._team_filter = members
+        self._apply_search()
+
+    def _render_team_stats(self) -> None:
+        """Registrados, pendientes y reparto por día del equipo elegido (o de toda la nómina)."""
+        stats = self._team_stats
+        if not stats:
+            self._team_stats_label.setText("")
+            return
+        team_id = self._selected_team_id()
+        if team_id is not None:
+            selected = stats.get(team_id)
+            if selected is None:
+                self._team_stats_label.setText("")
+                return
+            members, registered, by_day = selected.members, selected.registered, selected.by_day
+        else:
+            # Toda la nómina: equipos de primer nivel (ya suman sus subequipos) y sin equipo
+            roots = {t for t in stats if t is None or self._team_parents.get(t) is None}
+            members = sum(stats[t].members for t in roots)
+            registered = sum(stats[t].registered for t in roots)
+            by_day = {}
+            for t in roots:
+                for day, count in stats[t].by_day.items():
+                    by_day[day] = by_day.get(day, 0) + count
+        days = " · ".join(f"{day[:2]} {by_day[day]}" for day in _WEEKDAY_NAMES if by_day.get(day))
+        text = f"Registrados {registered}/{members} · Pendientes {members - registered}"
+        self._team_stats_label.setText(f"{text}\n{days}" if days else text)
+
+    def _current_user_id(self) -> Optional[int]:
+        """Id del empleado seleccionado en el sidebar, o None."""
+        index = self._employees_list.currentIndex()
+        if not index.isValid():
+            return None
+        user_id = index.data(EmployeeListModel.UserIdRole)
+        return int(user_id) if user_id is not None else None
+
+    def _selected_user_ids(self) -> list[int]:
+        """Ids de los empleados seleccionados, en el orden del listado."""
+        indexes = sorted(self._employees_list.selectionModel().selectedIndexes(), key=lambda i: i.row())
+        ids = (i.data(EmployeeListModel.UserIdRole) for i in indexes)
+        return [int(uid) for uid in ids if uid is not None]
+
+    def _mark_registered_day(self) -> None:
+        """Sincroniza la cuadrícula con el registro de la semana actual del empleado cargado.
 
         - Si hay registro: marca el botón correspondiente
-        - Si no hay: desmarca todos
+        - Si no hay: marca el último día registrado (o ninguno)
         """
-        try:
-            rec = self._assign_service.current_week_record(int(user_id))
-        except Exception:
-            rec = None
+        detail = self._detail
         # Limpiar selección previa
         for b in self._day_buttons:
             b.setChecked(False)
+        if detail is None:
+            return
+        rec = detail.current_week
         if rec is not None:
             target_iso = rec.date
             for b in self._day_buttons:
@@ -465,14 +752,10 @@ class MainWindow(QMainWindow):
                     break
         else:
             # No hay registro esta semana: marcar el último día registrado (por nombre de día)
-            try:
-                last = self._assign_service.latest_for_user(int(user_id))
-            except Exception:
-                last = None
+            last = detail.latest
             if last is not None and last.week_day:
-                weekday_names = ["Lunes", "Martes", "Miércoles", "Jueves", "Viernes", "Sábado", "Domingo"]
                 try:
-                    idx = weekday_names.index(last.week_day)
+                    idx = _WEEKDAY_NAMES.index(last.week_day)
                 except ValueError:
                     idx = -1
                 if 0 <= idx < len(self._day_buttons):
@@ -490,8 +773,13 @@ class MainWindow(QMainWindow):
 
     
     def _on_user_selected(self, current, previous) -> None:
-        """Actualiza el encabezado con datos y estado del empleado seleccionado."""
-        if current is None:
+        """Pide en segundo plano los datos del empleado seleccionado.
+
+        Una selección nueva deja obsoleta a la anterior: solo se pinta la última.
+        """
+        if current is None or not current.isValid():
+            self._summaries.cancel()
+            self._detail = None
             self._clear_employee_info()
             self._btn_edit.setEnabled(False)
             self._btn_delete.setEnabled(False)
@@ -501,16 +789,45 @@ class MainWindow(QMainWindow):
             for b in self._day_buttons:
                 b.setChecked(False)
             return
-        user_id = current.data(Qt.ItemDataRole.UserRole)
+        user_id = current.data(EmployeeListModel.UserIdRole)
         if user_id is None:
+            self._summaries.cancel()
+            self._detail = None
             self._clear_employee_info()
             self._btn_edit.setEnabled(False)
             self._btn_delete.setEnabled(False)
             self._btn_edit.setVisible(False)
             self._btn_delete.setVisible(False)
             return
-        user = self._user_service.get_user(int(user_id))
+        self._detail = None
+        user_id = int(user_id)
+        if self._summaries.cached(user_id) is None:
+            # Mientras llega el resumen: nombre y legajo desde el modelo, estado pendiente
+            self._show_employee_pending(self._employee_model.user(user_id))
+        self._summaries.request(user_id)
+
+    def _show_employee_pending(self, user: Optional[User]) -> None:
+        """Encabezado provisorio del empleado seleccionado cuyo resumen aún no llegó."""
         if user is None:
+            return
+        self._lbl_name.setText(f"{user.name}")
+        self._lbl_docket.setText(f"Legajo: {user.docket}")
+        self._reg_value.setText("-")
+        self._last_date_value.setText("")
+        self._last_day_value.setText("")
+        for b in self._day_buttons:
+            b.setChecked(False)
+
+    def _on_summary_ready(self, user_id: int, summary: Optional[EmployeeSummary]) -> None:
+        if self._current_user_id() != user_id:
+            # La selección cambió (o se limpió) mientras se consultaba
+            return
+        self._show_employee_detail(summary)
+
+    def _show_employee_detail(self, detail: Optional[EmployeeSummary]) -> None:
+        """Actualiza el encabezado y el calendario desde el resumen del empleado seleccionado."""
+        if detail is None:
+            self._detail = None
             self._clear_employee_info()
             self._btn_edit.setEnabled(False)
             self._btn_delete.setEnabled(False)
@@ -519,12 +836,14 @@ class MainWindow(QMainWindow):
             for b in self._day_buttons:
                 b.setChecked(False)
             return
-        
+        self._detail = detail
+        user = detail.user
+
         # Setear encabezado
         self._lbl_name.setText(f"{user.name}")
         self._lbl_docket.setText(f"Legajo: {user.docket}")
         # Estado de la semana y último registro
-        registered = self._assign_service.is_registered_this_week(int(user_id))
+        registered = detail.registered
         self._reg_value.setText("Sí" if registered else "No")
         # Aplicar semántica de color en QSS
         try:
@@ -533,7 +852,7 @@ class MainWindow(QMainWindow):
             self._reg_value.style().polish(self._reg_value)
         except Exception:
             pass
-        last = self._assign_service.latest_for_user(int(user_id))
+        last = detail.latest
         if last:
             self._last_date_value.setText(f"{last.date}")
             self._last_day_value.setText(f"{last.week_day}")
@@ -547,43 +866,139 @@ class MainWindow(QMainWindow):
         self._btn_delete.setVisible(True)
 
         # Pintar el día de la semana actual si existe registro
-        self._mark_registered_day_for_user(int(user_id))
+        self._mark_registered_day()
 
     # ===== Calendario semanal =====
     def _setup_week_ui(self, base: date) -> None:
         """Configura el calendario semanal para la semana que contiene `base`.
 
         Calcula lunes-domingo y pinta 7 botones con nombre del día y fecha.
-        Lunes/Sábado/Domingo se deshabilitan por regla de negocio.
+        Lunes/Sábado/Domingo se deshabilitan por regla de negocio, y todos en las
+        semanas que no admiten registros (pasadas o fuera de planificación).
         """
         start = base - timedelta(days=base.weekday())  # lunes
         end = start + timedelta(days=6)  # domingo
         self._current_week_start = start
-        self._lbl_week_title.setText("Semana")
+        today = date.today()
+        current = today - timedelta(days=today.weekday())
+        editable = self._assign_service.is_week_editable(start, today)
+        if start == current:
+            self._lbl_week_title.setText("Semana")
+        elif start < current:
+            self._lbl_week_title.setText("Semana (solo lectura)")
+        else:
+            self._lbl_week_title.setText("Semana (planificación)")
         self._lbl_week_range.setText(f"{start.strftime('%d/%m/%Y')} - {end.strftime('%d/%m/%Y')}")
+        self._btn_today_week.setEnabled(start != current)
+        self._btn_next_week.setEnabled(self._assign_service.is_week_editable(start + timedelta(weeks=1), today))
 
         weekday_names = ["Lunes", "Martes", "Miércoles", "Jueves", "Viernes", "Sábado", "Domingo"]
         for i, btn in enumerate(self._day_buttons):
             d = start + timedelta(days=i)
             btn.setText(f"{weekday_names[i]}\n{d.strftime('%d/%m')}")
+            btn.setProperty("base_text", btn.text())
             btn.setChecked(False)
             # Regla UX: deshabilitar Lunes(0), Sábado(5), Domingo(6)
-            btn.setEnabled(i not in (0, 5, 6))
+            btn.setEnabled(editable and i not in (0, 5, 6))
             # Guardar fecha ISO en propiedad
             btn.setProperty("date_iso", d.isoformat())
 
+    def _go_to_week(self, base: date) -> None:
+        """Muestra la semana que contiene `base`: calendario, sidebar, detalle y matriz.
+
+        Si la semana está en la caché de WeekLoader se pinta enseguida; el resto
+        (detalle del empleado, equipos) se relee en segundo plano.
+        """
+        start = base - timedelta(days=base.weekday())
+        if start == self._current_week_start:
+            return
+        self._show_week(start)
+
+    def _show_week(self, start: date) -> None:
+        self._setup_week_ui(start)
+        self._weeks.request(start)
+        self._summaries.invalidate()
+        user_id = self._current_user_id()
+        if user_id is not None:
+            self._summaries.request(user_id)
+        self._load_teams()
+        if self._matrix is not None:
+            self._matrix.set_week(start)
+
+    def _on_day_changed(self, today: date, previous: date) -> None:
+        """Cambió la fecha con la ventana abierta (medianoche o vuelta de una suspensión).
+
+        Si se mostraba la semana en curso y esta terminó, se pasa a la nueva (suele
+        estar ya en la caché de WeekLoader por el prefetch). Si no, se mantiene la
+        semana mostrada y solo se rehace el calendario: con la fecha cambian qué
+        semanas admiten registros y los títulos.
+        """
+        shown = self._current_week_start
+        previous_start = previous - timedelta(days=previous.weekday())
+        today_start = today - timedelta(days=today.weekday())
+        logger.info("Cambio de fecha: %s -> %s", previous.isoformat(), today.isoformat())
+        if shown == previous_start and today_start != previous_start:
+            self._show_week(today_start)
+            return
+        self._setup_week_ui(shown)
+        # Repinta cupos desde la caché y revalida en segundo plano
+        self._weeks.request(shown)
+        self._mark_registered_day()
+        if self._matrix is not None and self._matrix.isVisible():
+            self._matrix.reload()
+
+    def _fetch_summaries(self, user_ids: list[int]) -> dict[int, EmployeeSummary]:
+        """(Hilo de base de datos) Resúmenes respecto de la semana mostrada."""
+        return self._assign_service.employee_summaries(user_ids, self._current_week_start)
+
+    def _on_week_ready(self, status: WeekStatus) -> None:
+        """Pinta cupos y marca de registrados de la semana mostrada sin releer la nómina."""
+        if status.week_start != self._current_week_start:
+            return
+        self._render_week_capacity(status.capacity)
+        if self._roster:
+            self._employee_model.sync((u, u.id in status.registered) for u in self._roster)
+
+    def _render_week_capacity(self, capacity: dict[str, DayCapacity]) -> None:
+        """Agrega a cada día con cupo una línea con los lugares libres."""
+        for btn in self._day_buttons:
+            base = btn.property("base_text")
+            if not base:
+                continue
+            day = capacity.get(btn.property("date_iso"))
+            if day is None or day.max_remote is None:
+                btn.setText(base)
+            elif day.is_full:
+                btn.setText(f"{base}\nCompleto")
+            else:
+                btn.setText(f"{base}\nLibres: {day.remaining}")
+
     def _on_day_selected(self, button: QPushButton) -> None:
-        """Gestiona la selección de un día: confirma y asigna/cambia si corresponde."""
+        """Gestiona la selección de un día: confirma y asigna/cambia si corresponde.
+
+        Las confirmaciones usan el estado ya cargado del empleado; la escritura (que
+        vuelve a validar todo en una transacción) corre en el hilo de base de datos.
+        """
         self._selected_date_iso = button.property("date_iso")
+        if not self._assign_service.is_week_editable(date.fromisoformat(self._selected_date_iso)):
+            # La semana quedó en el pasado mientras se mostraba
+            self._mark_registered_day()
+            return
+        selected = self._selected_user_ids()
+        if len(selected) > 1:
+            self._assign_day_bulk(selected, self._selected_date_iso)
+            return
 
         # Validar selección de empleado
-        current_item = self._employees_list.currentItem()
-        if current_item is None:
+        user_id = self._current_user_id()
+        if user_id is None:
             QMessageBox.information(self, "Selecciona un empleado", "Primero selecciona un empleado en el listado.")
             return
-        user_id = current_item.data(Qt.ItemDataRole.UserRole)
-        if user_id is None:
-            QMessageBox.information(self, "Selecciona un empleado", "Selección inválida de empleado.")
+        detail = self._detail
+        if detail is None or detail.user_id != int(user_id):
+            # Los datos del empleado todavía no llegaron del hilo de base de datos
+            QMessageBox.information(self, "Cargando", "Aguarda a que terminen de cargarse los datos del empleado.")
+            self._mark_registered_day()
             return
 
         # Confirmaciones según estado semanal
@@ -595,87 +1010,203 @@ class MainWindow(QMainWindow):
         except Exception:
             pretty_day = str(date_iso)
 
+        allow_repeat = False
+        # Advertencia si coincide con el día de la semana anterior o de la siguiente
         try:
-            allow_repeat = False
-            # Advertencia si coincide con el día de la semana anterior
-            try:
-                if self._assign_service.is_same_weekday_as_prev_week(int(user_id), date_iso):
-                    prev_rec = self._assign_service.prev_week_record(int(user_id), date_iso)
-                    if prev_rec:
-                        # Formateo amigable de fecha previa
-                        try:
-                            y, m, d = map(int, str(prev_rec.date).split("-"))
-                            prev_pretty = f"{d:02d}/{m:02d}/{y:04d}"
-                        except Exception:
-                            prev_pretty = str(prev_rec.date)
-                        msg = (
-                            f"La semana pasada registró {prev_rec.week_day} {prev_pretty}.\n\n"
-                            "¿Deseas continuar igualmente?"
-                        )
-                    else:
-                        msg = (
-                            "Este empleado se registró el mismo día la semana anterior.\n\n"
-                            "¿Deseas continuar?"
-                        )
-                    warn = QMessageBox.warning(
-                        self,
-                        "Advertencia",
-                        msg,
-                        QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
-                        QMessageBox.StandardButton.No,
-                    )
-                    if warn == QMessageBox.StandardButton.Yes:
-                        allow_repeat = True
-                    else:
-                        # Usuario canceló: restaurar selección al estado real
-                        self._mark_registered_day_for_user(int(user_id))
-                        return
-            except Exception:
-                pass
-
-            if self._assign_service.is_registered_this_week(int(user_id)):
-                resp = QMessageBox.question(
-                    self,
-                    "Cambiar registro",
-                    f"Este empleado ya tiene un registro esta semana.\n\n¿Quieres cambiarlo a {pretty_day}?",
+            selected_day = _WEEKDAY_NAMES[date.fromisoformat(date_iso).weekday()]
+            repeated = detail.adjacent_week_repeating(selected_day)
+            if repeated is not None:
+                # Formateo amigable de la fecha repetida
+                try:
+                    y, m, d = map(int, str(repeated.date).split("-"))
+                    repeated_pretty = f"{d:02d}/{m:02d}/{y:04d}"
+                except Exception:
+                    repeated_pretty = str(repeated.date)
+                which = "La semana pasada registró" if repeated is detail.prev_week else "La semana siguiente tiene"
+                msg = (
+                    f"{which} {repeated.week_day} {repeated_pretty}.\n\n"
+                    "¿Deseas continuar igualmente?"
                 )
-                if resp != QMessageBox.StandardButton.Yes:
-                    # Usuario canceló: restaurar selección
-                    self._mark_registered_day_for_user(int(user_id))
-                    return
-                self._assign_service.change_week_assignment(int(user_id), date_iso, allow_repeat_prev_week=allow_repeat)
-            else:
-                resp = QMessageBox.question(
+                warn = QMessageBox.warning(
                     self,
-                    "Confirmar asignación",
-                    f"¿Registrar el día {pretty_day} para este empleado?",
+                    "Advertencia",
+                    msg,
+                    QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+                    QMessageBox.StandardButton.No,
                 )
-                if resp != QMessageBox.StandardButton.Yes:
-                    # Usuario canceló: restaurar selección (no había registro esta semana)
-                    self._mark_registered_day_for_user(int(user_id))
+                if warn == QMessageBox.StandardButton.Yes:
+                    allow_repeat = True
+                else:
+                    # Usuario canceló: restaurar selección al estado real
+                    self._mark_registered_day()
                     return
-                self._assign_service.assign_day(int(user_id), date_iso, allow_repeat_prev_week=allow_repeat)
+        except Exception:
+            pass
 
-            # Refrescar listado y encabezado conservando selección
-            selected_id = int(user_id)
-            self.load_users()
-            self._select_user_in_list(selected_id)
-            # Si el usuario quedó registrado, marcar en lista y calendario
-            # (load_users ya repinta la lista; _on_user_selected marcará calendario)
+        if detail.registered:
+            resp = QMessageBox.question(
+                self,
+                "Cambiar registro",
+                f"Este empleado ya tiene un registro en esa semana.\n\n¿Quieres cambiarlo a {pretty_day}?",
+            )
+            if resp != QMessageBox.StandardButton.Yes:
+                # Usuario canceló: restaurar selección
+                self._mark_registered_day()
+                return
+            write = self._assign_service.change_week_assignment
+        else:
+            resp = QMessageBox.question(
+                self,
+                "Confirmar asignación",
+                f"¿Registrar el día {pretty_day} para este empleado?",
+            )
+            if resp != QMessageBox.StandardButton.Yes:
+                # Usuario canceló: restaurar selección (no había registro esta semana)
+                self._mark_registered_day()
+                return
+            write = self._assign_service.assign_day
+
+        selected_id = int(user_id)
+
+        def on_error(e: Exception) -> None:
+            if isinstance(e, AppError):
+                QMessageBox.warning(self, "Regla de negocio", str(e))
+            else:
+                self._on_db_error(e)
+            # Ante error, restaurar selección real
+            self._mark_registered_day()
+
+        # Refrescar listado y encabezado conservando selección
+        # (load_users repinta la lista; _on_user_selected marcará calendario)
+        self._db.submit_write(
+            write,
+            selected_id,
+            date_iso,
+            allow_repeat_prev_week=allow_repeat,
+            on_result=lambda _rec: self.load_users(select_id=selected_id),
+            on_error=on_error,
+        )
+
+    # ===== Asignación por lote =====
+    def _assign_day_bulk(self, user_ids: list[int], date_iso: str) -> None:
+        """Asigna `date_iso` a varios empleados: una validación, un resumen, una transacción.
 
-        except AppError as e:
-            QMessageBox.warning(self, "Regla de negocio", str(e))
-            # Ante error de negocio, restaurar selección real
-            self._mark_registered_day_for_user(int(user_id))
+        La validación (`validate_many`) y la escritura (`assign_many`) leen el estado
+        de todos los seleccionados con una consulta por semana; la escritura vuelve
+        a validar dentro de su transacción.
+        """
+        items = [(uid, date_iso) for uid in user_ids]
+        self._db.submit(
+            "bulk-validate",
+            self._assign_service.validate_many,
+            items,
+            on_result=lambda result: self._confirm_bulk(items, date_iso, result),
+            on_error=self._on_bulk_error,
+        )
+
+    def _confirm_bulk(self, items: list[tuple[int, str]], date_iso: str, result: BatchResult) -> None:
+        """Único diálogo del lote: aceptados, conflictos y repeticiones del día anterior."""
+        self._mark_registered_day()
+        d = date.fromisoformat(date_iso)
+        day = f"{_WEEKDAY_NAMES[d.weekday()]} {d.strftime('%d/%m/%Y')}"
+        accepted, rejected, repeats = result.accepted, result.rejected, result.needs_override
+        lines = [
+            f"Registrar {day} para {len(items)} empleados seleccionados:",
+            "",
+            f"• Se registran: {len(accepted)}",
+        ]
+        if rejected:
+            lines.append(f"• Con conflicto (no se registran): {len(rejected)}")
+        if repeats:
+            lines.append(f"• Repiten el día de una semana contigua: {len(repeats)}")
+        details = [f"{self._user_label(c.user_id)}: {c.error}" for c in rejected]
+        details += [
+            f"{self._user_label(c.user_id)}: repite {c.week_day} de la semana anterior o siguiente" for c in repeats
+        ]
+
+        box = QMessageBox(self)
+        box.setWindowTitle("Asignación por lote")
+        box.setIcon(QMessageBox.Icon.Question if accepted or repeats else QMessageBox.Icon.Information)
+        box.setText("\n".join(lines))
+        if details:
+            box.setDetailedText("\n".join(details))
+        override = None
+        if repeats:
+            override = QCheckBox(f"Registrar también a los {len(repeats)} que repiten el día")
+            box.setCheckBox(override)
+        if not accepted and not repeats:
+            box.setStandardButtons(QMessageBox.StandardButton.Ok)
+            box.exec()
+            return
+        box.setStandardButtons(QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
+        box.setDefaultButton(QMessageBox.StandardButton.Yes)
+        if box.exec() != QMessageBox.StandardButton.Yes:
+            return
+        allow_repeat = [c.user_id for c in repeats] if override is not None and override.isChecked() else []
+        if not accepted and not allow_repeat:
+            return
+        self._db.submit_write(
+            self._assign_service.assign_many,
+            items,
+            allow_repeat=allow_repeat,
+            on_result=lambda done: self._on_bulk_assigned(done, len(accepted) + len(allow_repeat)),
+            on_error=self._on_bulk_error,
+        )
+
+    def _on_bulk_assigned(self, result: BatchResult, expected: int) -> None:
+        logger.info("Lote asignado desde la UI: %s de %s registros", len(result.records), expected)
+        self.load_users(select_id=self._current_user_id())
+        # Entre la confirmación y la escritura otro cambio pudo invalidar pedidos
+        skipped = expected - len(result.records)
+        if skipped > 0:
+            QMessageBox.information(
+                self,
+                "Asignación por lote",
+                f"Se registraron {len(result.records)} empleados; "
+                f"{skipped} quedaron sin registrar por cambios recientes.",
+            )
+
+    def _on_bulk_error(self, error: Exception) -> None:
+        self._mark_registered_day()
+        self._on_db_error(error)
+
+    def _user_label(self, user_id: int) -> str:
+        user = self._employee_model.user(user_id)
+        return f"{user.name} ({user.docket})" if user is not None else f"Empleado {user_id}"
+
+    # ===== Matriz semanal =====
+    def _on_open_matrix(self) -> None:
+        """Abre (o trae al frente) la matriz semana × empleado con el filtro del sidebar."""
+        if self._matrix is None:
+            from .week_matrix import WeekMatrixDialog
+
+            self._matrix = WeekMatrixDialog(self._db, self._assign_service, self)
+            self._matrix.assignmentChanged.connect(self._on_matrix_assignment)
+        self._matrix.set_filter(self._visible_filter())
+        self._matrix.set_week(self._current_week_start)
+        self._matrix.show()
+        self._matrix.raise_()
+        self._matrix.activateWindow()
+
+    def _on_matrix_assignment(self, user_id: int) -> None:
+        """Refleja en la ventana un alta/cambio hecho desde la matriz, sin releer nómina ni matriz.
+
+        La matriz ya actualizó su fila; aquí alcanza con el estado semanal (marcas del
+        sidebar y cupos llegan por WeekLoader), los equipos y el detalle si era el mostrado.
+        """
+        self._summaries.invalidate()
+        self._weeks.invalidate()
+        self._weeks.request(self._current_week_start)
+        self._load_teams()
+        if self._current_user_id() == user_id:
+            self._summaries.request(user_id)
 
     def _select_user_in_list(self, target_id: int) -> None:
-        """Selecciona en el sidebar el item cuyo UserRole coincide con `target_id`."""
-        for i in range(self._employees_list.count()):
-            it = self._employees_list.item(i)
-            if it.data(Qt.ItemDataRole.UserRole) == target_id:
-                self._employees_list.setCurrentRow(i)
-                break
-        
+        """Selecciona en el sidebar el empleado `target_id` (búsqueda por id en el modelo)."""
+        index = self._employee_model.index_of(int(target_id))
+        if index.isValid():
+            self._employees_list.setCurrentIndex(index)
+            self._employees_list.scrollTo(index)
 
     def _on_add_user(self) -> None:
         
@@ -686,21 +1217,26 @@ class MainWindow(QMainWindow):
                 from PyQt6.QtWidgets import QMessageBox
                 QMessageBox.information(self, "Datos incompletos", "Nombre y Docket son obligatorios.")
                 return
-            try:
-                self._user_service.create_user(name, docket)
-                self.load_users()
-            except AppError as e:
-                from PyQt6.QtWidgets import QMessageBox
-                QMessageBox.warning(self, "Error", str(e))
+            self._db.submit_write(
+                self._user_service.create_user,
+                name,
+                docket,
+                on_result=self._on_user_created,
+                on_error=self._on_db_error,
+            )
+
+    def _on_user_created(self, user: User) -> None:
+        self._search_index.add(user)
+        self.load_users()
 
     def _on_edit_user(self) -> None:
         """Edita el empleado seleccionado usando el diálogo de alta pre-rellenado."""
-        current_item = self._employees_list.currentItem()
-        if current_item is None:
+        user_id = self._current_user_id()
+        if user_id is None:
             QMessageBox.information(self, "Selecciona un empleado", "Primero selecciona un empleado en el listado.")
             return
-        user_id = current_item.data(Qt.ItemDataRole.UserRole)
-        user = self._user_service.get_user(int(user_id)) if user_id is not None else None
+        detail = self._detail
+        user = detail.user if detail is not None and detail.user_id == user_id else None
         if user is None:
             QMessageBox.information(self, "No encontrado", "No se pudo cargar el empleado seleccionado.")
             return
@@ -718,23 +1254,25 @@ class MainWindow(QMainWindow):
             if not name or not docket:
                 QMessageBox.information(self, "Datos incompletos", "Nombre y Docket son obligatorios.")
                 return
-            try:
-                self._user_service.update_user(int(user_id), name, docket)
+            def on_updated(_none) -> None:
+                self._search_index.update(User(id=int(user_id), name=name, docket=docket))
                 # Refrescar y mantener selección
-                self.load_users()
-                self._select_user_in_list(int(user_id))
-            except AppError as e:
-                QMessageBox.warning(self, "Error", str(e))
+                self.load_users(select_id=int(user_id))
+
+            self._db.submit_write(
+                self._user_service.update_user,
+                int(user_id),
+                name,
+                docket,
+                on_result=on_updated,
+                on_error=self._on_db_error,
+            )
 
     def _on_delete_user(self) -> None:
         """Elimina el empleado seleccionado previa confirmación."""
-        current_item = self._employees_list.currentItem()
-        if current_item is None:
-            QMessageBox.information(self, "Selecciona un empleado", "Primero selecciona un empleado en el listado.")
-            return
-        user_id = current_item.data(Qt.ItemDataRole.UserRole)
+        user_id = self._current_user_id()
         if user_id is None:
-            QMessageBox.information(self, "Selección inválida", "No se pudo identificar al empleado.")
+            QMessageBox.information(self, "Selecciona un empleado", "Primero selecciona un empleado en el listado.")
             return
         resp = QMessageBox.question(
             self,
@@ -743,18 +1281,145 @@ class MainWindow(QMainWindow):
         )
         if resp != QMessageBox.StandardButton.Yes:
             return
-        try:
-            # Borrado consistente: eliminar registros y luego usuario
-            self._assign_service.delete_user_and_records(int(user_id))
+
+        def on_deleted(_none) -> None:
+            # Sin selección (limpia el encabezado); al quitarse la fila la vista no salta a otra
+            self._employees_list.selectionModel().clearCurrentIndex()
+            self._employees_list.clearSelection()
+            self._search_index.remove(int(user_id))
             self.load_users()
-            self._clear_employee_info()
-            self._btn_edit.setEnabled(False)
-            self._btn_delete.setEnabled(False)
-            self._btn_edit.setVisible(False)
-            self._btn_delete.setVisible(False)
-        except AppError as e:
-            QMessageBox.warning(self, "Error", str(e))
 
+        # Borrado consistente: eliminar registros y luego usuario
+        self._db.submit_write(
+            self._assign_service.delete_user_and_records,
+            int(user_id),
+            on_result=on_deleted,
+            on_error=self._on_db_error,
+        )
+
+
+    def _on_import(self) -> None:
+        """Importa nómina o historial desde Excel/CSV mostrando progreso y rechazos.
+
+        La lectura y las altas corren en el hilo de tareas largas (`DbWorker.submit_job`),
+        así la ventana sigue leyendo de la base mientras tanto; el avance llega por señal.
+        """
+        from PyQt6.QtWidgets import QFileDialog, QInputDialog, QProgressDialog
+
+        kinds = ["Empleados (Nombre, Legajo)", "Historial (Legajo, Fecha)"]
+        kind, ok = QInputDialog.getItem(self, "Importar", "¿Qué deseas importar?", kinds, 0, False)
+        if not ok:
+            return
+        path, _ = QFileDialog.getOpenFileName(self, "Importar", "", "Planillas (*.xlsx *.csv)")
+        if not path:
+            return
+
+        progress_dlg = QProgressDialog("Importando...", "Cancelar", 0, 0, self)
+        progress_dlg.setWindowTitle("Importar")
+        progress_dlg.setWindowModality(Qt.WindowModality.WindowModal)
+        progress_dlg.setMinimumDuration(300)
+        relay = self._start_job_relay(progress_dlg)
+        # Cancelar corta tras la tanda en curso (lo ya escrito se conserva)
+        progress_dlg.canceled.connect(relay.cancel)
+
+        def on_progress(p) -> None:
+            if p.total_rows:
+                progress_dlg.setMaximum(p.total_rows)
+                progress_dlg.setValue(min(p.rows_read, p.total_rows))
+            progress_dlg.setLabelText(
+                f"Filas leídas: {p.rows_read}\nImportadas: {p.imported} · Rechazadas: {p.rejected}"
+            )
+
+        relay.progressed.connect(on_progress)
+
+        def on_error(e: Exception) -> None:
+            self._finish_job(relay, progress_dlg)
+            if isinstance(e, (AppError, OSError)):
+                QMessageBox.warning(self, "Importar", str(e))
+            else:
+                self._on_db_error(e)
+
+        def on_result(report) -> None:
+            self._finish_job(relay, progress_dlg)
+            self._show_import_report(report)
+
+        service = ImportService()
+        run = service.import_roster if kinds.index(kind) == 0 else service.import_history
+        self._db.submit_job(run, path, relay.report, on_result=on_result, on_error=on_error)
+
+    def _start_job_relay(self, progress_dlg) -> ProgressRelay:
+        relay = ProgressRelay(progress_dlg)
+        self._job_relays.add(relay)
+        return relay
+
+    def _finish_job(self, relay: ProgressRelay, progress_dlg) -> None:
+        self._job_relays.discard(relay)
+        progress_dlg.close()
+
+    def _show_import_report(self, report) -> None:
+        summary = f"Filas leídas: {report.rows_read}\nImportadas: {report.imported}\nRechazadas: {report.rejected}"
+        if report.cancelled:
+            summary += "\n\nImportación cancelada (las tandas ya escritas se conservan)."
+        box = QMessageBox(self)
+        box.setWindowTitle("Resultado de la importación")
+        box.setIcon(QMessageBox.Icon.Warning if report.rejected else QMessageBox.Icon.Information)
+        box.setText(summary)
+        if report.rejects:
+            details = "\n".join(f"Fila {r.row}: {r.reason}" for r in report.rejects)
+            if report.rejected > len(report.rejects):
+                details += f"\n... y {report.rejected - len(report.rejects)} más"
+            box.setDetailedText(details)
+        box.exec()
+        # Altas masivas: el índice de búsqueda se reconstruye con la nómina recargada
+        self._search_index.invalidate()
+        self.load_users()
+
+    def _on_export(self) -> None:
+        """Exporta días remotos (semana actual o rango) a Excel/CSV en el hilo de tareas largas."""
+        from PyQt6.QtWidgets import QFileDialog, QProgressDialog
+
+        selected = self._selected_user_ids()
+        dlg = ExportDialog(self, selected_count=len(selected))
+        if not dlg.exec():
+            return
+        if dlg.use_current_week():
+            start_iso, end_iso = ExportService.current_week_range()
+        else:
+            start_iso, end_iso = dlg.date_range_iso()
+        user_ids = selected if dlg.only_selected() else None
+
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Exportar", f"dias_remotos_{start_iso}_{end_iso}.xlsx", "Excel (*.xlsx);;CSV (*.csv)"
+        )
+        if not path:
+            return
+
+        progress_dlg = QProgressDialog("Exportando...", "Cancelar", 0, 0, self)
+        progress_dlg.setWindowTitle("Exportar")
+        progress_dlg.setWindowModality(Qt.WindowModality.WindowModal)
+        progress_dlg.setMinimumDuration(300)
+        relay = self._start_job_relay(progress_dlg)
+        # Cancelar corta en el próximo aviso de avance y descarta el archivo
+        progress_dlg.canceled.connect(relay.cancel)
+        relay.progressed.connect(lambda written: progress_dlg.setLabelText(f"Filas escritas: {written}"))
+
+        def on_error(e: Exception) -> None:
+            self._finish_job(relay, progress_dlg)
+            if isinstance(e, ExportacionCancelada):
+                self.statusBar().showMessage("Exportación cancelada.", 5000)
+            elif isinstance(e, (AppError, OSError)):
+                QMessageBox.warning(self, "Exportar", str(e))
+            else:
+                self._on_db_error(e)
+
+        def on_result(written: int) -> None:
+            self._finish_job(relay, progress_dlg)
+            QMessageBox.information(self, "Exportar", f"Se exportaron {written} registros a:\n{path}")
+
+        self._db.submit_job(
+            ExportService().export, path, start_iso, end_iso, user_ids, relay.report,
+            on_result=on_result, on_error=on_error,
+        )
 
     def _apply_adaptive_size_and_center(self) -> None:
         """Ajusta tamaño inicial según pantalla y centra la ventana.
@@ -799,15 +1464,12 @@ class MainWindow(QMainWindow):
         else:
             self._apply_dark_theme()
             self._apply_icon_palette("dark")
-        # Repintar lista para aplicar nuevo esquema de colores manteniendo selección
-        try:
-            current = self._employees_list.currentItem()
-            current_id = current.data(Qt.ItemDataRole.UserRole) if current else None
-        except Exception:
-            current_id = None
-        self.load_users()
-        if current_id is not None:
-            self._select_user_in_list(int(current_id))
+        # Color de los registrados según tema (solo texto); no se recrean filas ni se consulta la DB
+        if getattr(self, "_current_theme", "dark") == "light":
+            marked_fg = QColor(2, 106, 167)     # azul legible sobre blanco
+        else:
+            marked_fg = QColor(93, 200, 255)    # cian claro sobre oscuro
+        self._employee_model.set_marked_color(marked_fg)
 
     def _apply_dark_theme(self) -> None:
         """Aplica el tema oscuro leyendo el QSS del proyecto."""
@@ -930,24 +1592,46 @@ class MainWindow(QMainWindow):
             pass
 
     def _deferred_init(self) -> None:
-        """Trabajo diferido al primer frame para acelerar el arranque visual."""
-        try:
-            # Asegurar esquema de BD disponible
-            from data.schema import create_tables
-            create_tables()
-        except Exception:
-            # Si falla, seguimos para que al menos la UI aparezca; los flujos mostrarán error
-            pass
-        # Poblado de UI básico
-        try:
-            self.load_users()
-        except Exception:
-            pass
+        """Trabajo diferido al primer frame para acelerar el arranque visual.
+
+        El esquema/migraciones y la carga inicial corren en el hilo de base de datos.
+        """
         try:
             self._setup_week_ui(date.today())
         except Exception:
             pass
 
+        def ensure_schema() -> None:
+            # Asegurar esquema de BD disponible (crea tablas y aplica migraciones)
+            from data.schema import create_tables
+            create_tables()
+
+        # La nómina se lee solo con el esquema listo; si falla, no hay datos que mostrar
+        self._db.submit_write(
+            ensure_schema,
+            on_result=lambda _r: self.load_users(),
+            on_error=self._on_schema_error,
+        )
+
+    def _on_schema_error(self, error: Exception) -> None:
+        """Esquema o migración fallidos: avisa con un diálogo bloqueante y cierra la ventana.
+
+        Seguir con una base a medio migrar daría errores en cada consulta.
+        """
+        logger.error("No se pudo preparar el esquema de la base de datos", exc_info=error)
+        detail = str(error) if isinstance(error, AppError) else "Error inesperado al abrir la base de datos."
+        box = QMessageBox(self)
+        box.setIcon(QMessageBox.Icon.Critical)
+        box.setWindowTitle("No se pudo actualizar la base de datos")
+        box.setText(detail)
+        box.setInformativeText(
+            "La aplicación se cerrará sin modificar la base.\n"
+            "Si hay semanas con más de un registro por empleado, revíselas con\n"
+            "python scripts/db/duplicate_weeks.py (con --repair conserva el más reciente)."
+        )
+        box.exec()
+        self.close()
+
 def run_app() -> None:
     """Crea QApplication si es necesario y lanza la ventana principal."""
     # Configuración High-DPI debe ejecutarse ANTES de crear la QApplication
@@ -975,6 +1659,11 @@ def run_app() -> None:
     except Exception:
         pass
     win.show()
-    app.exec()
+    try:
+        app.exec()
+    finally:
+        # Cerrar conexiones SQLite persistentes (y registrar sus métricas)
+        from data.db_utils import close_all_connections
+        close_all_connections()
 
 
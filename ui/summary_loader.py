@@ -0,0 +1,159 @@
+"""Carga de resúmenes de empleado para la selección del sidebar.
+
+SummaryLoader recibe cada cambio de selección y entrega el EmployeeSummary del
+último empleado pedido:
+
+- Coalescencia: el primer pedido sale enseguida; los que llegan dentro de la
+  ventana de `delay_ms` (p. ej. flecha mantenida) solo actualizan el pendiente y,
+  al cerrarse la ventana, se consulta únicamente el último.
+- Prefetch: tras `idle_ms` sin pedidos, se traen en una sola consulta los
+  resúmenes de las filas vecinas; moverse a ellas se resuelve desde memoria.
+- Invalidación: `invalidate()` descarta lo guardado y los resultados en vuelo
+  (llamar ante cualquier escritura o recarga de la nómina).
+"""
+
+from collections import OrderedDict
+from typing import Callable, Optional
+
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+from models.summary import EmployeeSummary
+from .workers import DbWorker
+
+DEFAULT_DELAY_MS = 60
+DEFAULT_IDLE_MS = 150
+DEFAULT_PREFETCH_RADIUS = 6
+DEFAULT_CAPACITY = 512
+
+
+class SummaryLoader(QObject):
+    """Pedidos de resumen coalescidos, con caché LRU y prefetch de vecinos.
+
+    summaryReady(user_id, EmployeeSummary | None) se emite para el último pedido
+    (None si el empleado ya no existe); failed(Exception) ante errores de base.
+    """
+
+    summaryReady = pyqtSignal(int, object)
+    failed = pyqtSignal(object)
+
+    def __init__(
+        self,
+        db: DbWorker,
+        fetch_many: Callable[[list[int]], dict[int, EmployeeSummary]],
+        neighbours: Callable[[int, int], list[int]],
+        parent: Optional[QObject] = None,
+        delay_ms: int = DEFAULT_DELAY_MS,
+        idle_ms: int = DEFAULT_IDLE_MS,
+        prefetch_radius: int = DEFAULT_PREFETCH_RADIUS,
+        capacity: int = DEFAULT_CAPACITY,
+    ) -> None:
+        super().__init__(parent)
+        self._db = db
+        self._fetch_many = fetch_many
+        self._neighbours = neighbours
+        self._radius = prefetch_radius
+        self._capacity = capacity
+        self._cache: "OrderedDict[int, EmployeeSummary]" = OrderedDict()
+        self._generation = 0   # cambia con invalidate(); descarta resultados viejos
+        self._pending: Optional[int] = None
+        self._fetched: Optional[int] = None  # último id consultado en la ventana actual
+
+        self._window = QTimer(self)
+        self._window.setSingleShot(True)
+        self._window.setInterval(delay_ms)
+        self._window.timeout.connect(self._on_window_closed)
+        self._idle = QTimer(self)
+        self._idle.setSingleShot(True)
+        self._idle.setInterval(idle_ms)
+        self._idle.timeout.connect(self._prefetch)
+
+    # === API ===
+    def request(self, user_id: int) -> None:
+        """Pide el resumen de `user_id`; deja obsoleto cualquier pedido anterior."""
+        self._pending = user_id
+        self._idle.stop()
+        self._db.cancel("prefetch")
+        cached = self.cached(user_id)
+        if cached is not None:
+            self._db.cancel("detail")
+            self._fetched = user_id
+            self.summaryReady.emit(user_id, cached)
+            self._idle.start()
+            return
+        if self._window.isActive():
+            # Dentro de la ventana: se consultará el último al cerrarse
+            self._window.start()
+            return
+        self._fetch(user_id)
+        self._window.start()
+
+    def cancel(self) -> None:
+        """Olvida el pedido vigente (p. ej. la lista quedó sin selección)."""
+        self._pending = None
+        self._window.stop()
+        self._idle.stop()
+        self._db.cancel("detail")
+        self._db.cancel("prefetch")
+
+    def cached(self, user_id: int) -> Optional[EmployeeSummary]:
+        summary = self._cache.get(user_id)
+        if summary is not None:
+            self._cache.move_to_end(user_id)
+        return summary
+
+    def invalidate(self) -> None:
+        """Descarta los resúmenes guardados y los que estén en vuelo."""
+        self._generation += 1
+        self._cache.clear()
+        self._fetched = None
+        self._db.cancel("prefetch")
+        if self._pending is not None and self._db.is_pending("detail"):
+            # El resumen en vuelo puede ser anterior al cambio: pedirlo de nuevo
+            self._fetch(self._pending)
+
+    # === Internos ===
+    def _on_window_closed(self) -> None:
+        if self._pending is not None and self._pending != self._fetched:
+            self._fetch(self._pending)
+
+    def _fetch(self, user_id: int) -> None:
+        self._fetched = user_id
+        generation = self._generation
+        self._db.submit(
+            "detail",
+            self._fetch_many,
+            [user_id],
+            on_result=lambda found: self._on_fetched(user_id, generation, found),
+            on_error=self.failed.emit,
+        )
+
+    def _on_fetched(self, user_id: int, generation: int, found: dict[int, EmployeeSummary]) -> None:
+        if generation == self._generation:
+            self._store(found)
+        if user_id != self._pending:
+            return
+        self.summaryReady.emit(user_id, found.get(user_id))
+        self._idle.start()
+
+    def _prefetch(self) -> None:
+        if self._pending is None:
+            return
+        missing = [uid for uid in self._neighbours(self._pending, self._radius) if uid not in self._cache]
+        if not missing:
+            return
+        generation = self._generation
+        self._db.submit(
+            "prefetch",
+            self._fetch_many,
+            missing,
+            on_result=lambda found: self._store(found) if generation == self._generation else None,
+            # El prefetch es oportunista: si falla, la selección consultará normalmente
+            on_error=lambda _e: None,
+        )
+
+    def _store(self, found: dict[int, EmployeeSummary]) -> None:
+        for uid, summary in found.items():
+            self._cache[uid] = summary
+            self._cache.move_to_end(uid)
+        while len(self._cache) > self._capacity:
+            self._cache.popitem(last=False)
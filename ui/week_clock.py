@@ -0,0 +1,102 @@
+"""Reloj de fecha para sesiones largas: avisa cuando cambia el día (y con él la semana).
+
+WeekClock arma un único QTimer hasta la próxima medianoche local y, al vencer,
+compara la fecha con la última conocida: si cambió emite `dayChanged(hoy, antes)`
+y vuelve a armarse. No consulta la base ni repinta nada por sí mismo.
+
+Saltos de reloj: los QTimer corren sobre un reloj monótono que, según el sistema,
+no avanza mientras el equipo está suspendido, y la hora local puede moverse (cambio
+horario, ajuste manual). En lugar de despertar periódicamente, `check()` corre ante
+los eventos que delatan el salto: al reactivarse la aplicación y, en Windows, al
+reanudar tras una suspensión (WM_POWERBROADCAST) o cambiar la hora del sistema
+(WM_TIMECHANGE). Un vencimiento temprano o tardío solo recalcula la fecha y se rearma.
+"""
+
+import sys
+from datetime import date, datetime, timedelta
+from typing import Callable, Optional
+
+from PyQt6.QtCore import QAbstractNativeEventFilter, QObject, Qt, QTimer, pyqtSignal
+from PyQt6.QtGui import QGuiApplication
+
+# Margen tras la medianoche para no despertar justo antes por redondeo
+BOUNDARY_MARGIN_MS = 1000
+
+# Mensajes de Windows que indican un salto del reloj local
+_WM_TIMECHANGE = 0x001E
+_WM_POWERBROADCAST = 0x0218
+_PBT_RESUME = {0x0007, 0x0012}  # PBT_APMRESUMESUSPEND, PBT_APMRESUMEAUTOMATIC
+
+
+class _ClockJumpFilter(QAbstractNativeEventFilter):
+    """Filtro de mensajes nativos (Windows): avisa al reanudar o al cambiar la hora."""
+
+    def __init__(self, on_jump: Callable[[], None]) -> None:
+        super().__init__()
+        self._on_jump = on_jump
+
+    def nativeEventFilter(self, event_type, message):
+        if bytes(event_type) == b"windows_generic_MSG":
+            from ctypes import wintypes
+
+            msg = wintypes.MSG.from_address(int(message))
+            if msg.message == _WM_TIMECHANGE or (
+                msg.message == _WM_POWERBROADCAST and msg.wParam in _PBT_RESUME
+            ):
+                # Fuera del despacho nativo: check() puede emitir y repintar
+                QTimer.singleShot(0, self._on_jump)
+        return False, 0
+
+
+class WeekClock(QObject):
+    """dayChanged(date, date): la fecha local pasó de `previous` a `today`."""
+
+    dayChanged = pyqtSignal(object, object)
+
+    def __init__(self, parent: Optional[QObject] = None, now: Callable[[], datetime] = datetime.now) -> None:
+        super().__init__(parent)
+        self._now = now
+        self._today: date = now().date()
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setTimerType(Qt.TimerType.CoarseTimer)
+        self._timer.timeout.connect(self.check)
+        self._jump_filter: Optional[_ClockJumpFilter] = None
+        app = QGuiApplication.instance()
+        if app is not None:
+            app.applicationStateChanged.connect(self._on_app_state)
+            if sys.platform == "win32":
+                self._jump_filter = _ClockJumpFilter(self.check)
+                app.installNativeEventFilter(self._jump_filter)
+        self._arm()
+
+    @property
+    def today(self) -> date:
+        return self._today
+
+    def check(self) -> None:
+        """Compara la fecha actual con la conocida, emite si cambió y rearma el timer."""
+        today = self._now().date()
+        previous = self._today
+        self._today = today
+        self._arm()
+        if today != previous:
+            self.dayChanged.emit(today, previous)
+
+    def stop(self) -> None:
+        self._timer.stop()
+        app = QGuiApplication.instance()
+        if self._jump_filter is not None and app is not None:
+            app.removeNativeEventFilter(self._jump_filter)
+            self._jump_filter = None
+
+    # === Internos ===
+    def _arm(self) -> None:
+        now = self._now()
+        midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
+        ms = int((midnight - now).total_seconds() * 1000) + BOUNDARY_MARGIN_MS
+        self._timer.start(max(BOUNDARY_MARGIN_MS, ms))
+
+    def _on_app_state(self, state: Qt.ApplicationState) -> None:
+        if state == Qt.ApplicationState.ApplicationActive:
+            self.check()
@@ -0,0 +1,114 @@
+"""Carga del estado semanal (registrados y cupos) para la semana mostrada.
+
+WeekLoader guarda en una caché chica, por lunes de semana, el WeekStatus de las
+semanas visitadas y de sus vecinas:
+
+- Al pedir una semana guardada se entrega enseguida desde memoria y se relee en
+  segundo plano; solo se vuelve a emitir si cambió algo.
+- Tras cada lectura de la semana mostrada se traen, en una sola tarea, las
+  semanas adyacentes que falten: navegar a ellas no espera a la base.
+- `invalidate()` descarta todo lo guardado (llamar ante cualquier escritura).
+"""
+
+from collections import OrderedDict
+from datetime import date, timedelta
+from typing import Callable, Optional
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from models.week_status import WeekStatus
+from .workers import DbWorker
+
+DEFAULT_CAPACITY = 6
+DEFAULT_PREFETCH_RADIUS = 1
+
+
+class WeekLoader(QObject):
+    """weekReady(WeekStatus) se emite para la semana pedida; failed(Exception) ante errores."""
+
+    weekReady = pyqtSignal(object)
+    failed = pyqtSignal(object)
+
+    def __init__(
+        self,
+        db: DbWorker,
+        fetch: Callable[[date], WeekStatus],
+        parent: Optional[QObject] = None,
+        capacity: int = DEFAULT_CAPACITY,
+        prefetch_radius: int = DEFAULT_PREFETCH_RADIUS,
+    ) -> None:
+        super().__init__(parent)
+        self._db = db
+        self._fetch = fetch
+        self._capacity = capacity
+        self._radius = prefetch_radius
+        self._cache: "OrderedDict[date, WeekStatus]" = OrderedDict()
+        self._generation = 0   # cambia con invalidate(); descarta resultados viejos
+        self._current: Optional[date] = None
+
+    # === API ===
+    def request(self, week_start: date) -> None:
+        """Pide la semana que empieza en `week_start` (lunes)."""
+        self._current = week_start
+        self._db.cancel("week-prefetch")
+        cached = self.cached(week_start)
+        if cached is not None:
+            self.weekReady.emit(cached)
+        generation = self._generation
+        self._db.submit(
+            "week",
+            self._fetch,
+            week_start,
+            on_result=lambda status: self._on_fetched(status, generation, cached),
+            on_error=self.failed.emit,
+        )
+
+    def cached(self, week_start: date) -> Optional[WeekStatus]:
+        status = self._cache.get(week_start)
+        if status is not None:
+            self._cache.move_to_end(week_start)
+        return status
+
+    def invalidate(self) -> None:
+        """Descarta las semanas guardadas y las que estén en vuelo."""
+        self._generation += 1
+        self._cache.clear()
+        self._db.cancel("week-prefetch")
+
+    # === Internos ===
+    def _on_fetched(self, status: WeekStatus, generation: int, shown: Optional[WeekStatus]) -> None:
+        if generation == self._generation:
+            self._store([status])
+        if status.week_start != self._current:
+            return
+        if status != shown:
+            self.weekReady.emit(status)
+        self._prefetch()
+
+    def _prefetch(self) -> None:
+        if self._current is None:
+            return
+        missing = [
+            self._current + timedelta(weeks=offset)
+            for step in range(1, self._radius + 1)
+            for offset in (step, -step)
+        ]
+        missing = [w for w in missing if w not in self._cache]
+        if not missing:
+            return
+        generation = self._generation
+        self._db.submit(
+            "week-prefetch",
+            lambda weeks: [self._fetch(w) for w in weeks],
+            missing,
+            on_result=lambda found: self._store(found) if generation == self._generation else None,
+            # El prefetch es oportunista: si falla, la navegación consultará normalmente
+            on_error=lambda _e: None,
+        )
+
+    def _store(self, found: list[WeekStatus]) -> None:
+        for status in found:
+            self._cache[status.week_start] = status
+            self._cache.move_to_end(status.week_start)
+        while len(self._cache) > self._capacity:
+            self._cache.popitem(last=False)
@@ -0,0 +1,321 @@
+"""Matriz semana × empleado: toda la nómina frente a los días Martes–Viernes.
+
+WeekMatrixModel guarda las filas de `AsignacionService.week_matrix` (una consulta
+para la semana) y responde `data()` por celda: la vista solo pide las filas
+visibles, y con alto de fila fijo no mide el resto, así que desplazarse por
+decenas de miles de empleados no depende del tamaño de la nómina.
+
+WeekMatrixDialog muestra la matriz en una ventana no modal, para la semana que
+indique la ventana principal. Un clic en una celda asigna o cambia el día del
+empleado con las mismas reglas del calendario (`assign_day` /
+`change_week_assignment`) y actualiza solo esa fila; las semanas que no admiten
+registros son de solo lectura.
+"""
+
+from dataclasses import replace
+from datetime import date, timedelta
+from typing import Optional
+
+from PyQt6.QtCore import QAbstractTableModel, QModelIndex, Qt, pyqtSignal
+from PyQt6.QtGui import QBrush, QColor
+from PyQt6.QtWidgets import (
+    QAbstractItemView,
+    QDialog,
+    QHeaderView,
+    QLabel,
+    QMessageBox,
+    QTableView,
+    QVBoxLayout,
+)
+
+from exceptions import AppError
+from models.record import Record
+from models.week_matrix import WeekMatrixRow
+from services.assignment_service import AsignacionService
+from .workers import DbWorker
+
+# Columnas de días: Martes (1) a Viernes (4); Lunes y fin de semana no se registran
+_DAY_OFFSETS = (1, 2, 3, 4)
+_DAY_NAMES = ("Martes", "Miércoles", "Jueves", "Viernes")
+_ROW_HEIGHT = 24
+
+
+def _repeat_message(row: WeekMatrixRow, day_name: str) -> str:
+    """Qué semana contigua tiene ya `day_name` (la anterior y/o la siguiente)."""
+    parts = []
+    if row.prev_week_day == day_name:
+        parts.append(f"la semana pasada registró {day_name}")
+    if row.next_week_day == day_name:
+        parts.append(f"la semana siguiente tiene {day_name}")
+    text = " y ".join(parts)
+    return text[:1].upper() + text[1:] + "."
+
+
+class WeekMatrixModel(QAbstractTableModel):
+    """Columna 0: empleado; columnas 1-4: Martes–Viernes de la semana mostrada."""
+
+    UserIdRole = Qt.ItemDataRole.UserRole
+    DateRole = Qt.ItemDataRole.UserRole + 1
+
+    def __init__(self, parent=None) -> None:
+        super().__init__(parent)
+        self._rows: list[WeekMatrixRow] = []
+        self._visible: list[int] = []                 # índices de _rows mostrados, en orden
+        self._filter: Optional[set[int]] = None
+        self._dates: list[str] = []                   # fecha ISO de cada columna de día
+        self._counts: list[int] = [0] * len(_DAY_OFFSETS)
+        self._assigned_brush = QBrush(QColor(2, 106, 167, 60))
+
+    # === API de Qt ===
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._visible)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else 1 + len(_DAY_OFFSETS)
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row = self._rows[self._visible[index.row()]]
+        col = index.column()
+        if role == self.UserIdRole:
+            return row.user_id
+        if col == 0:
+            if role == Qt.ItemDataRole.DisplayRole:
+                return row.user.name
+            if role == Qt.ItemDataRole.ToolTipRole:
+                return f"Legajo: {row.user.docket}"
+            return None
+        day_iso = self._dates[col - 1]
+        assigned = row.current_week is not None and row.current_week.date == day_iso
+        day_name = _DAY_NAMES[col - 1]
+        repeats_prev = row.prev_week_day == day_name
+        repeats_next = row.next_week_day == day_name
+        if role == self.DateRole:
+            return day_iso
+        if role == Qt.ItemDataRole.DisplayRole:
+            if assigned:
+                return "Remoto"
+            if repeats_prev:
+                return "sem. ant."
+            return "sem. sig." if repeats_next else ""
+        if role == Qt.ItemDataRole.BackgroundRole:
+            return self._assigned_brush if assigned else None
+        if role == Qt.ItemDataRole.TextAlignmentRole:
+            return Qt.AlignmentFlag.AlignCenter
+        if role == Qt.ItemDataRole.ToolTipRole and (repeats_prev or repeats_next):
+            return _repeat_message(row, day_name)
+        return None
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.ItemDataRole.DisplayRole):
+        if orientation != Qt.Orientation.Horizontal or role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if section == 0:
+            return f"Empleado ({len(self._visible)})"
+        if not self._dates:
+            return _DAY_NAMES[section - 1]
+        d = date.fromisoformat(self._dates[section - 1])
+        return f"{_DAY_NAMES[section - 1]} {d.strftime('%d/%m')} ({self._counts[section - 1]})"
+
+    # === Consultas ===
+    def row(self, index: QModelIndex) -> Optional[WeekMatrixRow]:
+        if not index.isValid():
+            return None
+        return self._rows[self._visible[index.row()]]
+
+    def day_name(self, column: int) -> Optional[str]:
+        return _DAY_NAMES[column - 1] if 1 <= column <= len(_DAY_NAMES) else None
+
+    # === Actualización ===
+    def set_week(self, week_start: date, rows: list[WeekMatrixRow]) -> None:
+        """Carga la semana que empieza en `week_start` (lunes).
+
+        Si la nómina y su orden no cambiaron, se reemplazan los datos sin reiniciar
+        el modelo: la vista conserva scroll y selección.
+        """
+        dates = [(week_start + timedelta(days=o)).isoformat() for o in _DAY_OFFSETS]
+        same_layout = dates == self._dates and len(rows) == len(self._rows) and all(
+            a.user_id == b.user_id for a, b in zip(rows, self._rows)
+        )
+        self._recount(rows, dates)
+        if same_layout:
+            self._rows = rows
+            if self._visible:
+                self.dataChanged.emit(
+                    self.index(0, 0), self.index(len(self._visible) - 1, self.columnCount() - 1)
+                )
+            self.headerDataChanged.emit(Qt.Orientation.Horizontal, 0, self.columnCount() - 1)
+            return
+        self.beginResetModel()
+        self._rows = rows
+        self._dates = dates
+        self._visible = self._filtered()
+        self.endResetModel()
+
+    def set_filter(self, user_ids: Optional[set[int]]) -> None:
+        """Muestra solo `user_ids` (None = todos)."""
+        self._filter = user_ids
+        self.beginResetModel()
+        self._visible = self._filtered()
+        self.endResetModel()
+
+    def apply_record(self, user_id: int, record: Record) -> None:
+        """Refleja el registro nuevo o cambiado de un empleado actualizando solo su fila."""
+        for i, row in enumerate(self._rows):
+            if row.user_id == user_id:
+                self._rows[i] = replace(row, current_week=record)
+                break
+        else:
+            return
+        self._recount(self._rows, self._dates)
+        try:
+            visible_row = self._visible.index(i)
+        except ValueError:
+            visible_row = None
+        if visible_row is not None:
+            self.dataChanged.emit(
+                self.index(visible_row, 1), self.index(visible_row, self.columnCount() - 1)
+            )
+        self.headerDataChanged.emit(Qt.Orientation.Horizontal, 0, self.columnCount() - 1)
+
+    def _filtered(self) -> list[int]:
+        f = self._filter
+        if f is None:
+            return list(range(len(self._rows)))
+        return [i for i, row in enumerate(self._rows) if row.user_id in f]
+
+    def _recount(self, rows: list[WeekMatrixRow], dates: list[str]) -> None:
+        col_of = {d: i for i, d in enumerate(dates)}
+        counts = [0] * len(dates)
+        for row in rows:
+            if row.current_week is not None:
+                col = col_of.get(row.current_week.date)
+                if col is not None:
+                    counts[col] += 1
+        self._counts = counts
+
+
+class WeekMatrixDialog(QDialog):
+    """Ventana no modal con la matriz de una semana (por defecto, la actual).
+
+    assignmentChanged(user_id) se emite tras cada alta o cambio hecho desde la matriz.
+    """
+
+    assignmentChanged = pyqtSignal(int)
+
+    def __init__(self, db: DbWorker, service: AsignacionService, parent=None) -> None:
+        super().__init__(parent)
+        self.setWindowTitle("Semana por empleado")
+        self.resize(760, 560)
+        self._db = db
+        self._service = service
+        today = date.today()
+        self._week_start = today - timedelta(days=today.weekday())
+
+        self._title = QLabel("")
+        self._title.setProperty("role", "section")
+        self._model = WeekMatrixModel(self)
+        self._table = QTableView()
+        self._table.setModel(self._model)
+        self._table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self._table.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self._table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectItems)
+        self._table.setWordWrap(False)
+        self._table.setAlternatingRowColors(True)
+        # Alto de fila fijo: la vista no mide filas fuera de pantalla
+        vheader = self._table.verticalHeader()
+        vheader.setVisible(False)
+        vheader.setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        vheader.setDefaultSectionSize(_ROW_HEIGHT)
+        hheader = self._table.horizontalHeader()
+        hheader.setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        hheader.setSectionResizeMode(0, QHeaderView.ResizeMode.Interactive)
+        hheader.resizeSection(0, 240)
+        self._table.clicked.connect(self._on_cell_clicked)
+
+        layout = QVBoxLayout(self)
+        layout.addWidget(self._title)
+        layout.addWidget(self._table, 1)
+
+    # === API ===
+    def set_week(self, week_start: date) -> None:
+        """Muestra la semana que empieza en `week_start` (lunes) y la carga."""
+        self._week_start = week_start
+        self.reload()
+
+    def reload(self) -> None:
+        """Relee la semana en el hilo de base de datos (una consulta)."""
+        start = self._week_start
+        end = start + timedelta(days=6)
+        suffix = "" if self._service.is_week_editable(start) else " (solo lectura)"
+        self._title.setText(f"Semana {start.strftime('%d/%m/%Y')} - {end.strftime('%d/%m/%Y')}{suffix}")
+        self._db.submit(
+            "matrix",
+            self._service.week_matrix,
+            start,
+            on_result=lambda rows: self._model.set_week(start, rows),
+            on_error=self._on_error,
+        )
+
+    def set_filter(self, user_ids: Optional[set[int]]) -> None:
+        self._model.set_filter(user_ids)
+
+    # === Interacción ===
+    def _on_cell_clicked(self, index) -> None:
+        row = self._model.row(index)
+        day_name = self._model.day_name(index.column())
+        if row is None or day_name is None:
+            return
+        date_iso = index.data(WeekMatrixModel.DateRole)
+        current = row.current_week
+        if current is not None and current.date == date_iso:
+            return
+        if not self._service.is_week_editable(date.fromisoformat(date_iso)):
+            QMessageBox.information(self, "Solo lectura", "Esta semana no admite registros.")
+            return
+        pretty = date.fromisoformat(date_iso).strftime("%d/%m/%Y")
+
+        allow_repeat = False
+        if day_name in (row.prev_week_day, row.next_week_day):
+            resp = QMessageBox.warning(
+                self,
+                "Advertencia",
+                f"{row.user.name}: {_repeat_message(row, day_name)}\n\n¿Deseas continuar igualmente?",
+                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+                QMessageBox.StandardButton.No,
+            )
+            if resp != QMessageBox.StandardButton.Yes:
+                return
+            allow_repeat = True
+        if current is not None:
+            resp = QMessageBox.question(
+                self,
+                "Cambiar registro",
+                f"{row.user.name} ya tiene un registro esa semana.\n\n¿Quieres cambiarlo a {pretty}?",
+            )
+            if resp != QMessageBox.StandardButton.Yes:
+                return
+            write = self._service.change_week_assignment
+        else:
+            write = self._service.assign_day
+
+        user_id = row.user_id
+
+        def on_result(record: Record) -> None:
+            self._model.apply_record(user_id, record)
+            self.assignmentChanged.emit(user_id)
+
+        self._db.submit_write(
+            write,
+            user_id,
+            date_iso,
+            allow_repeat_prev_week=allow_repeat,
+            on_result=on_result,
+            on_error=self._on_error,
+        )
+
+    def _on_error(self, error: Exception) -> None:
+        if isinstance(error, AppError):
+            QMessageBox.warning(self, "Regla de negocio", str(error))
+        else:
+            QMessageBox.critical(self, "Error", f"No se pudo completar la operación:\n{error}")
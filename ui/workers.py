@@ -0,0 +1,232 @@
+"""Ejecución de llamadas a servicios fuera del hilo de la GUI.
+
+DbWorker corre funciones (servicios/repositorios) en un QThreadPool de un solo
+hilo y entrega el resultado en el hilo de la GUI mediante señales Qt. Un único
+hilo mantiene el orden FIFO de las operaciones (una escritura enviada después de
+una lectura se ejecuta después) y coincide con el modelo de un solo escritor de
+SQLite; ese hilo usa su propia conexión persistente (ver data.db_utils).
+
+Cada lectura lleva una clave: un pedido nuevo con la misma clave deja obsoletos a
+los anteriores (se quitan de la cola si no empezaron y su resultado se descarta
+si ya estaban corriendo). Así, por ejemplo, solo se pinta la última selección.
+Las escrituras confirmadas van por `submit_write`: nunca se cancelan y siempre
+entregan su resultado o error.
+
+Las tareas largas (importar/exportar) van por `submit_job`: corren en un segundo
+hilo, con su propia conexión, para que las lecturas de la ventana no esperen a
+que terminen. Escriben por tandas cortas, así que las lecturas se intercalan
+entre ellas. Informan su avance y se cancelan con un ProgressRelay.
+"""
+
+import logging
+import threading
+from typing import Any, Callable, Optional
+
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, QTimer, pyqtSignal, pyqtSlot
+
+logger = logging.getLogger(__name__)
+
+
+class _TaskSignals(QObject):
+    # (id de tarea, resultado o excepción)
+    finished = pyqtSignal(int, object)
+    failed = pyqtSignal(int, object)
+
+
+class _Task(QRunnable):
+    def __init__(self, task_id: int, fn: Callable, args: tuple, kwargs: dict) -> None:
+        super().__init__()
+        # La referencia la mantiene DbWorker; evita que Qt la libere tras run()
+        self.setAutoDelete(False)
+        self.task_id = task_id
+        self.signals = _TaskSignals()
+        self._fn = fn
+        self._args = args
+        self._kwargs = kwargs
+
+    def run(self) -> None:
+        try:
+            result = self._fn(*self._args, **self._kwargs)
+        except Exception as e:  # se entrega al hilo de la GUI
+            self.signals.failed.emit(self.task_id, e)
+        else:
+            self.signals.finished.emit(self.task_id, result)
+
+
+class ProgressRelay(QObject):
+    """Avance de una tarea del hilo de base de datos hacia la GUI.
+
+    La tarea llama `report(valor)` desde su hilo: se emite progressed(valor), que Qt
+    entrega en el hilo de la GUI, y devuelve False si la GUI pidió `cancel()`.
+    """
+
+    progressed = pyqtSignal(object)
+
+    def __init__(self, parent: Optional[QObject] = None) -> None:
+        super().__init__(parent)
+        self._cancelled = threading.Event()
+
+    def report(self, value: Any) -> bool:
+        self.progressed.emit(value)
+        return not self._cancelled.is_set()
+
+    def cancel(self) -> None:
+        self._cancelled.set()
+
+
+class DbWorker(QObject):
+    """Cola de trabajo de base de datos con entrega de resultados por señales.
+
+    busyChanged(bool) se emite al empezar/terminar de haber trabajo pendiente,
+    para mostrar un indicador de actividad sin bloquear la ventana.
+    """
+
+    busyChanged = pyqtSignal(bool)
+
+    def __init__(self, parent: Optional[QObject] = None) -> None:
+        super().__init__(parent)
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(1)
+        # Tareas largas: un hilo aparte, que no se libera al quedar ocioso (reusa su conexión)
+        self._jobs = QThreadPool(self)
+        self._jobs.setMaxThreadCount(1)
+        self._jobs.setExpiryTimeout(-1)
+        self._next_id = 0
+        # id -> (clave, tarea, on_result, on_error)
+        self._tasks: dict[int, tuple[str, _Task, Optional[Callable], Optional[Callable]]] = {}
+        self._latest: dict[str, int] = {}
+        self._busy = False
+
+    def submit(
+        self,
+        key: str,
+        fn: Callable[..., Any],
+        *args: Any,
+        on_result: Optional[Callable[[Any], None]] = None,
+        on_error: Optional[Callable[[Exception], None]] = None,
+        **kwargs: Any,
+    ) -> int:
+        """Encola `fn(*args, **kwargs)`; `on_result`/`on_error` corren en el hilo de la GUI.
+
+        Devuelve el id de la tarea. Deja obsoleto cualquier pedido previo con la misma `key`.
+        """
+        self.cancel(key)
+        self._next_id += 1
+        return self._start(key, self._next_id, fn, args, kwargs, on_result, on_error)
+
+    def submit_write(
+        self,
+        fn: Callable[..., Any],
+        *args: Any,
+        on_result: Optional[Callable[[Any], None]] = None,
+        on_error: Optional[Callable[[Exception], None]] = None,
+        **kwargs: Any,
+    ) -> int:
+        """Encola una escritura: como `submit`, pero con clave propia, así que ningún
+        pedido posterior la cancela ni descarta su resultado. Devuelve el id de la tarea."""
+        self._next_id += 1
+        task_id = self._next_id
+        return self._start(f"write#{task_id}", task_id, fn, args, kwargs, on_result, on_error)
+
+    def submit_job(
+        self,
+        fn: Callable[..., Any],
+        *args: Any,
+        on_result: Optional[Callable[[Any], None]] = None,
+        on_error: Optional[Callable[[Exception], None]] = None,
+        **kwargs: Any,
+    ) -> int:
+        """Encola una tarea larga en el hilo de tareas: no ocupa la cola de lecturas.
+
+        Como `submit_write`, nunca se descarta; para cortarla, `fn` debe consultar un
+        ProgressRelay. Las tareas largas corren de a una, en orden. Devuelve el id.
+        """
+        self._next_id += 1
+        task_id = self._next_id
+        return self._start(
+            f"job#{task_id}", task_id, fn, args, kwargs, on_result, on_error, pool=self._jobs
+        )
+
+    def _start(
+        self,
+        key: str,
+        task_id: int,
+        fn: Callable[..., Any],
+        args: tuple,
+        kwargs: dict,
+        on_result: Optional[Callable[[Any], None]],
+        on_error: Optional[Callable[[Exception], None]],
+        pool: Optional[QThreadPool] = None,
+    ) -> int:
+        task = _Task(task_id, fn, args, kwargs)
+        # Conexión a métodos de este QObject (hilo de la GUI): Qt encola la entrega
+        task.signals.finished.connect(self._on_finished)
+        task.signals.failed.connect(self._on_failed)
+        self._tasks[task_id] = (key, task, on_result, on_error)
+        self._latest[key] = task_id
+        (pool or self._pool).start(task)
+        if not self._busy:
+            self._busy = True
+            self.busyChanged.emit(True)
+        return task_id
+
+    def cancel(self, key: str) -> None:
+        """Descarta el pedido vigente de `key` (lo quita de la cola si aún no empezó)."""
+        task_id = self._latest.pop(key, None)
+        if task_id is None or task_id not in self._tasks:
+            return
+        _key, task, _ok, _err = self._tasks[task_id]
+        if self._pool.tryTake(task):
+            self._forget(task_id)
+        # Si ya está corriendo, su resultado se ignora en _on_finished/_on_failed
+
+    def is_pending(self, key: str) -> bool:
+        return key in self._latest
+
+    def shutdown(self, timeout_ms: int = 3000) -> None:
+        """Vacía las colas y espera a las tareas en curso (llamar al cerrar la ventana)."""
+        for pool in (self._pool, self._jobs):
+            pool.clear()
+        for pool in (self._pool, self._jobs):
+            pool.waitForDone(timeout_ms)
+        self._tasks.clear()
+        self._latest.clear()
+
+    @pyqtSlot(int, object)
+    def _on_finished(self, task_id: int, result: object) -> None:
+        entry = self._take(task_id)
+        if entry is not None and entry[2] is not None:
+            entry[2](result)
+
+    @pyqtSlot(int, object)
+    def _on_failed(self, task_id: int, error: object) -> None:
+        entry = self._take(task_id)
+        if entry is None:
+            return
+        if entry[3] is not None:
+            entry[3](error)
+        else:
+            logger.error("Error en tarea de base de datos key=%s", entry[0], exc_info=error)
+
+    def _take(self, task_id: int):
+        """Quita la tarea terminada; devuelve su entrada solo si sigue vigente."""
+        entry = self._tasks.get(task_id)
+        if entry is None:
+            return None
+        key = entry[0]
+        current = self._latest.get(key) == task_id
+        if current:
+            del self._latest[key]
+        self._forget(task_id)
+        return entry if current else None
+
+    def _forget(self, task_id: int) -> None:
+        self._tasks.pop(task_id, None)
+        if not self._tasks:
+            # Diferido: si el callback encola otra tarea, el indicador no parpadea
+            QTimer.singleShot(0, self._emit_idle_if_done)
+
+    def _emit_idle_if_done(self) -> None:
+        if not self._tasks and self._busy:
+            self._busy = False
+            self.busyChanged.emit(False)